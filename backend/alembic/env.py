@@ -15,6 +15,7 @@ from app.models.base import BaseModel
 from app.models.user import User
 from app.models.quiz import Quiz, QuizAttempt
 from app.models.progress import Progress, ChatSession
+from app.models.job import JobCheckpoint
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,42 @@
+"""Mastery engine: quiz topics, attempt user index, job checkpoints
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('quizzes', sa.Column('topic', sa.String(), nullable=True))
+    op.create_index(op.f('ix_quiz_attempts_user_id'), 'quiz_attempts', ['user_id'], unique=False)
+
+    # Create job_checkpoints table
+    op.create_table('job_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('cursor', sa.Integer(), nullable=False),
+        sa.Column('state', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_checkpoints_id'), 'job_checkpoints', ['id'], unique=False)
+    op.create_index(op.f('ix_job_checkpoints_name'), 'job_checkpoints', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_job_checkpoints_name'), table_name='job_checkpoints')
+    op.drop_index(op.f('ix_job_checkpoints_id'), table_name='job_checkpoints')
+    op.drop_table('job_checkpoints')
+    op.drop_index(op.f('ix_quiz_attempts_user_id'), table_name='quiz_attempts')
+    op.drop_column('quizzes', 'topic')
@@ -0,0 +1,31 @@
+"""Spaced repetition scheduling on progress
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('progress', sa.Column('ease_factor', sa.Float(), nullable=False, server_default='2.5'))
+    op.add_column('progress', sa.Column('interval_days', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('progress', sa.Column('repetitions', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('progress', sa.Column('next_review_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_progress_user_id_next_review_at', 'progress', ['user_id', 'next_review_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_progress_user_id_next_review_at', table_name='progress')
+    op.drop_column('progress', 'next_review_at')
+    op.drop_column('progress', 'repetitions')
+    op.drop_column('progress', 'interval_days')
+    op.drop_column('progress', 'ease_factor')
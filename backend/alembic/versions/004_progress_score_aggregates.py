@@ -0,0 +1,42 @@
+"""Running score aggregates on progress
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('progress', sa.Column('score_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('progress', sa.Column('score_sum', sa.Float(), nullable=False, server_default='0'))
+    op.add_column('progress', sa.Column('score_sumsq', sa.Float(), nullable=False, server_default='0'))
+
+    # Seed aggregates from the existing score history
+    op.execute("""
+        UPDATE progress p
+        SET score_count = s.n, score_sum = s.total, score_sumsq = s.total_sq
+        FROM (
+            SELECT progress.id,
+                   count(*) AS n,
+                   sum(value::float) AS total,
+                   sum(value::float * value::float) AS total_sq
+            FROM progress, json_array_elements_text(progress.quiz_scores) AS value
+            GROUP BY progress.id
+        ) s
+        WHERE p.id = s.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('progress', 'score_sumsq')
+    op.drop_column('progress', 'score_sum')
+    op.drop_column('progress', 'score_count')
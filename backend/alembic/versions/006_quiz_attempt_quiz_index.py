@@ -0,0 +1,23 @@
+"""Index quiz attempts by quiz
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_quiz_attempts_quiz_id'), 'quiz_attempts', ['quiz_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_quiz_attempts_quiz_id'), table_name='quiz_attempts')
@@ -0,0 +1,32 @@
+"""Precomputed quiz answer keys
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('quizzes', sa.Column('answer_key', postgresql.JSON(astext_type=sa.Text()), nullable=True))
+
+    op.execute("""
+        UPDATE quizzes
+        SET answer_key = (
+            SELECT coalesce(json_agg(coalesce((q ->> 'correct_answer')::int, 0) ORDER BY i), '[]'::json)
+            FROM json_array_elements(quizzes.questions) WITH ORDINALITY AS t(q, i)
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('quizzes', 'answer_key')
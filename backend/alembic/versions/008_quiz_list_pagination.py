@@ -0,0 +1,26 @@
+"""Quiz question counts and keyset pagination index
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('quizzes', sa.Column('question_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute("UPDATE quizzes SET question_count = json_array_length(questions)")
+    op.create_index('ix_quizzes_user_id_created_at_id', 'quizzes', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_quizzes_user_id_created_at_id', table_name='quizzes')
+    op.drop_column('quizzes', 'question_count')
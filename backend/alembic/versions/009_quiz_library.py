@@ -0,0 +1,62 @@
+"""Shared quiz library
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create quiz_contents table
+    op.create_table('quiz_contents',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('subject_key', sa.String(), nullable=False),
+        sa.Column('topic_key', sa.String(), nullable=False),
+        sa.Column('difficulty', sa.String(), nullable=False),
+        sa.Column('questions', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('answer_key', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('question_count', sa.Integer(), nullable=False),
+        sa.Column('reference_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('content_hash')
+    )
+    op.create_index(op.f('ix_quiz_contents_id'), 'quiz_contents', ['id'], unique=False)
+    op.create_index('ix_quiz_contents_lookup', 'quiz_contents', ['subject_key', 'topic_key', 'difficulty', 'question_count'], unique=False)
+
+    # Library-backed quizzes keep no questions of their own
+    op.alter_column('quizzes', 'questions', existing_type=postgresql.JSON(astext_type=sa.Text()), nullable=True)
+    op.add_column('quizzes', sa.Column('content_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_quizzes_content_id', 'quizzes', 'quiz_contents', ['content_id'], ['id'])
+    op.create_index(op.f('ix_quizzes_content_id'), 'quizzes', ['content_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Copy shared questions back onto their references before dropping the library
+    op.execute("""
+        UPDATE quizzes
+        SET questions = quiz_contents.questions
+        FROM quiz_contents
+        WHERE quizzes.content_id = quiz_contents.id AND quizzes.questions IS NULL
+    """)
+    op.drop_index(op.f('ix_quizzes_content_id'), table_name='quizzes')
+    op.drop_constraint('fk_quizzes_content_id', 'quizzes', type_='foreignkey')
+    op.drop_column('quizzes', 'content_id')
+    op.alter_column('quizzes', 'questions', existing_type=postgresql.JSON(astext_type=sa.Text()), nullable=False)
+    op.drop_index('ix_quiz_contents_lookup', table_name='quiz_contents')
+    op.drop_index(op.f('ix_quiz_contents_id'), table_name='quiz_contents')
+    op.drop_table('quiz_contents')
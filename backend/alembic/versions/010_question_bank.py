@@ -0,0 +1,46 @@
+"""Question bank
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create questions table; existing quizzes are banked by
+    # `python -m app.jobs.backfill_question_bank`
+    op.create_table('questions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('subject_key', sa.String(), nullable=False),
+        sa.Column('topic_key', sa.String(), nullable=False),
+        sa.Column('difficulty', sa.String(), nullable=False),
+        sa.Column('question', sa.String(), nullable=False),
+        sa.Column('options', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('correct_answer', sa.Integer(), nullable=False),
+        sa.Column('explanation', sa.String(), nullable=True),
+        sa.Column('source_quiz_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['source_quiz_id'], ['quizzes.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('content_hash')
+    )
+    op.create_index(op.f('ix_questions_id'), 'questions', ['id'], unique=False)
+    op.create_index('ix_questions_subject_topic_difficulty', 'questions', ['subject_key', 'topic_key', 'difficulty'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_questions_subject_topic_difficulty', table_name='questions')
+    op.drop_index(op.f('ix_questions_id'), table_name='questions')
+    op.drop_table('questions')
@@ -0,0 +1,32 @@
+"""Question MinHash signatures and LSH buckets
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing questions are signed by `python -m app.jobs.dedupe_questions`
+    op.add_column('questions', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+
+    op.create_table('question_buckets',
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('bucket', 'question_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('question_buckets')
+    op.drop_column('questions', 'minhash')
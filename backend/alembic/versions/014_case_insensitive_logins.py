@@ -0,0 +1,63 @@
+"""Case-insensitive unique logins
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger("alembic")
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Usernames with "@" would be looked up as emails. Rewritten first, so
+    # the dedupe below also catches names this makes collide.
+    rewritten = conn.execute(sa.text("SELECT id FROM users WHERE username LIKE '%@%'")).scalars().all()
+    if rewritten:
+        logger.warning(f"Replaced '@' in the usernames of users: {', '.join(map(str, rewritten))}")
+        conn.execute(sa.text("UPDATE users SET username = replace(username, '@', '-at-') WHERE username LIKE '%@%'"))
+
+    # Accounts registered again with a different case keep their data, but the
+    # newer copies are renamed so the case-insensitive indexes can be built.
+    # Their ids are logged so they can be contacted. A new name can itself
+    # collide with an existing one, so repeat until none are left.
+    for column, rename in (
+        ('username', "username || '-' || id"),
+        ('email', "'duplicate-' || id || '+' || email"),
+    ):
+        while True:
+            duplicates = conn.execute(sa.text(f"""
+                SELECT id FROM (
+                    SELECT id, row_number() OVER (PARTITION BY lower({column}) ORDER BY id) AS position
+                    FROM users
+                ) ranked
+                WHERE position > 1
+            """)).scalars().all()
+            if not duplicates:
+                break
+            logger.warning(f"Renamed case-insensitive duplicate {column}s of users: {', '.join(map(str, duplicates))}")
+            conn.execute(
+                sa.text(f"UPDATE users SET {column} = {rename} WHERE id IN :ids").bindparams(
+                    sa.bindparam('ids', expanding=True)
+                ),
+                {'ids': duplicates}
+            )
+
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+    op.create_index('ix_users_username_lower', 'users', [sa.text('lower(username)')], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_username_lower', table_name='users')
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -0,0 +1,31 @@
+"""Random sample keys for the question bank
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('questions', sa.Column('sample_key', sa.Float(), nullable=True))
+    op.execute("UPDATE questions SET sample_key = random()")
+    op.alter_column('questions', 'sample_key', nullable=False)
+
+    # The new index leads with the same columns, so it replaces the old one
+    op.drop_index('ix_questions_subject_topic_difficulty', table_name='questions')
+    op.create_index('ix_questions_subject_topic_difficulty_sample', 'questions', ['subject_key', 'topic_key', 'difficulty', 'sample_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_questions_subject_topic_difficulty_sample', table_name='questions')
+    op.create_index('ix_questions_subject_topic_difficulty', 'questions', ['subject_key', 'topic_key', 'difficulty'], unique=False)
+    op.drop_column('questions', 'sample_key')
@@ -5,6 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_db
 from app.core.security import decode_token
+from app.core.principal_cache import principal_cache, user_to_principal, principal_to_user
+from app.services.token_service import revocation_list
 from app.models.user import User
 
 security = HTTPBearer()
@@ -17,13 +19,34 @@ async def get_current_user(
     payload = decode_token(credentials.credentials)
     username: str = payload.get("sub")
     
-    if username is None:
+    if username is None or payload.get("typ") == "refresh":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials"
         )
     
-    result = await db.execute(select(User).where(User.username == username))
+    session_id = payload.get("sid")
+    if session_id is not None and await revocation_list.is_revoked(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+    
+    cached = await principal_cache.get(username)
+    if cached is not None:
+        # Adopted by the session without a query, so endpoints can still modify it
+        user = principal_to_user(cached)
+        check_token_generation(payload, user)
+        db.add(user)
+        db.info["user_id"] = user.id  # writes pin this user's reads to the primary
+        return user
+    
+    user_id = payload.get("uid")
+    if user_id is not None:
+        result = await db.execute(select(User).where(User.id == user_id))
+    else:
+        # Tokens issued before claims were versioned only carry the username
+        result = await db.execute(select(User).where(User.username == username))
     user = result.scalar_one_or_none()
     
     if user is None:
@@ -32,4 +55,27 @@ async def get_current_user(
             detail="User not found"
         )
     
+    check_token_generation(payload, user)
+    await principal_cache.set(username, user_to_principal(user))
+    db.info["user_id"] = user.id
     return user
+
+
+def check_token_generation(payload: dict, user: User) -> None:
+    if payload.get("gen", 0) < user.token_generation:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+
+
+async def get_current_admin_user(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return current_user
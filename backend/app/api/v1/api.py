@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, quiz, progress, tutor
+from app.api.v1.endpoints import auth, users, quiz, progress, tutor, leaderboard, admin
 
 api_router = APIRouter()
 
@@ -8,3 +8,5 @@ api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(quiz.router, prefix="/quiz", tags=["quiz"])
 api_router.include_router(progress.router, prefix="/progress", tags=["progress"])
 api_router.include_router(tutor.router, prefix="/tutor", tags=["ai-tutor"])
+api_router.include_router(leaderboard.router, prefix="/leaderboard", tags=["leaderboard"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
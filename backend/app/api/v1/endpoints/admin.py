@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Path, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, pool_metrics
+from app.api.deps import get_current_admin_user
+from app.core.security import password_hasher
+from app.models.user import User
+from app.services.export_service import ExportService, EXPORT_FORMATS
+
+router = APIRouter()
+
+
+@router.get("/export/{dataset}")
+async def export_dataset(
+    dataset: str = Path(..., pattern="^(quiz_attempts|progress|quizzes)$"),
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    subject: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    admin_user: User = Depends(get_current_admin_user)
+):
+    """Stream a dataset export for analytics (admin only)"""
+    export_service = ExportService(db)
+    filename = f"{dataset}_{datetime.now():%Y%m%d%H%M%S}.{format}"
+    
+    return StreamingResponse(
+        export_service.export(dataset, format, start=start, end=end, subject=subject),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/metrics")
+async def get_metrics(
+    admin_user: User = Depends(get_current_admin_user)
+):
+    """Runtime metrics of this worker process (admin only)"""
+    return {
+        "password_hashing": password_hasher.stats(),
+        "database_pool": pool_metrics(),
+    }
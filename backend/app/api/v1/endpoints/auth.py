@@ -1,37 +1,43 @@
-from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_db
-from app.core.security import (
-    verify_password,
-    get_password_hash,
-    create_access_token
-)
-from app.core.config import settings
+from app.core.security import password_hasher, decode_token
+from app.core.breached_passwords import is_breached_password, BREACHED_PASSWORD_ERROR
 from app.models.user import User
 from app.schemas.user import UserCreate, User as UserSchema
-from app.schemas.token import Token, RegisterRequest
+from app.schemas.token import Token, RegisterRequest, RefreshRequest
+from app.services.token_service import issue_tokens, revocation_list, session_expiry
+from app.services.login_limiter_service import LoginLimiterService, client_ip
+from app.services.auth_service import AuthService, username_error
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
-    # Get user by username or email
-    result = await db.execute(
-        select(User).where(
-            (User.username == form_data.username) | 
-            (User.email == form_data.username)
-        )
+    # Throttle before any password work
+    limiter = LoginLimiterService()
+    retry_after = await limiter.attempt(
+        form_data.username,
+        client_ip(request.client.host if request.client else None, request.headers.get("X-Real-IP"))
     )
-    user = result.scalar_one_or_none()
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+    
+    # Get user by username or email
+    user = await AuthService(db).get_user_by_login(form_data.username)
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -44,12 +50,55 @@ async def login(
             detail="Inactive user"
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        subject=user.username, expires_delta=access_token_expires
+    await limiter.succeeded(form_data.username)
+    return issue_tokens(user)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(
+    refresh_data: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Exchange a refresh token for a new token pair; each refresh token works once"""
+    payload = decode_token(refresh_data.refresh_token)
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
     )
+    if payload.get("typ") != "refresh" or not payload.get("jti") or not payload.get("sid"):
+        raise invalid
+    
+    session_id = payload["sid"]
+    if await revocation_list.is_revoked(session_id):
+        raise invalid
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    # Rotation: the first use revokes the token; a second use means it leaked,
+    # so the whole session is revoked
+    if not await revocation_list.revoke(payload["jti"], payload["exp"]):
+        await revocation_list.revoke(session_id, session_expiry())
+        raise invalid
+    
+    result = await db.execute(select(User).where(User.id == payload.get("uid")))
+    user = result.scalar_one_or_none()
+    if not user or not user.is_active or payload.get("gen", 0) < user.token_generation:
+        raise invalid
+    
+    return issue_tokens(user, session_id)
+
+
+@router.post("/logout")
+async def logout(refresh_data: RefreshRequest):
+    """Revoke the session of a refresh token, including its access tokens"""
+    payload = decode_token(refresh_data.refresh_token)
+    if payload.get("typ") != "refresh" or not payload.get("sid"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    
+    await revocation_list.revoke(payload["sid"], session_expiry())
+    return {"message": "Logged out successfully"}
 
 
 @router.post("/register", response_model=UserSchema)
@@ -57,22 +106,24 @@ async def register(
     user_data: RegisterRequest,
     db: AsyncSession = Depends(get_db)
 ):
-    # Check if user exists
-    result = await db.execute(
-        select(User).where(
-            (User.email == user_data.email) | (User.username == user_data.username)
+    error = username_error(user_data.username)
+    if error is None and is_breached_password(user_data.password):
+        error = BREACHED_PASSWORD_ERROR
+    if error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error
         )
-    )
-    existing_user = result.scalar_one_or_none()
     
-    if existing_user:
+    # Check if user exists, ignoring case
+    if await AuthService(db).user_exists(user_data.email, user_data.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User with this email or username already exists"
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.core.database import get_read_db
+from app.api.deps import get_current_user
+from app.models.user import User
+from app.schemas.leaderboard import Leaderboard
+from app.services.leaderboard_service import LeaderboardService
+
+router = APIRouter()
+
+
+@router.get("/{subject}", response_model=Leaderboard)
+async def get_leaderboard(
+    subject: str,
+    window: str = Query("weekly", pattern="^(weekly|all_time)$"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    leaderboard_service = LeaderboardService(db)
+    entries = await leaderboard_service.get_top(subject, window, limit)
+    me = await leaderboard_service.get_rank(subject, window, current_user.id)
+    
+    # Resolve usernames for the visible entries only
+    user_ids = [entry["user_id"] for entry in entries]
+    if user_ids:
+        result = await db.execute(
+            select(User.id, User.username).where(User.id.in_(user_ids))
+        )
+        usernames = dict(result.all())
+        for entry in entries:
+            entry["username"] = usernames.get(entry["user_id"])
+    
+    if me:
+        me["username"] = current_user.username
+    
+    return Leaderboard(subject=subject, window=window, entries=entries, me=me)
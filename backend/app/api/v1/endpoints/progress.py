@@ -1,8 +1,8 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.progress import Progress
@@ -13,13 +13,14 @@ from app.schemas.progress import (
     DashboardStats
 )
 from app.services.progress_service import ProgressService
+from app.services.review_service import ReviewService
 
 router = APIRouter()
 
 
 @router.get("/dashboard", response_model=DashboardStats)
 async def get_dashboard_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     progress_service = ProgressService(db)
@@ -27,10 +28,20 @@ async def get_dashboard_stats(
     return stats
 
 
+@router.get("/due", response_model=List[ProgressSchema])
+async def get_due_reviews(
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    review_service = ReviewService(db)
+    return await review_service.get_due(current_user.id, limit=limit)
+
+
 @router.get("/", response_model=List[ProgressSchema])
 async def get_progress(
     subject: str = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     query = select(Progress).where(Progress.user_id == current_user.id)
@@ -1,42 +1,71 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections import defaultdict
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from app.core.database import get_db
-from app.api.deps import get_current_user
+from sqlalchemy import select, and_, insert
+from sqlalchemy.orm import joinedload
+from app.core.database import get_db, get_read_db
+from app.api.deps import get_current_user, get_current_admin_user
 from app.models.user import User
 from app.models.quiz import Quiz, QuizAttempt
 from app.schemas.quiz import (
     Quiz as QuizSchema,
     QuizCreate,
     QuizGenerate,
+    QuizPage,
+    QuizImportReport,
     QuizAttempt as QuizAttemptSchema,
-    QuizAttemptCreate
+    QuizAttemptCreate,
+    QuizAttemptBatchCreate,
+    QuizAnalytics,
+    AttemptDraft,
+    AttemptDraftUpdate
 )
 from app.services.quiz_service import QuizService
 from app.services.ai_service import AIService
+from app.services.quiz_library_service import QuizLibraryService
+from app.services.question_bank_service import QuestionBankService
+from app.services.review_service import ReviewService
+from app.services.progress_service import ProgressService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.autosave_service import AutosaveService
+from app.services.import_service import ImportService
 
 router = APIRouter()
 
+MAX_BATCH_ATTEMPTS = 5000
+MAX_DRAFT_QUESTIONS = 500
 
-@router.get("/", response_model=List[QuizSchema])
+
+@router.get("/", response_model=QuizPage)
 async def get_quizzes(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     subject: str = None,
-    db: AsyncSession = Depends(get_db),
+    skip: Optional[int] = Query(None, include_in_schema=False),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = select(Quiz).where(Quiz.user_id == current_user.id)
+    if skip is not None:
+        # Offsets were replaced by cursors; ignoring skip would repeat page one
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="skip is no longer supported; pass next_cursor from the previous page as cursor"
+        )
     
-    if subject:
-        query = query.where(Quiz.subject == subject)
+    quiz_service = QuizService(db)
     
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    quizzes = result.scalars().all()
+    try:
+        quizzes, next_cursor = await quiz_service.list_quizzes(
+            current_user.id, subject=subject, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return quizzes
+    return {"items": quizzes, "next_cursor": next_cursor}
 
 
 @router.post("/", response_model=QuizSchema)
@@ -45,51 +74,121 @@ async def create_quiz(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    questions = [q.dict() for q in quiz_data.questions]
     quiz = Quiz(
-        **quiz_data.dict(),
+        **quiz_data.dict(exclude={"questions"}),
         user_id=current_user.id,
-        questions=[q.dict() for q in quiz_data.questions]
+        questions=questions
     )
     
     db.add(quiz)
+    await db.flush()
+    await QuestionBankService(db).add_questions(
+        questions, quiz.subject, quiz.topic, quiz.difficulty, source_quiz_id=quiz.id
+    )
     await db.commit()
     await db.refresh(quiz)
     
     return quiz
 
 
+@router.post("/import", response_model=QuizImportReport)
+async def import_quizzes(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Bulk-create quizzes from a streamed NDJSON or CSV request body"""
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    
+    try:
+        return await ImportService(db).import_quizzes(request.stream(), format, current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.post("/generate", response_model=QuizSchema)
 async def generate_quiz(
     quiz_params: QuizGenerate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    ai_service = AIService()
-    quiz_service = QuizService(db)
+    library = QuizLibraryService(db)
+    bank = QuestionBankService(db)
     
     try:
-        # Generate quiz using AI
-        generated_quiz = await ai_service.generate_quiz(
-            subject=quiz_params.subject,
-            topic=quiz_params.topic,
-            difficulty=quiz_params.difficulty,
-            num_questions=quiz_params.num_questions
-        )
+        if quiz_params.assemble:
+            # Build the quiz from banked questions without calling the AI
+            questions = await bank.sample(
+                subject=quiz_params.subject,
+                topic=quiz_params.topic,
+                difficulty=quiz_params.difficulty,
+                num_questions=quiz_params.num_questions
+            )
+            if questions is not None:
+                quiz = Quiz(
+                    title=f"{quiz_params.topic} Quiz",
+                    description=f"{quiz_params.subject} questions on {quiz_params.topic}",
+                    subject=quiz_params.subject,
+                    topic=quiz_params.topic,
+                    difficulty=quiz_params.difficulty,
+                    questions=questions,
+                    user_id=current_user.id,
+                    is_ai_generated=False
+                )
+                db.add(quiz)
+                await db.commit()
+                await db.refresh(quiz)
+                
+                return quiz
         
-        # Save to database
-        quiz = Quiz(
-            title=generated_quiz["title"],
-            description=generated_quiz["description"],
-            subject=quiz_params.subject,
-            difficulty=quiz_params.difficulty,
-            questions=generated_quiz["questions"],
+        # Reuse a matching quiz from the shared library when there is one
+        content = None
+        generated_quiz = None
+        if quiz_params.use_library:
+            content = await library.find(
+                subject=quiz_params.subject,
+                topic=quiz_params.topic,
+                difficulty=quiz_params.difficulty,
+                num_questions=quiz_params.num_questions,
+                user_id=current_user.id
+            )
+        
+        if content is None:
+            # Generate quiz using AI
+            generated_quiz = await AIService().generate_quiz(
+                subject=quiz_params.subject,
+                topic=quiz_params.topic,
+                difficulty=quiz_params.difficulty,
+                num_questions=quiz_params.num_questions
+            )
+            content = await library.store(
+                generated_quiz,
+                subject=quiz_params.subject,
+                topic=quiz_params.topic,
+                difficulty=quiz_params.difficulty
+            )
+        
+        # Save the user's reference to the shared content
+        quiz = await library.add_reference(
+            content,
             user_id=current_user.id,
-            is_ai_generated=True
+            subject=quiz_params.subject,
+            topic=quiz_params.topic,
+            difficulty=quiz_params.difficulty
         )
-        
-        db.add(quiz)
+        if generated_quiz is not None:
+            await db.flush()
+            await bank.add_questions(
+                generated_quiz["questions"], quiz.subject, quiz.topic, quiz.difficulty, source_quiz_id=quiz.id
+            )
         await db.commit()
-        await db.refresh(quiz)
+        await db.refresh(quiz, ["created_at", "content"])
         
         return quiz
         
@@ -103,11 +202,13 @@ async def generate_quiz(
 @router.get("/{quiz_id}", response_model=QuizSchema)
 async def get_quiz(
     quiz_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(
-        select(Quiz).where(
+        select(Quiz)
+        .options(joinedload(Quiz.content))
+        .where(
             and_(Quiz.id == quiz_id, Quiz.user_id == current_user.id)
         )
     )
@@ -122,6 +223,61 @@ async def get_quiz(
     return quiz
 
 
+@router.get("/{quiz_id}/analytics", response_model=QuizAnalytics)
+async def get_quiz_analytics(
+    quiz_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    quiz_service = QuizService(db)
+    analytics = await quiz_service.get_quiz_analytics(quiz_id, current_user.id)
+    
+    if analytics is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found"
+        )
+    
+    return analytics
+
+
+@router.get("/{quiz_id}/attempt", response_model=AttemptDraft)
+async def get_attempt_draft(
+    quiz_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Resume an in-progress attempt"""
+    draft = await AutosaveService(db).get_draft(current_user.id, quiz_id)
+    
+    if draft is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No attempt in progress"
+        )
+    
+    return draft
+
+
+@router.patch("/{quiz_id}/attempt", status_code=status.HTTP_204_NO_CONTENT)
+async def autosave_attempt(
+    quiz_id: int,
+    delta: AttemptDraftUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Autosave changed answers; coalesced in the draft store and flushed later"""
+    if any(not 0 <= index < MAX_DRAFT_QUESTIONS for index in delta.answers):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Question index must be between 0 and {MAX_DRAFT_QUESTIONS - 1}"
+        )
+    
+    await AutosaveService(db).save_delta(
+        current_user.id, quiz_id, delta.answers, delta.time_taken
+    )
+
+
 @router.post("/{quiz_id}/submit", response_model=QuizAttemptSchema)
 async def submit_quiz(
     quiz_id: int,
@@ -139,21 +295,118 @@ async def submit_quiz(
             detail="Quiz not found"
         )
     
+    # Fill in anything not sent from the autosaved draft
+    autosave_service = AutosaveService(db)
+    answers, time_taken = attempt_data.answers, attempt_data.time_taken
+    if answers is None or time_taken is None:
+        draft = await autosave_service.get_draft(current_user.id, quiz_id)
+        if draft is None and answers is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No answers submitted and no attempt in progress"
+            )
+        if answers is None:
+            answers = draft["answers"]
+        if time_taken is None:
+            time_taken = draft["time_taken"] if draft else 0
+    
     # Calculate score
     quiz_service = QuizService(db)
-    score = await quiz_service.calculate_score(quiz, attempt_data.answers)
+    score = await quiz_service.calculate_score(quiz, answers)
     
     # Save attempt
     attempt = QuizAttempt(
         user_id=current_user.id,
         quiz_id=quiz_id,
-        answers=attempt_data.answers,
+        answers=answers,
         score=score,
-        time_taken=attempt_data.time_taken
+        time_taken=time_taken
     )
     
     db.add(attempt)
+    await autosave_service.discard(current_user.id, quiz_id)
+    
+    # Reschedule the topic for spaced review and record the score
+    review_service = ReviewService(db)
+    progress = await review_service.record_review(current_user.id, quiz, score)
+    await ProgressService(db).record_score(progress, score)
+    
     await db.commit()
     await db.refresh(attempt)
+    await autosave_service.forget(current_user.id, quiz_id)
+    
+    await LeaderboardService(db).record_attempt(current_user.id, quiz.subject, score)
     
     return attempt
+
+
+@router.post("/{quiz_id}/submit/batch", response_model=List[QuizAttemptSchema])
+async def submit_quiz_batch(
+    quiz_id: int,
+    batch: QuizAttemptBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    admin_user: User = Depends(get_current_admin_user)
+):
+    """Grade and save many attempts at once for any users (admin, e.g. on exam day)"""
+    result = await db.execute(select(Quiz).where(Quiz.id == quiz_id))
+    quiz = result.scalar_one_or_none()
+    
+    if not quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found"
+        )
+    
+    if len(batch.attempts) > MAX_BATCH_ATTEMPTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {MAX_BATCH_ATTEMPTS} attempts"
+        )
+    
+    if not batch.attempts:
+        return []
+    
+    user_ids = {attempt.user_id for attempt in batch.attempts}
+    result = await db.execute(select(User.id).where(User.id.in_(user_ids)))
+    missing = user_ids - set(result.scalars().all())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown user ids: {sorted(missing)}"
+        )
+    
+    # Grade every attempt in one array comparison
+    quiz_service = QuizService(db)
+    scores = await quiz_service.calculate_scores(quiz, [a.answers for a in batch.attempts])
+    
+    rows = [
+        {
+            "user_id": attempt.user_id,
+            "quiz_id": quiz_id,
+            "answers": attempt.answers,
+            "score": float(score),
+            "time_taken": attempt.time_taken,
+            "completed": True
+        }
+        for attempt, score in zip(batch.attempts, scores)
+    ]
+    result = await db.execute(insert(QuizAttempt).returning(QuizAttempt), rows)
+    attempts = result.scalars().all()
+    
+    user_scores = defaultdict(list)
+    for row in rows:
+        user_scores[row["user_id"]].append(row["score"])
+    
+    review_service = ReviewService(db)
+    progress_service = ProgressService(db)
+    records = await review_service.record_reviews(quiz, user_scores)
+    for user_id, user_score_list in user_scores.items():
+        await progress_service.record_scores(records[user_id], user_score_list)
+    
+    await db.commit()
+    
+    leaderboard_service = LeaderboardService(db)
+    for row in rows:
+        await leaderboard_service.record_attempt(row["user_id"], quiz.subject, row["score"])
+    
+    return attempts
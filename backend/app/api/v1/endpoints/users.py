@@ -3,18 +3,26 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.core.database import get_db, get_read_db
+from app.api.deps import get_current_user, get_current_admin_user
 from app.models.user import User
 from app.schemas.user import (
     User as UserSchema,
     UserUpdate,
-    UserInDB
+    UserInDB,
+    UserBulkCreate,
+    UserBulkReport
 )
-from app.core.security import get_password_hash, verify_password
+from app.core.security import password_hasher, create_access_token, user_claims
+from app.core.principal_cache import principal_cache
+from app.core.breached_passwords import is_breached_password, BREACHED_PASSWORD_ERROR
+from app.services.auth_service import AuthService
+from app.services.token_service import issue_tokens
 
 router = APIRouter()
 
+MAX_ROSTER_SIZE = 10000
+
 
 @router.get("/me", response_model=UserSchema)
 async def get_current_user_profile(
@@ -38,15 +46,32 @@ async def update_current_user(
             setattr(current_user, field, value)
     
     await db.commit()
+    await principal_cache.invalidate(current_user.username)
     await db.refresh(current_user)
     
     return current_user
 
 
+@router.post("/bulk", response_model=UserBulkReport)
+async def create_users_bulk(
+    roster: UserBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    admin_user: User = Depends(get_current_admin_user)
+):
+    """Provision a roster of users at once, e.g. a school's students (admin only)"""
+    if len(roster.users) > MAX_ROSTER_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A roster may contain at most {MAX_ROSTER_SIZE} users"
+        )
+    
+    return await AuthService(db).create_users(roster.users)
+
+
 @router.get("/{user_id}", response_model=UserSchema)
 async def get_user_by_id(
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user by ID (for admin or public profiles)"""
@@ -78,16 +103,19 @@ async def delete_current_user(
     """Delete current user account (requires password confirmation)"""
     
     # Verify password before deletion
-    if not verify_password(password, current_user.hashed_password):
+    await db.refresh(current_user, ["hashed_password"])
+    if not await password_hasher.verify(password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect password"
         )
     
-    # Soft delete - deactivate user instead of hard delete
+    # Soft delete - deactivate user instead of hard delete, revoking their tokens
     current_user.is_active = False
+    current_user.token_generation += 1
     
     await db.commit()
+    await principal_cache.invalidate(current_user.username)
     
     return {"message": "User account deactivated successfully"}
 
@@ -102,7 +130,8 @@ async def change_password(
     """Change user password"""
     
     # Verify current password
-    if not verify_password(current_password, current_user.hashed_password):
+    await db.refresh(current_user, ["hashed_password"])
+    if not await password_hasher.verify(current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
@@ -115,19 +144,28 @@ async def change_password(
             detail="New password must be at least 8 characters long"
         )
     
-    # Update password
-    current_user.hashed_password = get_password_hash(new_password)
+    if is_breached_password(new_password):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=BREACHED_PASSWORD_ERROR
+        )
+    
+    # Update password; tokens issued before the change stop working
+    current_user.hashed_password = await password_hasher.hash(new_password)
+    current_user.token_generation += 1
     
     await db.commit()
+    await principal_cache.invalidate(current_user.username)
     
-    return {"message": "Password updated successfully"}
+    # A fresh session, so the client can keep refreshing and log out as usual
+    return {"message": "Password updated successfully", **issue_tokens(current_user)}
 
 
 @router.get("/", response_model=List[UserSchema])
 async def get_users(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get list of users (for admin purposes or public directory)"""
@@ -158,8 +196,15 @@ async def upgrade_to_premium(
     current_user.is_premium = True
     
     await db.commit()
+    await principal_cache.invalidate(current_user.username)
     
-    return {"message": "Successfully upgraded to premium", "is_premium": True}
+    # Reissue the token so its premium claim is current
+    return {
+        "message": "Successfully upgraded to premium",
+        "is_premium": True,
+        "access_token": create_access_token(subject=current_user.username, claims=user_claims(current_user)),
+        "token_type": "bearer"
+    }
 
 
 @router.get("/stats/summary")
@@ -0,0 +1,67 @@
+import hashlib
+import math
+import mmap
+import struct
+from typing import Optional
+
+FILE_MAGIC = b"SSBLOOM1"
+FILE_HEADER = struct.Struct("<8sQI")  # magic, number of bits, number of hashes
+
+
+class BloomFilter:
+    """Set membership with no false negatives and a tunable false-positive rate.
+
+    A miss proves the item was never added, so callers only need an exact
+    (slower) lookup when this says "maybe". Bits live in any writable
+    buffer, e.g. a bytearray or an mmap.
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, buffer: Optional[bytearray] = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = buffer if buffer is not None else bytearray((num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float = 0.01) -> "BloomFilter":
+        """Size a filter to hold `capacity` items at the given false-positive rate"""
+        capacity = max(1, capacity)
+        num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (first + i * second) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(FILE_HEADER.pack(FILE_MAGIC, self.num_bits, self.num_hashes))
+            f.write(self.bits)
+
+    @classmethod
+    def open(cls, path: str) -> "BloomFilter":
+        """Map a saved filter read-only.
+
+        Pages are shared through the OS page cache, so every worker can open
+        the same file without holding its own copy.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, num_bits, num_hashes = (
+            FILE_HEADER.unpack_from(mapped) if len(mapped) >= FILE_HEADER.size else (None, 0, 0)
+        )
+        if magic != FILE_MAGIC or len(mapped) < FILE_HEADER.size + (num_bits + 7) // 8:
+            mapped.close()
+            raise ValueError(f"{path} is not a Bloom filter file")
+        return cls(num_bits, num_hashes, memoryview(mapped)[FILE_HEADER.size:])
@@ -0,0 +1,36 @@
+import hashlib
+import logging
+from typing import Optional
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BREACHED_PASSWORD_ERROR = "This password is too common or has appeared in a data breach"
+
+_filter: Optional[BloomFilter] = None
+_loaded = False
+
+
+def password_key(password: str) -> str:
+    """Uppercase SHA-1 hex, the form breach corpora are published in"""
+    return hashlib.sha1(password.encode("utf-8")).hexdigest().upper()
+
+
+def load_breached_password_filter() -> Optional[BloomFilter]:
+    """Map BREACHED_PASSWORD_FILTER_PATH once per process; None when unset"""
+    global _filter, _loaded
+    if not _loaded:
+        _loaded = True
+        if settings.BREACHED_PASSWORD_FILTER_PATH:
+            try:
+                _filter = BloomFilter.open(settings.BREACHED_PASSWORD_FILTER_PATH)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Breached password screening disabled: {str(e)}")
+    return _filter
+
+
+def is_breached_password(password: str) -> bool:
+    """Whether the password is in the breached list (rarely, a false positive)"""
+    breached = load_breached_password_filter()
+    return breached is not None and password_key(password) in breached
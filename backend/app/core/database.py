@@ -1,17 +1,125 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Checkout counters across the engine's pools in this process"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and how many time out"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_stats.timeouts += 1
+            raise
+        pool_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def database_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://")
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """create_async_engine arguments from the DB_* settings.
+
+    Pool sizing applies to Postgres; SQLite (tests, local checks) keeps
+    SQLAlchemy's defaults.
+    """
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        return options
+    
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if parsed.get_driver_name() == "asyncpg":
+        # 0 disables prepared statement caching, as needed behind pgbouncer
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
 
 # Create async engine
 engine = create_async_engine(
-    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=True if settings.ENVIRONMENT == "development" else False
+    database_url(settings.DATABASE_URL),
+    **engine_options(database_url(settings.DATABASE_URL))
 )
 
+class WriteTrackingSession(Session):
+    """Notes in `info` when a transaction writes, for read-your-writes routing"""
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def _flushed(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def _executed(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(WriteTrackingSession, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("wrote", None)
+
+
+class PrimarySession(AsyncSession):
+    """Session on the primary. Committing a write pins the request's user
+    (set in `info["user_id"]` by get_current_user) to the primary for
+    READ_YOUR_WRITES_SECONDS, so their next reads see it."""
+
+    async def commit(self) -> None:
+        await super().commit()  # flushes pending changes first
+        wrote = self.info.pop("wrote", False)
+        user_id = self.info.get("user_id")
+        if wrote and user_id is not None and replicas.engines:
+            await primary_pins.pin(user_id)
+
+
 # Session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
-    class_=AsyncSession,
+    class_=PrimarySession,
+    sync_session_class=WriteTrackingSession,
     expire_on_commit=False
 )
 
@@ -19,10 +127,162 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
+def pool_metrics() -> Dict[str, Any]:
+    """Live state of this process's connection pool"""
+    pool = engine.pool
+    metrics: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        metrics.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+        )
+    average_wait = pool_stats.wait_seconds_total / pool_stats.checkouts if pool_stats.checkouts else 0.0
+    metrics.update(
+        checkouts=pool_stats.checkouts,
+        timeouts=pool_stats.timeouts,
+        wait_ms_avg=round(average_wait * 1000, 2),
+        wait_ms_max=round(pool_stats.wait_seconds_max * 1000, 2),
+    )
+    return metrics
+
+
+class MemoryPinStore:
+    """In-process read-your-writes pins, used when Redis is disabled"""
+
+    def __init__(self):
+        self.pinned_until: Dict[int, float] = {}
+
+    async def pin(self, user_id: int) -> None:
+        now = time.monotonic()
+        self.pinned_until = {uid: until for uid, until in self.pinned_until.items() if until > now}
+        self.pinned_until[user_id] = now + settings.READ_YOUR_WRITES_SECONDS
+
+    async def is_pinned(self, user_id: int) -> bool:
+        return self.pinned_until.get(user_id, 0) > time.monotonic()
+
+
+class RedisPinStore:
+    """Pins as expiring keys, so every worker routes the user the same way"""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def pin(self, user_id: int) -> None:
+        await self.client.set(f"primary_pin:{user_id}", 1, px=int(settings.READ_YOUR_WRITES_SECONDS * 1000))
+
+    async def is_pinned(self, user_id: int) -> bool:
+        return bool(await self.client.exists(f"primary_pin:{user_id}"))
+
+
+class PrimaryPins:
+    def __init__(self):
+        self.memory = MemoryPinStore()
+
+    def _store(self):
+        client = get_redis()
+        return self.memory if client is None else RedisPinStore(client)
+
+    async def pin(self, user_id: int) -> None:
+        try:
+            await self._store().pin(user_id)
+        except Exception as e:
+            logger.warning(f"Failed to pin user {user_id} to the primary: {str(e)}")
+
+    async def is_pinned(self, user_id: int) -> bool:
+        try:
+            return await self._store().is_pinned(user_id)
+        except Exception as e:
+            logger.warning(f"Failed to check primary pin for user {user_id}: {str(e)}")
+            return True  # when unsure, read from the primary
+
+
+primary_pins = PrimaryPins()
+
+
+class ReplicaSet:
+    """Read replicas from DATABASE_REPLICA_URLS, picked round-robin among
+    those that passed their last health check"""
+
+    def __init__(self, urls: List[str]):
+        self.engines = [create_async_engine(database_url(url), **engine_options(database_url(url))) for url in urls]
+        self.sessionmakers = [
+            async_sessionmaker(replica, class_=AsyncSession, expire_on_commit=False)
+            for replica in self.engines
+        ]
+        self.healthy = [True] * len(self.engines)
+        self._next = 0
+
+    def pick(self) -> Optional[async_sessionmaker]:
+        for _ in range(len(self.engines)):
+            index = self._next % len(self.engines)
+            self._next += 1
+            if self.healthy[index]:
+                return self.sessionmakers[index]
+        return None
+
+    async def check(self) -> None:
+        for index, replica in enumerate(self.engines):
+            try:
+                async with asyncio.timeout(settings.REPLICA_HEALTH_CHECK_TIMEOUT_SECONDS):
+                    async with replica.connect() as connection:
+                        await connection.execute(text("SELECT 1"))
+                healthy = True
+            except Exception as e:
+                healthy = False
+                if self.healthy[index]:
+                    logger.warning(f"Read replica {index} failed its health check: {str(e)}")
+            self.healthy[index] = healthy
+
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+
+replicas = ReplicaSet(settings.DATABASE_REPLICA_URLS)
+
+
+async def check_replicas_periodically(interval: float) -> None:
+    """Background task started with the app when replicas are configured"""
+    while True:
+        await asyncio.sleep(interval)
+        await replicas.check()
+
+
 # Dependency to get database session
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+def _token_user_id(request: Request) -> Optional[int]:
+    from app.core.security import decode_token  # avoid a circular import
+    
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_token(token).get("uid")
+    except Exception:
+        return None
+
+
+# Dependency for read-only endpoints: a replica session, or the primary when
+# there are no healthy replicas or the user wrote within READ_YOUR_WRITES_SECONDS
+async def get_read_db(request: Request):
+    sessionmaker = replicas.pick() if replicas.engines else None
+    if sessionmaker is not None:
+        user_id = _token_user_id(request)
+        if user_id is not None and await primary_pins.is_pinned(user_id):
+            sessionmaker = None
+    
+    async with (sessionmaker or AsyncSessionLocal)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,123 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import DateTime
+from sqlalchemy.orm import make_transient_to_detached
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Password hashes never leave the database; endpoints that check one refresh it
+UNCACHED_COLUMNS = {"hashed_password"}
+CACHED_COLUMNS = {column.key for column in User.__table__.columns} - UNCACHED_COLUMNS
+
+
+def principal_key(subject: str) -> str:
+    return f"principal:{subject}"
+
+
+def user_to_principal(user: User) -> Dict[str, Any]:
+    """JSON-safe snapshot of a user's columns"""
+    data = {}
+    for column in User.__table__.columns:
+        if column.key in UNCACHED_COLUMNS:
+            continue
+        value = getattr(user, column.key)
+        data[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+def principal_to_user(data: Dict[str, Any]) -> User:
+    """Rebuild a detached User that a session can adopt without a query"""
+    values = {}
+    for column in User.__table__.columns:
+        if column.key not in data:
+            continue
+        value = data[column.key]
+        if isinstance(column.type, DateTime) and value is not None:
+            value = datetime.fromisoformat(value)
+        values[column.key] = value
+    user = User(**values)
+    make_transient_to_detached(user)  # as if loaded; uncached columns are expired
+    return user
+
+
+class PrincipalCache:
+    """Users resolved by get_current_user, keyed by token subject.
+
+    A bounded in-process LRU sits in front of a Redis tier shared by all
+    workers. Changes are invalidated explicitly; other workers' LRUs only
+    hold entries for PRINCIPAL_CACHE_LOCAL_TTL_SECONDS, which bounds how
+    long they can serve a stale user. Without Redis the LRU is the only
+    tier and uses the full TTL.
+    """
+
+    def __init__(self, max_size: int, ttl: float, local_ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self.local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        entry = self.local.get(subject)
+        if entry is not None:
+            expires_at, data = entry
+            if expires_at > time.monotonic():
+                self.local.move_to_end(subject)
+                return data
+            del self.local[subject]
+
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            cached = await client.get(principal_key(subject))
+        except Exception as e:
+            logger.warning(f"Principal cache read failed: {str(e)}")
+            return None
+        if cached is None:
+            return None
+        data = json.loads(cached)
+        if not CACHED_COLUMNS <= data.keys():
+            return None  # written before a column was added
+        self._remember(subject, data, self.local_ttl)
+        return data
+
+    async def set(self, subject: str, data: Dict[str, Any]) -> None:
+        client = get_redis()
+        self._remember(subject, data, self.ttl if client is None else self.local_ttl)
+        if client is None:
+            return
+        try:
+            await client.set(principal_key(subject), json.dumps(data), ex=int(self.ttl))
+        except Exception as e:
+            logger.warning(f"Principal cache write failed: {str(e)}")
+
+    async def invalidate(self, subject: str) -> None:
+        """Drop a user after their row changes (call once the change is committed)"""
+        self.local.pop(subject, None)
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            await client.delete(principal_key(subject))
+        except Exception as e:
+            logger.warning(f"Principal cache invalidation failed: {str(e)}")
+
+    def _remember(self, subject: str, data: Dict[str, Any], ttl: float) -> None:
+        self.local[subject] = (time.monotonic() + ttl, data)
+        self.local.move_to_end(subject)
+        while len(self.local) > self.max_size:
+            self.local.popitem(last=False)
+
+
+principal_cache = PrincipalCache(
+    settings.PRINCIPAL_CACHE_SIZE,
+    settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS
+)
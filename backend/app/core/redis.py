@@ -0,0 +1,26 @@
+from typing import Optional
+import redis.asyncio as redis
+from app.core.config import settings
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Shared Redis client, or None when REDIS_URL is empty.
+
+    Services fall back to in-process stores when this returns None,
+    which is how the test suite runs.
+    """
+    global _client
+    if not settings.REDIS_URL:
+        return None
+    if _client is None:
+        _client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -1,5 +1,9 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
@@ -7,9 +11,28 @@ from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+TOKEN_CLAIMS_VERSION = 1
+
+# Tokens whose signature already checked out -> their payload, most recent last
+_verified_tokens: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def user_claims(user) -> Dict[str, Any]:
+    """Claims identifying a user without a lookup.
+
+    `gen` is the user's token generation when the token was issued; bumping
+    the generation revokes every token issued before.
+    """
+    return {
+        "ver": TOKEN_CLAIMS_VERSION,
+        "uid": user.id,
+        "prem": user.is_premium,
+        "gen": user.token_generation,
+    }
+
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any], expires_delta: timedelta = None, claims: Dict[str, Any] = None
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -18,7 +41,7 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -31,15 +54,102 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords; the unit of work for process pools"""
+    return [pwd_context.hash(password) for password in passwords]
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool instead of the event loop.
+
+    bcrypt releases the GIL, so hashing on threads leaves the loop free to
+    serve other requests. Work beyond `workers` running and `queue_limit`
+    waiting is rejected with a 503 instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, queue_limit: int, latency_samples: int = 1000):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0  # submitted and not finished: running plus queued
+        self._latencies = deque(maxlen=latency_samples)  # seconds, queue wait included
+        self.completed = 0
+        self.rejected = 0
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self.run(get_password_hash, password)
+
+    async def run(self, func: Callable, *args) -> Any:
+        if self._pending >= self.workers + self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent sign-ins, please retry",
+                headers={"Retry-After": "1"},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+
+        started = time.perf_counter()
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+            self.completed += 1
+            self._latencies.append(time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+        running = min(self._pending, self.workers)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 1)
+
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "running": running,
+            "queued": self._pending - running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "latency_ms_p50": percentile(0.5),
+            "latency_ms_p99": percentile(0.99),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_LIMIT)
+
+
 def decode_token(token: str) -> dict:
+    payload = _verified_tokens.get(token)
+    if payload is not None and payload["exp"] > time.time():
+        _verified_tokens.move_to_end(token)
+        return payload
+    _verified_tokens.pop(token, None)
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+
+    _verified_tokens[token] = payload
+    while len(_verified_tokens) > settings.VERIFIED_TOKEN_CACHE_SIZE:
+        _verified_tokens.popitem(last=False)
+    return payload
\ No newline at end of file
@@ -0,0 +1,95 @@
+import ast
+import asyncio
+import glob
+import logging
+import os
+from typing import Optional
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import engine, Base, replicas
+from app.services.ai_service import warm_openai_client
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic", "versions"
+)
+
+
+def alembic_head() -> Optional[str]:
+    """The newest migration revision, or None if the history has several heads.
+
+    Reads the `revision`/`down_revision` assignments straight from the
+    migration files: importing Alembic to ask it costs more than the
+    create_all this check lets us skip.
+    """
+    revisions, parents = set(), set()
+    for path in glob.glob(os.path.join(VERSIONS_DIR, "*.py")):
+        with open(path) as f:
+            module = ast.parse(f.read())
+        for node in module.body:
+            if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+                name = node.targets[0].id
+                if name == "revision":
+                    revisions.add(ast.literal_eval(node.value))
+                elif name == "down_revision":
+                    down_revision = ast.literal_eval(node.value)
+                    if isinstance(down_revision, (tuple, list)):
+                        parents.update(down_revision)
+                    elif down_revision is not None:
+                        parents.add(down_revision)
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+async def schema_is_current() -> bool:
+    """Whether the database has been migrated to the Alembic head"""
+    try:
+        async with engine.connect() as conn:
+            version = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+    except Exception:
+        return False  # never migrated
+    return version is not None and version == alembic_head()
+
+
+async def prepare_schema() -> None:
+    """Create missing tables, unless fast start finds the schema already migrated.
+
+    create_all inspects the catalog for every table on each boot; a migrated
+    database has nothing for it to do.
+    """
+    if settings.FAST_START and await schema_is_current():
+        logger.info("Schema is at the Alembic head, skipping create_all")
+        return
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def warm_database(connections: int) -> None:
+    """Open pool connections up front so early requests don't pay to connect.
+
+    Connections are opened concurrently so each ping gets its own; the pool
+    keeps up to DB_POOL_SIZE of them once they are returned.
+    """
+    async def ping(target) -> None:
+        async with target.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    targets = [engine] + [replica for replica, healthy in zip(replicas.engines, replicas.healthy) if healthy]
+    await asyncio.gather(*(ping(target) for target in targets for _ in range(connections)))
+
+
+async def warm_up() -> None:
+    """Fast start: warm the database pools and the LLM client before serving"""
+    if not settings.FAST_START:
+        return
+
+    async def warm_llm() -> None:
+        if not settings.STARTUP_WARM_LLM_CLIENT:
+            return
+        try:
+            await warm_openai_client(settings.STARTUP_WARM_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to warm the OpenAI client: {str(e)}")
+
+    await asyncio.gather(warm_database(settings.STARTUP_WARM_DB_CONNECTIONS), warm_llm())
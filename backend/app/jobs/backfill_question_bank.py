@@ -0,0 +1,71 @@
+"""Bank the questions of quizzes created before the question bank existed.
+
+    python -m app.jobs.backfill_question_bank
+
+Progress is checkpointed, so the job can be stopped and rerun safely.
+"""
+import asyncio
+import logging
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from app.core.database import AsyncSessionLocal, engine
+from app.models.job import JobCheckpoint
+from app.models.quiz import Quiz
+from app.services.question_bank_service import QuestionBankService
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "question_bank"
+BATCH_SIZE = 500
+
+
+async def backfill(session, batch_size: int = BATCH_SIZE) -> dict:
+    result = await session.execute(
+        select(JobCheckpoint).where(JobCheckpoint.name == CHECKPOINT_NAME)
+    )
+    checkpoint = result.scalar_one_or_none()
+    if checkpoint is None:
+        checkpoint = JobCheckpoint(name=CHECKPOINT_NAME, cursor=0, state={})
+        session.add(checkpoint)
+
+    bank = QuestionBankService(session)
+    stats = {"quizzes": 0, "questions": 0}
+    while True:
+        result = await session.execute(
+            select(Quiz)
+            .options(joinedload(Quiz.content))
+            .where(Quiz.id > checkpoint.cursor)
+            .order_by(Quiz.id)
+            .limit(batch_size)
+        )
+        quizzes = result.scalars().all()
+        if not quizzes:
+            break
+
+        for quiz in quizzes:
+            stats["questions"] += await bank.add_questions(
+                quiz.questions, quiz.subject, quiz.topic, quiz.difficulty, source_quiz_id=quiz.id
+            )
+        stats["quizzes"] += len(quizzes)
+        checkpoint.cursor = quizzes[-1].id
+        await session.commit()
+        logger.info(f"Banked questions up to quiz {checkpoint.cursor}")
+
+    return stats
+
+
+async def run() -> dict:
+    async with AsyncSessionLocal() as session:
+        stats = await backfill(session)
+    await engine.dispose()
+    return stats
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    stats = asyncio.run(run())
+    logger.info("Scanned %d quizzes, banked %d new questions", stats["quizzes"], stats["questions"])
+
+
+if __name__ == "__main__":
+    main()
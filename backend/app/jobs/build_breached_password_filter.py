@@ -0,0 +1,57 @@
+"""Build the breached-password Bloom filter from a local wordlist.
+
+    python -m app.jobs.build_breached_password_filter wordlist.txt breached_passwords.bloom
+    python -m app.jobs.build_breached_password_filter pwned-passwords-sha1.txt breached_passwords.bloom --sha1 --false-positive-rate 0.0001
+
+Plain wordlists hold one password per line. With --sha1 each line is a
+SHA-1 hash, optionally followed by ":count" (the Pwned Passwords format).
+Point BREACHED_PASSWORD_FILTER_PATH at the output file.
+"""
+import argparse
+import logging
+from typing import Iterator
+from app.core.bloom import BloomFilter
+from app.core.breached_passwords import password_key
+
+logger = logging.getLogger(__name__)
+
+
+def read_keys(path: str, sha1: bool) -> Iterator[str]:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            if sha1:
+                yield line.split(":", 1)[0].strip().upper()
+            else:
+                yield password_key(line)
+
+
+def build(wordlist: str, output: str, false_positive_rate: float, sha1: bool) -> int:
+    # Two passes: count first so the filter is sized exactly
+    count = sum(1 for _ in read_keys(wordlist, sha1))
+    bloom = BloomFilter.for_capacity(count, false_positive_rate)
+    for key in read_keys(wordlist, sha1):
+        bloom.add(key)
+    bloom.save(output)
+    logger.info(
+        f"Wrote {output}: {count} passwords, {len(bloom.bits) / 1024 / 1024:.2f} MiB, "
+        f"{bloom.num_hashes} hashes, {false_positive_rate} false-positive rate"
+    )
+    return count
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Build the breached-password Bloom filter")
+    parser.add_argument("wordlist")
+    parser.add_argument("output")
+    parser.add_argument("--false-positive-rate", type=float, default=0.001)
+    parser.add_argument("--sha1", action="store_true", help="lines are SHA-1 hashes (Pwned Passwords format)")
+    args = parser.parse_args()
+    build(args.wordlist, args.output, args.false_positive_rate, args.sha1)
+
+
+if __name__ == "__main__":
+    main()
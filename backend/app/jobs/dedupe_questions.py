@@ -0,0 +1,37 @@
+"""Remove near-duplicate questions from the question bank.
+
+    python -m app.jobs.dedupe_questions
+
+Signs and indexes questions banked before near-duplicate detection existed,
+dropping paraphrased copies, then banks any quiz questions not yet scanned.
+Both phases commit as they go and resume when rerun.
+"""
+import asyncio
+import logging
+from app.core.database import AsyncSessionLocal, engine
+from app.jobs.backfill_question_bank import backfill
+from app.services.near_duplicate_service import NearDuplicateService
+
+logger = logging.getLogger(__name__)
+
+
+async def run() -> dict:
+    async with AsyncSessionLocal() as session:
+        stats = await NearDuplicateService(session).dedupe_bank()
+        stats.update(await backfill(session))
+    await engine.dispose()
+    return stats
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    stats = asyncio.run(run())
+    logger.info(
+        "Indexed %d banked questions, removed %d near-duplicates; "
+        "scanned %d more quizzes, banked %d new questions",
+        stats["indexed"], stats["removed"], stats["quizzes"], stats["questions"]
+    )
+
+
+if __name__ == "__main__":
+    main()
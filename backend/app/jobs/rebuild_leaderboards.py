@@ -0,0 +1,31 @@
+"""Rebuild subject leaderboards from quiz attempts.
+
+Nightly reconciliation for the incrementally maintained boards:
+
+    python -m app.jobs.rebuild_leaderboards
+"""
+import asyncio
+import logging
+from app.core.database import AsyncSessionLocal, engine
+from app.core.redis import close_redis
+from app.services.leaderboard_service import LeaderboardService
+
+logger = logging.getLogger(__name__)
+
+
+async def run() -> dict:
+    async with AsyncSessionLocal() as session:
+        rebuilt = await LeaderboardService(session).rebuild()
+    await close_redis()
+    await engine.dispose()
+    return rebuilt
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    rebuilt = asyncio.run(run())
+    logger.info("Rebuilt %d leaderboards (%d entries)", len(rebuilt), sum(rebuilt.values()))
+
+
+if __name__ == "__main__":
+    main()
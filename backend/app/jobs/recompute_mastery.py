@@ -0,0 +1,40 @@
+"""Recompute Progress.mastery_level from quiz attempts.
+
+Run incrementally (users with new attempts since the last run, plus, on the
+first run each day, everyone else whose mastery is still decaying):
+
+    python -m app.jobs.recompute_mastery
+
+or rebuild every user with ``--full``.
+"""
+import argparse
+import asyncio
+import logging
+from app.core.database import AsyncSessionLocal, engine
+from app.services.mastery_service import MasteryService
+
+logger = logging.getLogger(__name__)
+
+
+async def run(full: bool = False) -> dict:
+    async with AsyncSessionLocal() as session:
+        stats = await MasteryService(session).recompute(full=full)
+    await engine.dispose()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="recompute all users")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    stats = asyncio.run(run(full=args.full))
+    logger.info(
+        "Mastery recomputed for %d users and decayed for %d idle users (%d attempts, %d updated, %d created)",
+        stats["users"], stats["decayed"], stats["attempts"], stats["updated"], stats["created"]
+    )
+
+
+if __name__ == "__main__":
+    main()
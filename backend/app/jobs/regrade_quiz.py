@@ -0,0 +1,41 @@
+"""Regrade a quiz's attempts after its answer key was corrected.
+
+    python -m app.jobs.regrade_quiz QUIZ_ID [--restart]
+
+Interrupted runs resume from the last committed chunk when started again.
+"""
+import argparse
+import asyncio
+import logging
+from app.core.database import AsyncSessionLocal, engine
+from app.core.redis import close_redis
+from app.services.regrade_service import RegradeService
+
+logger = logging.getLogger(__name__)
+
+
+async def run(quiz_id: int, restart: bool = False, chunk_size: int = 5000) -> dict:
+    async with AsyncSessionLocal() as session:
+        state = await RegradeService(session, chunk_size=chunk_size).regrade_quiz(quiz_id, restart=restart)
+    await close_redis()
+    await engine.dispose()
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("quiz_id", type=int)
+    parser.add_argument("--restart", action="store_true", help="ignore any saved checkpoint")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    state = asyncio.run(run(args.quiz_id, restart=args.restart, chunk_size=args.chunk_size))
+    logger.info(
+        "Regraded quiz %d: %d attempts checked, %d scores changed, %d users refreshed",
+        args.quiz_id, state["processed"], state["changed"], len(state["users"])
+    )
+
+
+if __name__ == "__main__":
+    main()
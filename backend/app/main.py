@@ -1,3 +1,5 @@
+import asyncio
+import logging
 from fastapi import FastAPI, middleware
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -5,18 +7,58 @@ from contextlib import asynccontextmanager
 import uvicorn
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, AsyncSessionLocal, replicas, check_replicas_periodically
+from app.core.redis import close_redis
+from app.core.security import password_hasher
+from app.core.breached_passwords import load_breached_password_filter
+from app.core.startup import prepare_schema, warm_up
+from app.services.auth_service import shutdown_hash_pool
+from app.services.autosave_service import AutosaveService, flush_drafts_periodically
+from app.services.token_service import revocation_list, sync_revocations_periodically
 from app.api.v1.api import api_router
 
+logger = logging.getLogger(__name__)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    warming = asyncio.create_task(warm_up())  # overlaps the rest of startup
+    await prepare_schema()
+    autosave_flusher = asyncio.create_task(
+        flush_drafts_periodically(settings.AUTOSAVE_FLUSH_INTERVAL_SECONDS)
+    )
+    try:
+        await revocation_list.sync()
+    except Exception as e:
+        # Boot anyway: this worker's own revocations still reach the filter,
+        # and earlier ones arrive with the first successful periodic sync
+        logger.warning(f"Failed to sync revoked tokens: {str(e)}")
+    load_breached_password_filter()
+    revocation_syncer = asyncio.create_task(
+        sync_revocations_periodically(settings.TOKEN_REVOCATION_SYNC_SECONDS)
+    )
+    await replicas.check()
+    replica_checker = asyncio.create_task(
+        check_replicas_periodically(settings.REPLICA_HEALTH_CHECK_SECONDS)
+    )
+    await warming  # the server only accepts requests once startup returns
     yield
     # Shutdown
+    autosave_flusher.cancel()
+    revocation_syncer.cancel()
+    replica_checker.cancel()
+    try:
+        async with AsyncSessionLocal() as session:
+            await AutosaveService(session).flush()
+    except Exception as e:
+        # Still release the pools below; unflushed drafts stay in Redis
+        logger.warning(f"Failed to flush attempt drafts: {str(e)}")
+    password_hasher.shutdown()
+    shutdown_hash_pool()
+    await close_redis()
     await engine.dispose()
+    await replicas.dispose()
 
 
 app = FastAPI(
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, String, Integer, JSON
+from app.models.base import BaseModel
+
+
+class JobCheckpoint(BaseModel):
+    __tablename__ = "job_checkpoints"
+
+    name = Column(String, unique=True, index=True, nullable=False)
+    cursor = Column(Integer, default=0, nullable=False)  # last processed row id
+    state = Column(JSON, default=dict)  # job-specific resume data
@@ -1,24 +1,51 @@
-from sqlalchemy import Boolean, Column, String, Integer, ForeignKey, JSON, Float, Date
+from sqlalchemy import Boolean, Column, String, Integer, ForeignKey, JSON, Float, Date, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
 
 class Progress(BaseModel):
     __tablename__ = "progress"
-    
+    __table_args__ = (
+        Index("ix_progress_user_id_next_review_at", "user_id", "next_review_at"),
+    )
+
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     subject = Column(String, nullable=False)
     topic = Column(String, nullable=False)
     mastery_level = Column(Float, default=0.0)  # 0.0 to 1.0
     study_time = Column(Integer, default=0)  # in minutes
-    quiz_scores = Column(JSON, default=list)  # List of recent scores
+    quiz_scores = Column(JSON, default=list)  # Ring buffer of recent scores
     strengths = Column(JSON, default=list)  # List of strong topics
     weaknesses = Column(JSON, default=list)  # List of weak topics
     last_studied = Column(Date, nullable=True)
-    
+
+    # Running score aggregates over every attempt
+    score_count = Column(Integer, default=0, nullable=False)
+    score_sum = Column(Float, default=0.0, nullable=False)
+    score_sumsq = Column(Float, default=0.0, nullable=False)
+
+    # Spaced repetition (SM-2)
+    ease_factor = Column(Float, default=2.5, nullable=False)
+    interval_days = Column(Integer, default=0, nullable=False)
+    repetitions = Column(Integer, default=0, nullable=False)
+    next_review_at = Column(DateTime, nullable=True)
+
     # Relationships
     user = relationship("User", back_populates="progress_records")
 
+    @property
+    def score_mean(self) -> float:
+        if not self.score_count:
+            return 0.0
+        return self.score_sum / self.score_count
+
+    @property
+    def score_variance(self) -> float:
+        if not self.score_count:
+            return 0.0
+        mean = self.score_sum / self.score_count
+        return max(self.score_sumsq / self.score_count - mean * mean, 0.0)
+
 
 class ChatSession(BaseModel):
     __tablename__ = "chat_sessions"
@@ -1,16 +1,54 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, JSON, Float, Boolean
-from sqlalchemy.orm import relationship
+import random
+from sqlalchemy import Column, String, Integer, BigInteger, LargeBinary, ForeignKey, JSON, Float, Boolean, Index, UniqueConstraint
+from sqlalchemy.orm import relationship, validates
+from app.core.database import Base
 from app.models.base import BaseModel
 
 
+def build_answer_key(questions) -> list:
+    """Compact list of correct option indexes, one per question"""
+    return [int(q.get("correct_answer") or 0) for q in questions or []]
+
+
+class QuizContent(BaseModel):
+    """Shared question set for AI-generated quizzes.
+
+    Rows are addressed by a hash of their normalized questions, so identical
+    quizzes are stored once however many users reference them. Content is
+    never edited in place; a changed question set is a new row.
+    """
+    __tablename__ = "quiz_contents"
+    __table_args__ = (
+        Index("ix_quiz_contents_lookup", "subject_key", "topic_key", "difficulty", "question_count"),
+    )
+    
+    content_hash = Column(String(64), unique=True, nullable=False)  # sha256 of normalized questions
+    title = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+    subject_key = Column(String, nullable=False)  # normalized subject, for library lookups
+    topic_key = Column(String, nullable=False)  # normalized topic
+    difficulty = Column(String, nullable=False)
+    questions = Column(JSON, nullable=False)
+    answer_key = Column(JSON, nullable=False)
+    question_count = Column(Integer, nullable=False)
+    reference_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
 class Quiz(BaseModel):
     __tablename__ = "quizzes"
+    __table_args__ = (
+        Index("ix_quizzes_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     subject = Column(String, nullable=False)
+    topic = Column(String, nullable=True)
     difficulty = Column(String, nullable=False)  # easy, medium, hard
-    questions = Column(JSON, nullable=False)  # List of question objects
+    own_questions = Column("questions", JSON, nullable=True)  # List of question objects; None for library quizzes
+    content_id = Column(Integer, ForeignKey("quiz_contents.id"), nullable=True, index=True)
+    answer_key = Column(JSON, nullable=True)  # Correct option per question, kept in sync with questions
+    question_count = Column(Integer, nullable=False, default=0, server_default="0")  # len(questions), for listings
     time_limit = Column(Integer, nullable=True)  # in minutes
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     is_ai_generated = Column(Boolean, default=False)
@@ -18,17 +56,80 @@ class Quiz(BaseModel):
     # Relationships
     user = relationship("User", back_populates="quizzes")
     attempts = relationship("QuizAttempt", back_populates="quiz")
+    content = relationship("QuizContent", lazy="raise")  # load explicitly where questions are needed
+    
+    @property
+    def questions(self):
+        """The quiz's own questions, or those of the library content it references"""
+        if self.own_questions is not None:
+            return self.own_questions
+        return self.content.questions if self.content is not None else None
+    
+    @questions.setter
+    def questions(self, questions):
+        self.own_questions = questions
+    
+    @validates("own_questions")
+    def _sync_answer_key(self, key, questions):
+        self.answer_key = build_answer_key(questions)
+        self.question_count = len(questions or [])
+        return questions
+
+
+class Question(BaseModel):
+    """A single question in the shared bank, sampled to assemble quizzes"""
+    __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_subject_topic_difficulty_sample", "subject_key", "topic_key", "difficulty", "sample_key"),
+    )
+    
+    content_hash = Column(String(64), unique=True, nullable=False)  # sha256 of the normalized question
+    subject_key = Column(String, nullable=False)  # normalized subject
+    topic_key = Column(String, nullable=False)  # normalized topic
+    difficulty = Column(String, nullable=False)
+    question = Column(String, nullable=False)
+    options = Column(JSON, nullable=False)
+    correct_answer = Column(Integer, nullable=False)
+    explanation = Column(String, nullable=True)
+    source_quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="SET NULL"), nullable=True)
+    minhash = Column(LargeBinary, nullable=True)  # MinHash signature for near-duplicate lookups
+    sample_key = Column(Float, nullable=False, default=random.random)  # uniform in [0, 1), for random sampling
+
+
+class QuestionBucket(Base):
+    """LSH band bucket of a question's MinHash signature.
+
+    Questions sharing any bucket are near-duplicate candidates. The
+    (bucket, question_id) primary key doubles as the lookup index.
+    """
+    __tablename__ = "question_buckets"
+    
+    bucket = Column(BigInteger, primary_key=True)  # hash of one signature band, band-salted
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
 
 
 class QuizAttempt(BaseModel):
     __tablename__ = "quiz_attempts"
     
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False, index=True)
     answers = Column(JSON, nullable=False)  # User's answers
     score = Column(Float, nullable=False)
     time_taken = Column(Integer, nullable=False)  # in seconds
     completed = Column(Boolean, default=True)
     
     # Relationships
-    quiz = relationship("Quiz", back_populates="attempts")
\ No newline at end of file
+    quiz = relationship("Quiz", back_populates="attempts")
+
+
+class AttemptDraft(BaseModel):
+    """Autosaved answers of an attempt that hasn't been submitted yet"""
+    __tablename__ = "attempt_drafts"
+    __table_args__ = (
+        UniqueConstraint("user_id", "quiz_id", name="uq_attempt_drafts_user_id_quiz_id"),
+    )
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
+    answers = Column(JSON, nullable=False)  # answer per question, -1 = unanswered
+    time_taken = Column(Integer, nullable=False, default=0)  # in seconds
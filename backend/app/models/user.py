@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text
+from sqlalchemy import Column, String, Boolean, Text, Integer, Index, func
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -13,11 +13,17 @@ class User(BaseModel):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     is_premium = Column(Boolean, default=False, nullable=False)
+    is_admin = Column(Boolean, default=False, nullable=False)
     profile_picture = Column(String, nullable=True)
     bio = Column(Text, nullable=True)
+    token_generation = Column(Integer, nullable=False, default=0, server_default="0")  # bumped to revoke issued tokens
     
     # Relationships
     quizzes = relationship("Quiz", back_populates="user")
     progress_records = relationship("Progress", back_populates="user")
     chat_sessions = relationship("ChatSession", back_populates="user")
 
+
+# Logins and duplicate checks compare case-insensitively through these
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
+Index("ix_users_username_lower", func.lower(User.username), unique=True)
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    username: Optional[str] = None
+    score: float
+
+
+class Leaderboard(BaseModel):
+    subject: str
+    window: str
+    entries: List[LeaderboardEntry]
+    me: Optional[LeaderboardEntry] = None
@@ -6,7 +6,6 @@ from datetime import date, datetime
 class ProgressBase(BaseModel):
     subject: str
     topic: str
-    mastery_level: float = 0.0
     study_time: int = 0
     last_studied: Optional[date] = None
 
@@ -16,9 +15,7 @@ class ProgressCreate(ProgressBase):
 
 
 class ProgressUpdate(BaseModel):
-    mastery_level: Optional[float] = None
     study_time: Optional[int] = None
-    quiz_scores: Optional[List[float]] = None
     strengths: Optional[List[str]] = None
     weaknesses: Optional[List[str]] = None
     last_studied: Optional[date] = None
@@ -27,9 +24,16 @@ class ProgressUpdate(BaseModel):
 class Progress(ProgressBase):
     id: int
     user_id: int
+    mastery_level: float = 0.0  # derived from quiz attempts by the mastery engine
     quiz_scores: List[float]
     strengths: List[str]
     weaknesses: List[str]
+    score_count: int = 0
+    score_mean: float = 0.0
+    score_variance: float = 0.0
+    ease_factor: float = 2.5
+    interval_days: int = 0
+    next_review_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     
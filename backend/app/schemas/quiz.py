@@ -14,6 +14,7 @@ class QuizBase(BaseModel):
     title: str
     description: Optional[str] = None
     subject: str
+    topic: Optional[str] = None
     difficulty: str
     time_limit: Optional[int] = None
 
@@ -28,6 +29,8 @@ class QuizGenerate(BaseModel):
     difficulty: str = "medium"
     num_questions: int = 10
     question_types: List[str] = ["multiple_choice"]
+    use_library: bool = True  # reuse a matching quiz from the shared library
+    assemble: bool = False  # sample from the question bank; AI only when it is too thin
 
 
 class Quiz(QuizBase):
@@ -41,14 +44,81 @@ class Quiz(QuizBase):
         from_attributes = True
 
 
+class QuizSummary(QuizBase):
+    id: int
+    question_count: int
+    user_id: int
+    is_ai_generated: bool
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class QuizPage(BaseModel):
+    items: List[QuizSummary]
+    next_cursor: Optional[str] = None
+
+
+class QuizImportError(BaseModel):
+    line: int
+    error: str
+
+
+class QuizImportReport(BaseModel):
+    imported: int
+    failed: int
+    errors: List[QuizImportError]
+
+
+class QuestionAnalytics(BaseModel):
+    index: int
+    question: str
+    correct_answer: int
+    correct_rate: float
+    option_counts: List[int]
+    unanswered: int
+    discrimination: float
+
+
+class QuizAnalytics(BaseModel):
+    quiz_id: int
+    attempt_count: int
+    average_score: float
+    time_taken: Dict[str, float]
+    questions: List[QuestionAnalytics]
+
+
 class QuizAttemptCreate(BaseModel):
+    quiz_id: int
+    answers: Optional[List[int]] = None  # defaults to the autosaved draft
+    time_taken: Optional[int] = None
+
+
+class AttemptDraftUpdate(BaseModel):
+    answers: Dict[int, Optional[int]] = {}  # question index -> option, None clears
+    time_taken: Optional[int] = None
+
+
+class AttemptDraft(BaseModel):
     quiz_id: int
     answers: List[int]
     time_taken: int
 
 
+class QuizBatchAttempt(BaseModel):
+    user_id: int
+    answers: List[int]
+    time_taken: int
+
+
+class QuizAttemptBatchCreate(BaseModel):
+    attempts: List[QuizBatchAttempt]
+
+
 class QuizAttempt(BaseModel):
     id: int
+    user_id: int
     quiz_id: int
     answers: List[int]
     score: float
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -36,8 +36,26 @@ class UserInDB(UserBase):
 
 class User(UserBase):
     id: int
+    is_admin: bool = False
     created_at: datetime
     updated_at: datetime
     
     class Config:
         from_attributes = True
+
+
+class UserBulkCreate(BaseModel):
+    users: List[UserCreate]
+
+
+class UserBulkResult(BaseModel):
+    row: int
+    username: str
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class UserBulkReport(BaseModel):
+    created: int
+    failed: int
+    results: List[UserBulkResult]
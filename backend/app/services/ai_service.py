@@ -1,13 +1,34 @@
-import openai
+import asyncio
 from typing import Dict, List, Any
 from app.core.config import settings
 
-openai.api_key = settings.OPENAI_API_KEY
+_client = None
+
+
+def get_openai_client():
+    """Client shared by every request, so its HTTP connections are reused.
+
+    The SDK takes about half a second to import, so it is loaded on first
+    use (or by warm_openai_client at startup) rather than with this module.
+    """
+    global _client
+    if _client is None:
+        import openai
+        
+        _client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+    return _client
+
+
+async def warm_openai_client(timeout: float) -> None:
+    """Load the SDK and open a connection to the API before taking traffic"""
+    client = await asyncio.to_thread(get_openai_client)
+    if settings.OPENAI_API_KEY:
+        await asyncio.to_thread(client.with_options(timeout=timeout, max_retries=0).models.list)
 
 
 class AIService:
     def __init__(self):
-        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = get_openai_client()
     
     async def generate_quiz(
         self,
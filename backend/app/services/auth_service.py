@@ -1,10 +1,83 @@
-from typing import Optional
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, or_, func
+from sqlalchemy.exc import IntegrityError
 from app.models.user import User
-from app.core.security import verify_password, get_password_hash
+from app.core.config import settings
+from app.core.security import password_hasher, hash_passwords
+from app.core.principal_cache import principal_cache
+from app.core.breached_passwords import is_breached_password, BREACHED_PASSWORD_ERROR
 from app.schemas.user import UserCreate
 
+logger = logging.getLogger(__name__)
+
+
+def login_clause(identifier: str):
+    """Match a login name by its shape, so the lookup uses one unique index.
+
+    Usernames cannot contain "@", so anything with one is an email.
+    """
+    if "@" in identifier:
+        return func.lower(User.email) == identifier.strip().lower()
+    return func.lower(User.username) == identifier.strip().lower()
+
+
+def username_error(username: str) -> Optional[str]:
+    if "@" in username:
+        return "Username cannot contain '@'"
+    return None
+
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_hash_pool() -> ProcessPoolExecutor:
+    """Worker processes for bulk hashing, started on first use and then reused.
+
+    Spawned rather than forked: forking a process that runs an event loop
+    and thread pools is unsafe. Each spawned child imports the app, so the
+    processes are kept for the life of the server.
+    """
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(
+            max(1, settings.BULK_HASH_PROCESSES), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the bulk hashing processes without blocking the event loop on them"""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+
+async def hash_in_processes(passwords: List[str]) -> List[str]:
+    """Hash passwords in parallel on the bulk hashing processes, preserving order"""
+    global _hash_pool
+    if not passwords:
+        return []
+    processes = max(1, min(settings.BULK_HASH_PROCESSES, len(passwords)))
+    chunk_size = -(-len(passwords) // processes)
+    chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+    loop = asyncio.get_running_loop()
+    pool = get_hash_pool()
+    try:
+        hashed = await asyncio.gather(*(loop.run_in_executor(pool, hash_passwords, chunk) for chunk in chunks))
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next request
+        if _hash_pool is pool:
+            _hash_pool = None
+        raise
+    return [password for chunk in hashed for password in chunk]
+
 
 class AuthService:
     def __init__(self, db: AsyncSession):
@@ -12,14 +85,9 @@ class AuthService:
     
     async def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Authenticate user with username/email and password"""
-        result = await self.db.execute(
-            select(User).where(
-                (User.username == username) | (User.email == username)
-            )
-        )
-        user = result.scalar_one_or_none()
+        user = await self.get_user_by_login(username)
         
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await password_hasher.verify(password, user.hashed_password):
             return None
         
         if not user.is_active:
@@ -29,19 +97,18 @@ class AuthService:
     
     async def create_user(self, user_data: UserCreate) -> User:
         """Create new user"""
-        # Check if user already exists
-        result = await self.db.execute(
-            select(User).where(
-                (User.email == user_data.email) | (User.username == user_data.username)
-            )
-        )
-        existing_user = result.scalar_one_or_none()
+        error = username_error(user_data.username)
+        if error:
+            raise ValueError(error)
+        if is_breached_password(user_data.password):
+            raise ValueError(BREACHED_PASSWORD_ERROR)
         
-        if existing_user:
+        # Check if user already exists
+        if await self.user_exists(user_data.email, user_data.username):
             raise ValueError("User with this email or username already exists")
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
         db_user = User(
             email=user_data.email,
             username=user_data.username,
@@ -59,30 +126,114 @@ class AuthService:
         
         return db_user
     
+    async def create_users(self, users: List[UserCreate]) -> Dict[str, Any]:
+        """Provision a roster of users in one pass.
+        
+        Duplicates (in the roster or already registered) are found with one
+        query, new passwords are hashed across processes and the users are
+        inserted with multi-row inserts. Returns a result per roster row.
+        """
+        results = [{"row": row, "username": user.username} for row, user in enumerate(users)]
+        
+        emails = {user.email.lower() for user in users}
+        usernames = {user.username.lower() for user in users}
+        result = await self.db.execute(
+            select(func.lower(User.email), func.lower(User.username)).where(
+                or_(func.lower(User.email).in_(emails), func.lower(User.username).in_(usernames))
+            )
+        )
+        taken_emails, taken_usernames = set(), set()
+        for email, username in result:
+            taken_emails.add(email)
+            taken_usernames.add(username)
+        
+        pending = []
+        for row, user in enumerate(users):
+            email, username = user.email.lower(), user.username.lower()
+            error = username_error(user.username)
+            if error is None and is_breached_password(user.password):
+                error = BREACHED_PASSWORD_ERROR
+            if error:
+                results[row]["error"] = error
+                continue
+            if email in taken_emails or username in taken_usernames:
+                results[row]["error"] = "User with this email or username already exists"
+                continue
+            taken_emails.add(email)
+            taken_usernames.add(username)
+            pending.append(row)
+        
+        hashed = await hash_in_processes([users[row].password for row in pending])
+        rows = [
+            {
+                **users[row].model_dump(exclude={"password"}),
+                "hashed_password": hashed_password,
+            }
+            for row, hashed_password in zip(pending, hashed)
+        ]
+        
+        if rows:
+            try:
+                inserted = await self.db.execute(
+                    insert(User).returning(User.id, sort_by_parameter_order=True),
+                    rows
+                )
+                for row, user_id in zip(pending, inserted.scalars().all()):
+                    results[row]["id"] = user_id
+                await self.db.commit()
+            except IntegrityError as e:
+                # Someone registered one of these names since the duplicate check
+                await self.db.rollback()
+                logger.warning(f"Bulk user provisioning failed: {str(e)}")
+                for row in pending:
+                    results[row].pop("id", None)
+                    results[row]["error"] = "Conflicts with a user registered meanwhile; retry the roster"
+        
+        created = sum(1 for item in results if "id" in item)
+        return {"created": created, "failed": len(results) - created, "results": results}
+    
     async def get_user_by_username(self, username: str) -> Optional[User]:
-        """Get user by username"""
+        """Get user by username (case-insensitive)"""
         result = await self.db.execute(
-            select(User).where(User.username == username)
+            select(User).where(func.lower(User.username) == username.lower())
         )
         return result.scalar_one_or_none()
     
     async def get_user_by_email(self, email: str) -> Optional[User]:
-        """Get user by email"""
+        """Get user by email (case-insensitive)"""
         result = await self.db.execute(
-            select(User).where(User.email == email)
+            select(User).where(func.lower(User.email) == email.lower())
         )
         return result.scalar_one_or_none()
     
+    async def get_user_by_login(self, identifier: str) -> Optional[User]:
+        """Get user by username or email, whichever the identifier looks like"""
+        result = await self.db.execute(select(User).where(login_clause(identifier)))
+        return result.scalar_one_or_none()
+    
+    async def user_exists(self, email: str, username: str) -> bool:
+        """Whether the email or username is taken, ignoring case"""
+        result = await self.db.execute(
+            select(User.id).where(
+                or_(func.lower(User.email) == email.lower(), func.lower(User.username) == username.lower())
+            ).limit(1)
+        )
+        return result.first() is not None
+    
     async def update_user_password(self, user: User, new_password: str) -> User:
         """Update user password"""
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await password_hasher.hash(new_password)
+        user.token_generation += 1
         await self.db.commit()
+        await principal_cache.invalidate(user.username)
         await self.db.refresh(user)
         return user
     
     async def deactivate_user(self, user: User) -> User:
         """Deactivate user account"""
         user.is_active = False
+        user.token_generation += 1
         await self.db.commit()
+        await principal_cache.invalidate(user.username)
         await self.db.refresh(user)
         return user
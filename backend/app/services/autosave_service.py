@@ -0,0 +1,240 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, update, insert, tuple_
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import get_redis
+from app.models.quiz import Quiz, AttemptDraft
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY = "attempt_drafts:dirty"  # drafts changed since their last flush
+UNANSWERED = -1
+
+# (answers by question index, time taken) as held by a draft store
+DraftState = Tuple[Dict[int, int], Optional[int]]
+
+
+def draft_key(user_id: int, quiz_id: int) -> str:
+    return f"attempt_draft:{user_id}:{quiz_id}"
+
+
+def merge_answers(answers: List[int], delta: Dict[int, int]) -> List[int]:
+    """Apply answer changes by index, padding skipped questions as unanswered"""
+    merged = list(answers)
+    if delta:
+        merged.extend([UNANSWERED] * (max(delta) + 1 - len(merged)))
+    for index, answer in delta.items():
+        merged[index] = answer
+    return merged
+
+
+class MemoryDraftStore:
+    """In-process draft store, used when Redis is disabled"""
+
+    def __init__(self):
+        self.drafts: Dict[Tuple[int, int], DraftState] = {}
+        self.dirty: Dict[Tuple[int, int], None] = {}  # insertion-ordered set
+
+    async def save(self, user_id: int, quiz_id: int, answers: Dict[int, int], time_taken: Optional[int]) -> None:
+        key = (user_id, quiz_id)
+        current, current_time = self.drafts.get(key, ({}, None))
+        self.drafts[key] = ({**current, **answers}, time_taken if time_taken is not None else current_time)
+        self.dirty[key] = None
+
+    async def get_many(self, keys: List[Tuple[int, int]]) -> List[Optional[DraftState]]:
+        return [self.drafts.get(key) for key in keys]
+
+    async def pop_dirty(self, count: int) -> List[Tuple[int, int]]:
+        keys = list(self.dirty)[:count]
+        for key in keys:
+            del self.dirty[key]
+        return keys
+
+    async def delete(self, user_id: int, quiz_id: int) -> None:
+        self.drafts.pop((user_id, quiz_id), None)
+        self.dirty.pop((user_id, quiz_id), None)
+
+
+class RedisDraftStore:
+    """Drafts as Redis hashes (question index -> answer); deltas coalesce in place"""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def save(self, user_id: int, quiz_id: int, answers: Dict[int, int], time_taken: Optional[int]) -> None:
+        key = draft_key(user_id, quiz_id)
+        mapping = {str(index): answer for index, answer in answers.items()}
+        if time_taken is not None:
+            mapping["time_taken"] = time_taken
+        async with self.client.pipeline(transaction=True) as pipe:
+            if mapping:
+                pipe.hset(key, mapping=mapping)
+            pipe.expire(key, settings.AUTOSAVE_TTL_SECONDS)
+            pipe.sadd(DIRTY_KEY, f"{user_id}:{quiz_id}")
+            await pipe.execute()
+
+    async def get_many(self, keys: List[Tuple[int, int]]) -> List[Optional[DraftState]]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for user_id, quiz_id in keys:
+                pipe.hgetall(draft_key(user_id, quiz_id))
+            results = await pipe.execute()
+
+        states = []
+        for fields in results:
+            if not fields:
+                states.append(None)
+                continue
+            time_taken = fields.pop("time_taken", None)
+            states.append((
+                {int(index): int(answer) for index, answer in fields.items()},
+                int(time_taken) if time_taken is not None else None
+            ))
+        return states
+
+    async def pop_dirty(self, count: int) -> List[Tuple[int, int]]:
+        # SPOP hands each draft to exactly one flusher across workers
+        members = await self.client.spop(DIRTY_KEY, count) or []
+        return [tuple(int(part) for part in member.split(":")) for member in members]
+
+    async def delete(self, user_id: int, quiz_id: int) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(draft_key(user_id, quiz_id))
+            pipe.srem(DIRTY_KEY, f"{user_id}:{quiz_id}")
+            await pipe.execute()
+
+
+_memory_store = MemoryDraftStore()
+
+
+def get_draft_store():
+    client = get_redis()
+    if client is None:
+        return _memory_store
+    return RedisDraftStore(client)
+
+
+class AutosaveService:
+    """In-progress quiz attempts: deltas go to the draft store, the database
+    only sees the coalesced state when drafts are flushed or submitted"""
+
+    def __init__(self, db: AsyncSession, store=None):
+        self.db = db
+        self.store = store or get_draft_store()
+
+    async def save_delta(
+        self,
+        user_id: int,
+        quiz_id: int,
+        answers: Dict[int, Optional[int]],
+        time_taken: Optional[int] = None
+    ) -> None:
+        """Record changed answers (None clears one) without touching the database"""
+        answers = {index: UNANSWERED if answer is None else answer for index, answer in answers.items()}
+        await self.store.save(user_id, quiz_id, answers, time_taken)
+
+    async def get_draft(self, user_id: int, quiz_id: int) -> Optional[dict]:
+        """Latest draft: the flushed row with any newer unflushed changes on top"""
+        result = await self.db.execute(
+            select(AttemptDraft).where(
+                AttemptDraft.user_id == user_id,
+                AttemptDraft.quiz_id == quiz_id
+            )
+        )
+        row = result.scalar_one_or_none()
+        [cached] = await self.store.get_many([(user_id, quiz_id)])
+        if row is None and cached is None:
+            return None
+
+        delta, cached_time = cached or ({}, None)
+        return {
+            "quiz_id": quiz_id,
+            "answers": merge_answers(row.answers if row else [], delta),
+            "time_taken": cached_time if cached_time is not None else (row.time_taken if row else 0),
+        }
+
+    async def discard(self, user_id: int, quiz_id: int) -> None:
+        """Delete a submitted attempt's flushed draft (caller commits, then calls forget)"""
+        await self.db.execute(
+            delete(AttemptDraft).where(
+                AttemptDraft.user_id == user_id,
+                AttemptDraft.quiz_id == quiz_id
+            )
+        )
+
+    async def forget(self, user_id: int, quiz_id: int) -> None:
+        """Drop a submitted attempt's unflushed changes once the submit has committed.
+
+        Until then they are kept, so a failed submit doesn't lose the attempt.
+        """
+        await self.store.delete(user_id, quiz_id)
+
+    async def flush(self, batch_size: int = 500) -> int:
+        """Write changed drafts to the database; returns how many were written"""
+        flushed = 0
+        while True:
+            keys = await self.store.pop_dirty(batch_size)
+            if not keys:
+                break
+
+            states = dict(zip(keys, await self.store.get_many(keys)))
+            result = await self.db.execute(
+                select(AttemptDraft.id, AttemptDraft.user_id, AttemptDraft.quiz_id, AttemptDraft.answers)
+                .where(tuple_(AttemptDraft.user_id, AttemptDraft.quiz_id).in_(keys))
+            )
+            existing = {(user_id, quiz_id): (draft_id, answers) for draft_id, user_id, quiz_id, answers in result}
+            result = await self.db.execute(
+                select(Quiz.id).where(Quiz.id.in_({quiz_id for _, quiz_id in keys}))
+            )
+            quiz_ids = set(result.scalars().all())
+
+            updates, inserts, written = [], [], []
+            for key, state in states.items():
+                # Drafts submitted or expired since, or for quizzes that don't exist
+                if state is None or key[1] not in quiz_ids:
+                    continue
+                written.append(key)
+                delta, time_taken = state
+                if key in existing:
+                    draft_id, answers = existing[key]
+                    values = {"id": draft_id, "answers": merge_answers(answers, delta)}
+                    if time_taken is not None:
+                        values["time_taken"] = time_taken
+                    updates.append(values)
+                else:
+                    inserts.append({
+                        "user_id": key[0],
+                        "quiz_id": key[1],
+                        "answers": merge_answers([], delta),
+                        "time_taken": time_taken or 0,
+                    })
+
+            if updates:
+                await self.db.execute(update(AttemptDraft), updates)
+            if inserts:
+                await self.db.execute(insert(AttemptDraft), inserts)
+            await self.db.commit()
+
+            # A draft submitted while this batch was written is gone from the
+            # store by now, and the row written for it is stale
+            gone = [key for key, state in zip(written, await self.store.get_many(written)) if state is None]
+            if gone:
+                await self.db.execute(
+                    delete(AttemptDraft).where(tuple_(AttemptDraft.user_id, AttemptDraft.quiz_id).in_(gone))
+                )
+                await self.db.commit()
+            flushed += len(written) - len(gone)
+        return flushed
+
+
+async def flush_drafts_periodically(interval: float) -> None:
+    """Background task started with the app: flush drafts every `interval` seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as session:
+                await AutosaveService(session).flush()
+        except Exception as e:
+            logger.warning(f"Failed to flush attempt drafts: {str(e)}")
@@ -0,0 +1,194 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.models.quiz import Quiz, QuizAttempt
+from app.models.progress import Progress
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# (column name, SQL expression, type) per dataset. Large JSON payloads such
+# as quiz questions and attempt answers are left out of exports.
+EXPORT_DATASETS = {
+    "quiz_attempts": {
+        "columns": [
+            ("id", QuizAttempt.id, "int"),
+            ("user_id", QuizAttempt.user_id, "int"),
+            ("quiz_id", QuizAttempt.quiz_id, "int"),
+            ("subject", Quiz.subject, "str"),
+            ("score", QuizAttempt.score, "float"),
+            ("time_taken", QuizAttempt.time_taken, "int"),
+            ("completed", QuizAttempt.completed, "bool"),
+            ("created_at", QuizAttempt.created_at, "datetime"),
+        ],
+        "join": (Quiz, QuizAttempt.quiz_id == Quiz.id),
+        "order_by": QuizAttempt.id,
+        "timestamp": QuizAttempt.created_at,
+        "subject": Quiz.subject,
+    },
+    "progress": {
+        "columns": [
+            ("id", Progress.id, "int"),
+            ("user_id", Progress.user_id, "int"),
+            ("subject", Progress.subject, "str"),
+            ("topic", Progress.topic, "str"),
+            ("mastery_level", Progress.mastery_level, "float"),
+            ("study_time", Progress.study_time, "int"),
+            ("score_count", Progress.score_count, "int"),
+            ("score_sum", Progress.score_sum, "float"),
+            ("score_sumsq", Progress.score_sumsq, "float"),
+            ("last_studied", Progress.last_studied, "date"),
+            ("next_review_at", Progress.next_review_at, "datetime"),
+            ("updated_at", Progress.updated_at, "datetime"),
+        ],
+        "join": None,
+        "order_by": Progress.id,
+        "timestamp": Progress.updated_at,
+        "subject": Progress.subject,
+    },
+    "quizzes": {
+        "columns": [
+            ("id", Quiz.id, "int"),
+            ("user_id", Quiz.user_id, "int"),
+            ("title", Quiz.title, "str"),
+            ("subject", Quiz.subject, "str"),
+            ("topic", Quiz.topic, "str"),
+            ("difficulty", Quiz.difficulty, "str"),
+            ("time_limit", Quiz.time_limit, "int"),
+            ("is_ai_generated", Quiz.is_ai_generated, "bool"),
+            ("created_at", Quiz.created_at, "datetime"),
+        ],
+        "join": None,
+        "order_by": Quiz.id,
+        "timestamp": Quiz.created_at,
+        "subject": Quiz.subject,
+    },
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain.
+
+    tell() keeps counting across drains so Parquet footer offsets stay valid.
+    """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class ExportService:
+    def __init__(self, db: AsyncSession, chunk_size: int = 5000):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    def build_query(
+        self,
+        dataset: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        subject: Optional[str] = None
+    ):
+        spec = EXPORT_DATASETS[dataset]
+        query = select(*[column for _, column, _ in spec["columns"]])
+        if spec["join"] is not None:
+            query = query.join(*spec["join"])
+        if start:
+            query = query.where(spec["timestamp"] >= start)
+        if end:
+            query = query.where(spec["timestamp"] < end)
+        if subject:
+            query = query.where(spec["subject"] == subject)
+        return query.order_by(spec["order_by"])
+
+    async def iter_rows(self, dataset: str, **filters) -> AsyncIterator[List[Tuple]]:
+        """Yield rows in chunks through a server-side cursor"""
+        query = self.build_query(dataset, **filters).execution_options(
+            stream_results=True, yield_per=self.chunk_size
+        )
+        result = await self.db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+    async def export(self, dataset: str, file_format: str, **filters) -> AsyncIterator[bytes]:
+        """Stream a dataset as encoded chunks; memory is bounded by chunk_size"""
+        names = [name for name, _, _ in EXPORT_DATASETS[dataset]["columns"]]
+        rows = self.iter_rows(dataset, **filters)
+
+        if file_format == "csv":
+            yield self._encode_csv([names])
+            async for partition in rows:
+                yield self._encode_csv(partition)
+
+        elif file_format == "ndjson":
+            async for partition in rows:
+                yield "".join(
+                    json.dumps(dict(zip(names, row)), default=str) + "\n"
+                    for row in partition
+                ).encode()
+
+        elif file_format == "parquet":
+            async for chunk in self._export_parquet(dataset, rows):
+                yield chunk
+
+        else:
+            raise ValueError(f"Unsupported export format: {file_format}")
+
+    def _encode_csv(self, rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    async def _export_parquet(self, dataset: str, rows) -> AsyncIterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "str": pa.string(),
+            "bool": pa.bool_(),
+            "date": pa.date32(),
+            "datetime": pa.timestamp("us"),
+        }
+        columns = EXPORT_DATASETS[dataset]["columns"]
+        schema = pa.schema([(name, types[kind]) for name, _, kind in columns])
+
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression="snappy")
+        try:
+            async for partition in rows:
+                # One row group per partition
+                values = list(zip(*partition))
+                writer.write_batch(pa.record_batch(
+                    [pa.array(column, type=field.type) for column, field in zip(values, schema)],
+                    schema=schema
+                ))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
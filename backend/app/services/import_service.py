@@ -0,0 +1,173 @@
+import csv
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert
+from app.models.quiz import Quiz, build_answer_key
+from app.schemas.quiz import QuizCreate
+from app.services.question_bank_service import QuestionBankService
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("ndjson", "csv")
+CSV_COLUMNS = ("title", "description", "subject", "topic", "difficulty", "time_limit", "questions")
+MAX_LINE_BYTES = 1024 * 1024  # a longer line is reported and skipped
+MAX_REPORTED_ERRORS = 1000  # errors past this are counted, not listed
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Split a byte stream into (line number, line) pairs.
+
+    Only the current partial line is buffered. Overlong lines are yielded
+    as None and their remaining bytes skipped.
+    """
+    buffer = b""
+    line_number = 0
+    skipping = False
+    async for chunk in chunks:
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            line_number += 1
+            if skipping:
+                skipping = False
+                continue
+            yield line_number, line.rstrip(b"\r")
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield line_number + 1, None
+            skipping = True
+            buffer = b""
+    if buffer and not skipping:
+        yield line_number + 1, buffer.rstrip(b"\r")
+
+
+class ImportService:
+    """Bulk quiz import from NDJSON (one QuizCreate per line) or CSV uploads.
+
+    Records are validated as they arrive and inserted in batches, each batch
+    in its own transaction, so memory stays flat regardless of upload size.
+    """
+
+    def __init__(self, db: AsyncSession, batch_size: int = 500):
+        self.db = db
+        self.batch_size = batch_size
+
+    async def import_quizzes(self, chunks: AsyncIterator[bytes], file_format: str, user_id: int) -> Dict[str, Any]:
+        if file_format not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format: {file_format}")
+
+        report = {"imported": 0, "failed": 0, "errors": []}
+        batch: List[Tuple[int, QuizCreate]] = []
+        async for line_number, record in self._iter_records(chunks, file_format, report):
+            try:
+                batch.append((line_number, QuizCreate.model_validate(record)))
+            except ValidationError as e:
+                self._report(report, line_number, self._describe(e))
+                continue
+            if len(batch) >= self.batch_size:
+                await self._insert_batch(batch, user_id, report)
+                batch = []
+        if batch:
+            await self._insert_batch(batch, user_id, report)
+        return report
+
+    async def _iter_records(self, chunks, file_format: str, report: Dict) -> AsyncIterator[Tuple[int, Any]]:
+        header = None
+        pending: Optional[Tuple[int, str]] = None  # CSV record continued over quoted newlines
+        async for line_number, raw in iter_lines(chunks):
+            if raw is None:
+                self._report(report, line_number, f"Line exceeds {MAX_LINE_BYTES} bytes")
+                pending = None
+                continue
+            try:
+                line = raw.decode("utf-8-sig" if line_number == 1 else "utf-8")
+            except UnicodeDecodeError:
+                self._report(report, line_number, "Line is not valid UTF-8")
+                pending = None
+                continue
+
+            if file_format == "ndjson":
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as e:
+                    self._report(report, line_number, f"Invalid JSON: {e.msg}")
+                continue
+
+            # CSV: a record is complete once its quotes balance
+            start, text = (pending[0], pending[1] + "\n" + line) if pending else (line_number, line)
+            if text.count('"') % 2:
+                pending = (start, text)
+                if len(text) > MAX_LINE_BYTES:
+                    self._report(report, start, f"Record exceeds {MAX_LINE_BYTES} bytes")
+                    pending = None
+                continue
+            pending = None
+            if not text.strip():
+                continue
+            values = next(csv.reader([text]))
+            if header is None:
+                header = [name.strip() for name in values]
+                missing = {"title", "subject", "difficulty", "questions"} - set(header)
+                if missing:
+                    raise ValueError(f"CSV header is missing columns: {', '.join(sorted(missing))}")
+                continue
+            record = {name: value for name, value in zip(header, values) if name in CSV_COLUMNS and value != ""}
+            try:
+                record["questions"] = json.loads(record.get("questions", "[]"))
+            except json.JSONDecodeError as e:
+                self._report(report, start, f"Invalid questions JSON: {e.msg}")
+                continue
+            yield start, record
+
+        if pending:
+            self._report(report, pending[0], "Unterminated quoted field")
+
+    async def _insert_batch(self, batch: List[Tuple[int, QuizCreate]], user_id: int, report: Dict) -> None:
+        rows = []
+        for _, quiz_data in batch:
+            questions = [q.model_dump() for q in quiz_data.questions]
+            rows.append({
+                **quiz_data.model_dump(exclude={"questions"}),
+                "own_questions": questions,
+                "answer_key": build_answer_key(questions),
+                "question_count": len(questions),
+                "user_id": user_id,
+                "is_ai_generated": False,
+            })
+        try:
+            result = await self.db.execute(
+                insert(Quiz).returning(Quiz.id, sort_by_parameter_order=True),
+                rows
+            )
+            quiz_ids = result.scalars().all()
+            await QuestionBankService(self.db).add_question_sets([
+                (row["own_questions"], row["subject"], row["topic"], row["difficulty"], quiz_id)
+                for row, quiz_id in zip(rows, quiz_ids)
+            ])
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.warning(f"Quiz import batch failed: {str(e)}")
+            for line_number, _ in batch:
+                self._report(report, line_number, "Could not be saved")
+            return
+        report["imported"] += len(batch)
+
+    def _report(self, report: Dict, line_number: int, error: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line_number, "error": error})
+
+    def _describe(self, error: ValidationError) -> str:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+            for item in error.errors()
+        )
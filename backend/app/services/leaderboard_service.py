@@ -0,0 +1,193 @@
+import bisect
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from app.core.redis import get_redis
+from app.models.quiz import Quiz, QuizAttempt
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = ("weekly", "all_time")
+WEEKLY_TTL_SECONDS = 14 * 24 * 3600  # keep last week's board readable after rotation
+
+# Add a score to a member's running average and re-rank them atomically.
+# KEYS: board zset, sums hash, counts hash. ARGV: member, score, ttl (0 = none)
+RECORD_SCRIPT = """
+local total = redis.call('HINCRBYFLOAT', KEYS[2], ARGV[1], ARGV[2])
+local count = redis.call('HINCRBY', KEYS[3], ARGV[1], 1)
+redis.call('ZADD', KEYS[1], tonumber(total) / count, ARGV[1])
+local ttl = tonumber(ARGV[3])
+if ttl > 0 then
+    for i = 1, 3 do redis.call('EXPIRE', KEYS[i], ttl) end
+end
+return count
+"""
+
+
+def board_key(subject: str, window: str, now: datetime = None) -> str:
+    """Redis key for a subject board; weekly keys rotate with the ISO week"""
+    subject = subject.strip().lower()
+    if window == "weekly":
+        year, week, _ = (now or datetime.now()).isocalendar()
+        return f"leaderboard:{subject}:weekly:{year}-W{week:02d}"
+    return f"leaderboard:{subject}:all_time"
+
+
+def week_start(now: datetime) -> datetime:
+    start = now - timedelta(days=now.weekday())
+    return start.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class MemoryLeaderboardStore:
+    """In-process stand-in for Redis sorted sets, used when Redis is disabled"""
+
+    def __init__(self):
+        self.boards: Dict[str, Dict[str, Tuple[float, int]]] = {}
+        self.ranked: Dict[str, List[Tuple[float, str]]] = {}
+
+    async def record(self, key: str, member: str, score: float, ttl: int = 0) -> None:
+        board = self.boards.setdefault(key, {})
+        ranked = self.ranked.setdefault(key, [])
+        total, count = board.get(member, (0.0, 0))
+        if count:
+            ranked.remove((-(total / count), member))
+        total, count = total + score, count + 1
+        board[member] = (total, count)
+        bisect.insort(ranked, (-(total / count), member))
+
+    async def top(self, key: str, limit: int) -> List[Tuple[str, float]]:
+        return [(member, -score) for score, member in self.ranked.get(key, [])[:limit]]
+
+    async def rank(self, key: str, member: str) -> Optional[Tuple[int, float]]:
+        board = self.boards.get(key, {})
+        if member not in board:
+            return None
+        total, count = board[member]
+        entry = (-(total / count), member)
+        return bisect.bisect_left(self.ranked[key], entry), total / count
+
+    async def replace(self, key: str, entries: List[Tuple[str, float, int]], ttl: int = 0) -> None:
+        self.boards[key] = {member: (total, count) for member, total, count in entries}
+        self.ranked[key] = sorted((-(total / count), member) for member, total, count in entries)
+
+
+class RedisLeaderboardStore:
+    """Sorted-set leaderboards: O(log n) updates and rank lookups"""
+
+    def __init__(self, client):
+        self.client = client
+        self._record = client.register_script(RECORD_SCRIPT)
+
+    async def record(self, key: str, member: str, score: float, ttl: int = 0) -> None:
+        await self._record(keys=[key, f"{key}:sum", f"{key}:count"], args=[member, score, ttl])
+
+    async def top(self, key: str, limit: int) -> List[Tuple[str, float]]:
+        return await self.client.zrevrange(key, 0, limit - 1, withscores=True)
+
+    async def rank(self, key: str, member: str) -> Optional[Tuple[int, float]]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zrevrank(key, member)
+            pipe.zscore(key, member)
+            rank, score = await pipe.execute()
+        if rank is None:
+            return None
+        return rank, score
+
+    async def replace(self, key: str, entries: List[Tuple[str, float, int]], ttl: int = 0) -> None:
+        """Build the board under temporary keys, then swap it in atomically"""
+        suffixes = ("", ":sum", ":count")
+        tmp = f"{key}:rebuild"
+        async with self.client.pipeline(transaction=True) as pipe:
+            for suffix in suffixes:
+                pipe.delete(tmp + suffix)
+            for start in range(0, len(entries), 1000):
+                chunk = entries[start:start + 1000]
+                pipe.zadd(tmp, {member: total / count for member, total, count in chunk})
+                pipe.hset(f"{tmp}:sum", mapping={member: total for member, total, _ in chunk})
+                pipe.hset(f"{tmp}:count", mapping={member: count for member, _, count in chunk})
+            for suffix in suffixes:
+                if entries:
+                    pipe.rename(tmp + suffix, key + suffix)
+                    if ttl:
+                        pipe.expire(key + suffix, ttl)
+                else:
+                    pipe.delete(key + suffix)
+            await pipe.execute()
+
+
+_memory_store = MemoryLeaderboardStore()
+
+
+def get_leaderboard_store():
+    client = get_redis()
+    if client is None:
+        return _memory_store
+    return RedisLeaderboardStore(client)
+
+
+class LeaderboardService:
+    def __init__(self, db: AsyncSession, store=None):
+        self.db = db
+        self.store = store or get_leaderboard_store()
+
+    async def record_attempt(self, user_id: int, subject: str, score: float, now: datetime = None) -> None:
+        """Fold a quiz score into the subject's weekly and all-time boards"""
+        now = now or datetime.now()
+        member = str(user_id)
+        try:
+            await self.store.record(board_key(subject, "weekly", now), member, score, WEEKLY_TTL_SECONDS)
+            await self.store.record(board_key(subject, "all_time"), member, score)
+        except Exception as e:
+            # The nightly rebuild repairs any missed update
+            logger.warning(f"Failed to update leaderboard for {subject}: {str(e)}")
+
+    async def get_top(self, subject: str, window: str, limit: int = 10) -> List[Dict]:
+        entries = await self.store.top(board_key(subject, window), limit)
+        return [
+            {"rank": index + 1, "user_id": int(member), "score": round(score, 2)}
+            for index, (member, score) in enumerate(entries)
+        ]
+
+    async def get_rank(self, subject: str, window: str, user_id: int) -> Optional[Dict]:
+        result = await self.store.rank(board_key(subject, window), str(user_id))
+        if result is None:
+            return None
+        rank, score = result
+        return {"rank": rank + 1, "user_id": user_id, "score": round(score, 2)}
+
+    async def rebuild(self, now: datetime = None, only_subject: str = None) -> Dict[str, int]:
+        """Rebuild every board (or one subject's) from quiz_attempts"""
+        now = now or datetime.now()
+        rebuilt = {}
+        subject = func.lower(func.trim(Quiz.subject))
+        for window in WINDOWS:
+            query = (
+                select(
+                    subject,
+                    QuizAttempt.user_id,
+                    func.sum(QuizAttempt.score),
+                    func.count(QuizAttempt.id)
+                )
+                .join(Quiz, QuizAttempt.quiz_id == Quiz.id)
+                .group_by(subject, QuizAttempt.user_id)
+            )
+            if window == "weekly":
+                query = query.where(QuizAttempt.created_at >= week_start(now))
+            if only_subject is not None:
+                query = query.where(subject == only_subject.strip().lower())
+
+            boards: Dict[str, List[Tuple[str, float, int]]] = {}
+            result = await self.db.stream(query.execution_options(yield_per=10000))
+            async for subject_name, user_id, total, count in result:
+                boards.setdefault(board_key(subject_name, window, now), []).append(
+                    (str(user_id), float(total), int(count))
+                )
+
+            ttl = WEEKLY_TTL_SECONDS if window == "weekly" else 0
+            for key, entries in boards.items():
+                await self.store.replace(key, entries, ttl)
+                rebuilt[key] = len(entries)
+
+        return rebuilt
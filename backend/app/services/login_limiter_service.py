@@ -0,0 +1,134 @@
+import ipaddress
+import math
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.redis import get_redis
+
+# Sliding-window counter: the previous window's count, weighted by how much
+# of it still overlaps the sliding window, plus the current window's count.
+# Checks every limit before counting, so a rejected attempt is not counted.
+SLIDING_WINDOW_SCRIPT = """
+local weight = tonumber(ARGV[1])
+for i = 1, #KEYS, 2 do
+    local current = tonumber(redis.call('GET', KEYS[i]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[i + 1]) or '0')
+    if previous * weight + current >= tonumber(ARGV[2 + (i - 1) / 2]) then
+        return 0
+    end
+end
+for i = 1, #KEYS, 2 do
+    redis.call('INCR', KEYS[i])
+    redis.call('EXPIRE', KEYS[i], ARGV[#ARGV])
+end
+return 1
+"""
+
+# (counter name, limit) pairs checked together
+Limits = List[Tuple[str, int]]
+
+
+def window_key(name: str, window: int) -> str:
+    return f"login_attempts:{name}:{window}"
+
+
+@lru_cache(maxsize=4)
+def _trusted_networks(proxies: Tuple[str, ...]) -> list:
+    return [ipaddress.ip_network(proxy, strict=False) for proxy in proxies]
+
+
+def client_ip(peer: Optional[str], real_ip: Optional[str]) -> Optional[str]:
+    """The address per-IP limits apply to.
+
+    X-Real-IP (`real_ip`) is only believed when the connection comes from
+    one of TRUSTED_PROXIES; from anyone else it is client-controlled and
+    could be rotated to dodge the limit, so the peer address is used.
+    """
+    if peer is None or not real_ip:
+        return peer
+    try:
+        address = ipaddress.ip_address(peer)
+    except ValueError:
+        return peer
+    if any(address in network for network in _trusted_networks(tuple(settings.TRUSTED_PROXIES))):
+        return real_ip
+    return peer
+
+
+class MemoryWindowStore:
+    """In-process counters, used when Redis is disabled"""
+
+    def __init__(self):
+        self.counts: Dict[Tuple[str, int], int] = {}
+
+    async def hit(self, limits: Limits, window: int, weight: float, ttl: int) -> bool:
+        self.counts = {key: count for key, count in self.counts.items() if key[1] >= window - 1}
+        for name, limit in limits:
+            if self.counts.get((name, window - 1), 0) * weight + self.counts.get((name, window), 0) >= limit:
+                return False
+        for name, _ in limits:
+            self.counts[(name, window)] = self.counts.get((name, window), 0) + 1
+        return True
+
+    async def reset(self, name: str, window: int) -> None:
+        self.counts.pop((name, window), None)
+        self.counts.pop((name, window - 1), None)
+
+
+class RedisWindowStore:
+    """Counters shared by all workers; one Lua call checks and counts atomically"""
+
+    def __init__(self, client):
+        self.client = client
+        self.script = client.register_script(SLIDING_WINDOW_SCRIPT)  # runs via EVALSHA
+
+    async def hit(self, limits: Limits, window: int, weight: float, ttl: int) -> bool:
+        keys = []
+        for name, _ in limits:
+            keys += [window_key(name, window), window_key(name, window - 1)]
+        args = [weight] + [limit for _, limit in limits] + [ttl]
+        return bool(await self.script(keys=keys, args=args))
+
+    async def reset(self, name: str, window: int) -> None:
+        await self.client.delete(window_key(name, window), window_key(name, window - 1))
+
+
+_memory_store = MemoryWindowStore()
+
+
+def get_window_store():
+    client = get_redis()
+    if client is None:
+        return _memory_store
+    return RedisWindowStore(client)
+
+
+class LoginLimiterService:
+    """Throttles login attempts per account and per client IP.
+
+    Runs before the password is checked, so throttled attempts cost a
+    counter lookup instead of a bcrypt hash.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or get_window_store()
+        self.window_seconds = settings.LOGIN_WINDOW_SECONDS
+
+    async def attempt(self, username: str, ip: Optional[str]) -> Optional[int]:
+        """Count a login attempt; returns seconds to wait if it is over a limit"""
+        now = time.time()
+        window, elapsed = divmod(now, self.window_seconds)
+        limits = [(f"account:{username.strip().lower()}", settings.LOGIN_MAX_ATTEMPTS_PER_ACCOUNT)]
+        if ip:
+            limits.append((f"ip:{ip}", settings.LOGIN_MAX_ATTEMPTS_PER_IP))
+
+        weight = 1 - elapsed / self.window_seconds
+        if await self.store.hit(limits, int(window), weight, 2 * self.window_seconds):
+            return None
+        return max(1, math.ceil(self.window_seconds - elapsed))
+
+    async def succeeded(self, username: str) -> None:
+        """Clear the account's count after a successful login"""
+        window = int(time.time() // self.window_seconds)
+        await self.store.reset(f"account:{username.strip().lower()}", window)
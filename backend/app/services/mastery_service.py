@@ -0,0 +1,208 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, update, insert
+from app.core.config import settings
+from app.models.quiz import Quiz, QuizAttempt
+from app.models.progress import Progress
+from app.models.job import JobCheckpoint
+
+CHECKPOINT_NAME = "mastery"
+
+
+def compute_mastery(
+    group_index: np.ndarray,
+    scores: np.ndarray,
+    ages_days: np.ndarray,
+    half_life_days: float,
+    num_groups: int = None
+) -> np.ndarray:
+    """Decay-weighted mastery per group, in the range 0.0 to 1.0.
+
+    Each attempt is weighted by 2^(-age / half_life). The weighted score sum
+    is divided by max(total weight, 1), so recent evidence gives a weighted
+    mean while a topic that has not been practised decays towards zero.
+    """
+    if num_groups is None:
+        num_groups = int(group_index.max()) + 1 if group_index.size else 0
+
+    weights = np.exp2(-np.maximum(ages_days, 0.0) / half_life_days)
+    weighted_scores = np.bincount(group_index, weights=weights * scores, minlength=num_groups)
+    total_weight = np.bincount(group_index, weights=weights, minlength=num_groups)
+
+    return np.clip(weighted_scores / np.maximum(total_weight, 1.0) / 100.0, 0.0, 1.0)
+
+
+def group_attempts(
+    user_ids: np.ndarray,
+    subjects: np.ndarray,
+    topics: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Factorize (user, subject, topic) triples into dense group ids.
+
+    Returns the group index for every attempt and the position of the
+    first attempt of each group, which can be used to read the keys back.
+    """
+    _, subject_codes = np.unique(subjects, return_inverse=True)
+    _, topic_codes = np.unique(topics, return_inverse=True)
+    _, user_codes = np.unique(user_ids, return_inverse=True)
+
+    num_subjects = int(subject_codes.max()) + 1
+    num_topics = int(topic_codes.max()) + 1
+    keys = (
+        user_codes.astype(np.int64) * num_subjects + subject_codes
+    ) * num_topics + topic_codes
+
+    _, first_index, group_index = np.unique(keys, return_index=True, return_inverse=True)
+    return group_index, first_index
+
+
+class MasteryService:
+    def __init__(self, db: AsyncSession, half_life_days: float = None, batch_size: int = None):
+        self.db = db
+        self.half_life_days = half_life_days or settings.MASTERY_HALF_LIFE_DAYS
+        self.batch_size = batch_size or settings.MASTERY_BATCH_SIZE
+
+    async def recompute(self, full: bool = False, now: datetime = None) -> Dict[str, int]:
+        """Recompute mastery for every user with attempts since the last run.
+
+        Once a day, users without new attempts are recomputed too: their
+        evidence keeps ageing, so mastery must decay for users who stopped
+        practising even though nothing new was recorded for them.
+        """
+        now = now or datetime.now()
+        checkpoint = await self._get_checkpoint()
+        last_id = 0 if full else checkpoint.cursor
+
+        max_id = (await self.db.execute(select(func.max(QuizAttempt.id)))).scalar() or 0
+        user_ids = []
+        if max_id > last_id:
+            result = await self.db.execute(
+                select(QuizAttempt.user_id)
+                .where(QuizAttempt.id > last_id, QuizAttempt.id <= max_id)
+                .distinct()
+            )
+            user_ids = sorted(result.scalars().all())
+
+        totals = {"users": len(user_ids), "attempts": 0, "updated": 0, "created": 0, "decayed": 0}
+        await self._recompute_in_batches(user_ids, now, max_id, totals)
+        checkpoint.cursor = max(checkpoint.cursor, max_id)
+
+        today = now.date().isoformat()
+        if (checkpoint.state or {}).get("decayed_on") != today:
+            result = await self.db.execute(
+                select(Progress.user_id)
+                .where(Progress.mastery_level > settings.MASTERY_DECAY_MIN_LEVEL)
+                .distinct()
+            )
+            idle_ids = sorted(set(result.scalars().all()) - set(user_ids))
+            await self._recompute_in_batches(idle_ids, now, max_id, totals)
+            totals["decayed"] = len(idle_ids)
+            checkpoint.state = {**(checkpoint.state or {}), "decayed_on": today}
+
+        await self.db.commit()
+        return totals
+
+    async def _recompute_in_batches(self, user_ids: List[int], now: datetime, max_id: int, totals: Dict) -> None:
+        for start in range(0, len(user_ids), self.batch_size):
+            stats = await self.recompute_users(user_ids[start:start + self.batch_size], now, max_id)
+            for key in ("attempts", "updated", "created"):
+                totals[key] += stats[key]
+
+    async def recompute_users(
+        self,
+        user_ids: List[int],
+        now: datetime = None,
+        max_attempt_id: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Recompute and bulk-write mastery for a batch of users"""
+        now = now or datetime.now()
+        arrays = await self._load_attempts(user_ids, max_attempt_id)
+        if arrays is None:
+            return {"attempts": 0, "updated": 0, "created": 0}
+
+        attempt_users, subjects, topics, scores, timestamps = arrays
+        group_index, first_index = group_attempts(attempt_users, subjects, topics)
+        num_groups = first_index.size
+
+        ages_days = (np.datetime64(now, "s") - timestamps) / np.timedelta64(1, "D")
+        mastery = compute_mastery(group_index, scores, ages_days, self.half_life_days, num_groups)
+
+        last_seen = np.full(num_groups, np.datetime64("1970-01-01", "s"))
+        np.maximum.at(last_seen, group_index, timestamps)
+
+        existing = await self.db.execute(
+            select(Progress.id, Progress.user_id, Progress.subject, Progress.topic)
+            .where(Progress.user_id.in_(user_ids))
+        )
+        progress_ids = {
+            (user_id, subject, topic): progress_id
+            for progress_id, user_id, subject, topic in existing
+        }
+
+        updates, inserts = [], []
+        for group in range(num_groups):
+            row = first_index[group]
+            key = (int(attempt_users[row]), subjects[row], topics[row])
+            values = {
+                "mastery_level": round(float(mastery[group]), 4),
+                "last_studied": last_seen[group].item().date(),
+            }
+            if key in progress_ids:
+                updates.append({"id": progress_ids[key], **values})
+            else:
+                inserts.append({"user_id": key[0], "subject": key[1], "topic": key[2], **values})
+
+        if updates:
+            await self.db.execute(update(Progress), updates)
+        if inserts:
+            await self.db.execute(insert(Progress), inserts)
+        await self.db.commit()
+
+        return {"attempts": int(scores.size), "updated": len(updates), "created": len(inserts)}
+
+    async def _load_attempts(self, user_ids: List[int], max_attempt_id: Optional[int]):
+        """Stream a batch of users' attempts into column arrays"""
+        query = (
+            select(
+                QuizAttempt.user_id,
+                Quiz.subject,
+                func.coalesce(Quiz.topic, Quiz.subject),
+                QuizAttempt.score,
+                QuizAttempt.created_at
+            )
+            .join(Quiz, QuizAttempt.quiz_id == Quiz.id)
+            .where(QuizAttempt.user_id.in_(user_ids))
+            .execution_options(yield_per=settings.MASTERY_BATCH_SIZE * 20)
+        )
+        if max_attempt_id is not None:
+            query = query.where(QuizAttempt.id <= max_attempt_id)
+
+        columns = [[], [], [], [], []]
+        result = await self.db.stream(query)
+        async for partition in result.partitions():
+            for column, values in zip(columns, zip(*partition)):
+                column.extend(values)
+
+        if not columns[0]:
+            return None
+
+        return (
+            np.asarray(columns[0], dtype=np.int64),
+            np.asarray(columns[1], dtype=object),
+            np.asarray(columns[2], dtype=object),
+            np.asarray(columns[3], dtype=np.float64),
+            np.asarray(columns[4], dtype="datetime64[s]"),
+        )
+
+    async def _get_checkpoint(self) -> JobCheckpoint:
+        result = await self.db.execute(
+            select(JobCheckpoint).where(JobCheckpoint.name == CHECKPOINT_NAME)
+        )
+        checkpoint = result.scalar_one_or_none()
+        if checkpoint is None:
+            checkpoint = JobCheckpoint(name=CHECKPOINT_NAME, cursor=0, state={})
+            self.db.add(checkpoint)
+            await self.db.flush()
+        return checkpoint
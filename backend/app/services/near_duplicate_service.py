@@ -0,0 +1,202 @@
+import re
+import zlib
+from typing import Any, Dict, Hashable, List, Optional
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, update, insert
+from app.core.config import settings
+from app.models.quiz import Question, QuestionBucket
+
+NUM_PERM = 128
+NUM_BANDS = 16  # 8 rows per band: pairs above ~0.7 similarity become candidates
+SHINGLE_SIZE = 5
+QUERY_CHUNK_SIZE = 5000  # bound IN-list sizes
+
+# Signatures are persisted, so the hash family must not change between runs
+_rng = np.random.default_rng(20261019)
+_MULTIPLIERS = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_OFFSETS = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+_BAND_WEIGHTS = _rng.integers(1, 2**63, (NUM_BANDS, NUM_PERM // NUM_BANDS), dtype=np.uint64) | np.uint64(1)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def question_text(question: Dict[str, Any]) -> str:
+    """Normalized question and option text that signatures are computed over"""
+    parts = [question.get("question") or ""] + [str(option) for option in question.get("options") or []]
+    return " ".join(_PUNCTUATION.sub(" ", " ".join(parts).lower()).split())
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """32-bit hashes of the text's distinct character shingles"""
+    if len(text) <= size:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(hashes: np.ndarray) -> np.ndarray:
+    """MinHash over NUM_PERM multiply-shift hash functions"""
+    with np.errstate(over="ignore"):
+        permuted = (hashes[:, None] * _MULTIPLIERS + _OFFSETS) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature_for(question: Dict[str, Any]) -> np.ndarray:
+    return minhash_signature(shingle_hashes(question_text(question)))
+
+
+def band_buckets(signature: np.ndarray) -> List[int]:
+    """One signed 64-bit bucket per band; each band hashes with its own weights"""
+    bands = signature.astype(np.uint64).reshape(NUM_BANDS, -1)
+    with np.errstate(over="ignore"):
+        mixed = (bands * _BAND_WEIGHTS).sum(axis=1, dtype=np.uint64)
+    return sorted(set(mixed.view(np.int64).tolist()))
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+
+def best_match(signature: np.ndarray, candidates: Dict[Hashable, np.ndarray], threshold: float) -> Optional[Hashable]:
+    """Most similar candidate at or above the threshold, compared in one array op"""
+    if not candidates:
+        return None
+    keys = list(candidates)
+    scores = (np.stack([candidates[key] for key in keys]) == signature).mean(axis=1)
+    best = int(np.argmax(scores))
+    return keys[best] if scores[best] >= threshold else None
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+
+class MinHashLSH:
+    """In-memory LSH index, for duplicates within a batch not yet stored"""
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.buckets: Dict[int, List[Hashable]] = {}
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+
+    def query(self, signature: np.ndarray) -> Optional[Hashable]:
+        candidates = {
+            key: self.signatures[key]
+            for bucket in band_buckets(signature)
+            for key in self.buckets.get(bucket, ())
+        }
+        return best_match(signature, candidates, self.threshold)
+
+    def add(self, key: Hashable, signature: np.ndarray) -> None:
+        self.signatures[key] = signature
+        for bucket in band_buckets(signature):
+            self.buckets.setdefault(bucket, []).append(key)
+
+
+class NearDuplicateService:
+    """Near-duplicate lookups against the question bank's LSH buckets.
+
+    Candidates come from shared buckets via the bucket index, so the cost of
+    a lookup depends on the number of candidates, not the size of the bank.
+    """
+
+    def __init__(self, db: AsyncSession, threshold: float = None):
+        self.db = db
+        self.threshold = threshold if threshold is not None else settings.QUESTION_DUPLICATE_THRESHOLD
+
+    async def find_matches(self, signatures: List[np.ndarray]) -> List[Optional[int]]:
+        """Id of a banked near-duplicate for each signature, or None"""
+        wanted = [band_buckets(signature) for signature in signatures]
+        all_buckets = sorted({bucket for buckets in wanted for bucket in buckets})
+
+        members: Dict[int, List[int]] = {}
+        for start in range(0, len(all_buckets), QUERY_CHUNK_SIZE):
+            result = await self.db.execute(
+                select(QuestionBucket.bucket, QuestionBucket.question_id)
+                .where(QuestionBucket.bucket.in_(all_buckets[start:start + QUERY_CHUNK_SIZE]))
+            )
+            for bucket, question_id in result:
+                members.setdefault(bucket, []).append(question_id)
+
+        candidate_ids = sorted({qid for ids in members.values() for qid in ids})
+        stored: Dict[int, np.ndarray] = {}
+        for start in range(0, len(candidate_ids), QUERY_CHUNK_SIZE):
+            result = await self.db.execute(
+                select(Question.id, Question.minhash)
+                .where(Question.id.in_(candidate_ids[start:start + QUERY_CHUNK_SIZE]))
+            )
+            stored.update((qid, signature_from_bytes(data)) for qid, data in result)
+
+        return [
+            best_match(
+                signature,
+                {qid: stored[qid] for bucket in buckets for qid in members.get(bucket, ())},
+                self.threshold
+            )
+            for signature, buckets in zip(signatures, wanted)
+        ]
+
+    async def index(self, question_ids: List[int], signatures: List[np.ndarray]) -> None:
+        """Store bucket entries for newly banked questions"""
+        rows = [
+            {"bucket": bucket, "question_id": question_id}
+            for question_id, signature in zip(question_ids, signatures)
+            for bucket in band_buckets(signature)
+        ]
+        if rows:
+            await self.db.execute(insert(QuestionBucket), rows)
+
+    async def dedupe_bank(self, batch_size: int = 1000) -> Dict[str, int]:
+        """Sign questions banked without a signature, deleting near-duplicates.
+
+        Rows are handled in id order, so the first copy of a question is the
+        one that is kept. Commits after every batch, so it can be interrupted.
+        """
+        stats = {"indexed": 0, "removed": 0}
+        while True:
+            result = await self.db.execute(
+                select(Question.id, Question.question, Question.options)
+                .where(Question.minhash.is_(None))
+                .order_by(Question.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            signatures = [signature_for({"question": text, "options": options}) for _, text, options in rows]
+            matches = await self.find_matches(signatures)
+
+            batch = MinHashLSH(self.threshold)
+            kept_ids, kept_signatures, removed_ids = [], [], []
+            for (question_id, _, _), signature, match in zip(rows, signatures, matches):
+                if match is not None or batch.query(signature) is not None:
+                    removed_ids.append(question_id)
+                    continue
+                batch.add(question_id, signature)
+                kept_ids.append(question_id)
+                kept_signatures.append(signature)
+
+            if removed_ids:
+                await self.db.execute(delete(Question).where(Question.id.in_(removed_ids)))
+            if kept_ids:
+                await self.db.execute(
+                    update(Question),
+                    [
+                        {"id": question_id, "minhash": signature_to_bytes(signature)}
+                        for question_id, signature in zip(kept_ids, kept_signatures)
+                    ]
+                )
+                await self.index(kept_ids, kept_signatures)
+            await self.db.commit()
+
+            stats["indexed"] += len(kept_ids)
+            stats["removed"] += len(removed_ids)
+        return stats
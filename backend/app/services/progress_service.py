@@ -1,16 +1,114 @@
 from datetime import datetime, timedelta
 from typing import Dict, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, update
 from app.models.quiz import Quiz, QuizAttempt
 from app.models.progress import Progress
 from app.schemas.progress import DashboardStats
+from app.core.config import settings
 
 
 class ProgressService:
     def __init__(self, db: AsyncSession):
         self.db = db
     
+    async def record_score(self, progress: Progress, score: float) -> Progress:
+        """Push a score into the bounded history and running aggregates"""
+        return await self.record_scores(progress, [score])
+    
+    async def record_scores(self, progress: Progress, scores: List[float]) -> Progress:
+        """Push several scores at once (one aggregate update per record)"""
+        history_size = settings.PROGRESS_SCORE_HISTORY_SIZE
+        # Safe to extend in Python: ReviewService loads the record FOR UPDATE
+        progress.quiz_scores = ((progress.quiz_scores or []) + list(scores))[-history_size:]
+        
+        count = len(scores)
+        total = float(sum(scores))
+        total_sq = float(sum(score * score for score in scores))
+        
+        if progress.id is None:
+            progress.score_count = count
+            progress.score_sum = total
+            progress.score_sumsq = total_sq
+        else:
+            # Increment in SQL so concurrent submissions don't lose updates
+            progress.score_count = Progress.score_count + count
+            progress.score_sum = Progress.score_sum + total
+            progress.score_sumsq = Progress.score_sumsq + total_sq
+        
+        return progress
+    
+    async def rebuild_score_aggregates(self, quiz: Quiz, user_ids: List[int]) -> int:
+        """Recompute score history and aggregates from attempts on the quiz's topic.
+
+        Used after attempt scores change outside submit_quiz (e.g. a regrade).
+        Returns the number of progress records updated.
+        """
+        if not user_ids:
+            return 0
+        
+        topic = quiz.topic or quiz.subject
+        topic_quizzes = select(Quiz.id).where(
+            and_(
+                Quiz.subject == quiz.subject,
+                func.coalesce(Quiz.topic, Quiz.subject) == topic
+            )
+        )
+        in_scope = and_(
+            QuizAttempt.user_id.in_(user_ids),
+            QuizAttempt.quiz_id.in_(topic_quizzes)
+        )
+        
+        totals = await self.db.execute(
+            select(
+                QuizAttempt.user_id,
+                func.count(QuizAttempt.id),
+                func.sum(QuizAttempt.score),
+                func.sum(QuizAttempt.score * QuizAttempt.score)
+            )
+            .where(in_scope)
+            .group_by(QuizAttempt.user_id)
+        )
+        aggregates = {user_id: (count, total, total_sq) for user_id, count, total, total_sq in totals}
+        
+        position = func.row_number().over(
+            partition_by=QuizAttempt.user_id,
+            order_by=(QuizAttempt.created_at.desc(), QuizAttempt.id.desc())
+        ).label("position")
+        recent = select(QuizAttempt.user_id, QuizAttempt.score, position).where(in_scope).subquery()
+        history_rows = await self.db.execute(
+            select(recent.c.user_id, recent.c.score)
+            .where(recent.c.position <= settings.PROGRESS_SCORE_HISTORY_SIZE)
+            .order_by(recent.c.user_id, recent.c.position.desc())
+        )
+        histories: Dict[int, List[float]] = {}
+        for user_id, score in history_rows:
+            histories.setdefault(user_id, []).append(score)
+        
+        records = await self.db.execute(
+            select(Progress.id, Progress.user_id).where(
+                and_(
+                    Progress.user_id.in_(user_ids),
+                    Progress.subject == quiz.subject,
+                    Progress.topic == topic
+                )
+            )
+        )
+        updates = []
+        for progress_id, user_id in records:
+            count, total, total_sq = aggregates.get(user_id, (0, 0.0, 0.0))
+            updates.append({
+                "id": progress_id,
+                "quiz_scores": histories.get(user_id, []),
+                "score_count": count,
+                "score_sum": total or 0.0,
+                "score_sumsq": total_sq or 0.0,
+            })
+        
+        if updates:
+            await self.db.execute(update(Progress), updates)
+        return len(updates)
+    
     async def get_dashboard_stats(self, user_id: int) -> DashboardStats:
         """Get comprehensive dashboard statistics"""
         
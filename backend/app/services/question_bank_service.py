@@ -0,0 +1,198 @@
+import logging
+import random
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, literal_column, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app.models.quiz import Question
+from app.services.quiz_library_service import content_hash, normalize_text
+from app.services.near_duplicate_service import (
+    QUERY_CHUNK_SIZE,
+    MinHashLSH,
+    NearDuplicateService,
+    signature_for,
+    signature_to_bytes,
+)
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ("easy", "medium", "hard")
+MIXED_DIFFICULTY = "mixed"  # assemble an even spread across DIFFICULTIES
+SAMPLE_PIVOTS = 10  # random starting points per difficulty when sampling
+
+
+def spread_evenly(buckets: Dict[str, List[Any]], count: int) -> List[Any]:
+    """Take items round-robin across buckets so no difficulty dominates"""
+    picked = []
+    queues = [list(items) for items in buckets.values() if items]
+    while queues and len(picked) < count:
+        for queue in queues:
+            if len(picked) == count:
+                break
+            picked.append(queue.pop(0))
+        queues = [queue for queue in queues if queue]
+    return picked
+
+
+class QuestionBankService:
+    """Normalized question bank fed by every created and generated quiz"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def add_questions(
+        self,
+        questions: List[Dict[str, Any]],
+        subject: str,
+        topic: Optional[str],
+        difficulty: str,
+        source_quiz_id: Optional[int] = None
+    ) -> int:
+        """Insert questions that are not already banked, exactly or as a near-duplicate.
+
+        Returns how many were added.
+        """
+        return await self.add_question_sets([(questions, subject, topic, difficulty, source_quiz_id)])
+
+    async def add_question_sets(self, question_sets: List[Tuple]) -> int:
+        """Bank several quizzes' questions in one pass.
+
+        Takes (questions, subject, topic, difficulty, source_quiz_id) tuples.
+        """
+        rows = {}
+        for questions, subject, topic, difficulty, source_quiz_id in question_sets:
+            for q in questions or []:
+                digest = content_hash([q])
+                rows.setdefault(digest, {
+                    "content_hash": digest,
+                    "subject_key": normalize_text(subject),
+                    "topic_key": normalize_text(topic or subject),
+                    "difficulty": normalize_text(difficulty),
+                    "question": q.get("question") or "",
+                    "options": q.get("options") or [],
+                    "correct_answer": int(q.get("correct_answer") or 0),
+                    "explanation": q.get("explanation"),
+                    "source_quiz_id": source_quiz_id,
+                })
+        if not rows:
+            return 0
+
+        digests = list(rows)
+        for start in range(0, len(digests), QUERY_CHUNK_SIZE):
+            existing = await self.db.execute(
+                select(Question.content_hash)
+                .where(Question.content_hash.in_(digests[start:start + QUERY_CHUNK_SIZE]))
+            )
+            for digest in existing.scalars():
+                rows.pop(digest, None)
+        if not rows:
+            return 0
+
+        near_duplicates = NearDuplicateService(self.db)
+        signatures = [signature_for(row) for row in rows.values()]
+        matches = await near_duplicates.find_matches(signatures)
+        batch = MinHashLSH(near_duplicates.threshold)
+        new_rows, new_signatures = [], []
+        for row, signature, match in zip(rows.values(), signatures, matches):
+            if match is not None or batch.query(signature) is not None:
+                continue
+            batch.add(row["content_hash"], signature)
+            new_rows.append({**row, "minhash": signature_to_bytes(signature)})
+            new_signatures.append(signature)
+        if not new_rows:
+            return 0
+
+        # Another request may bank some of these first; only those rows are skipped
+        dialect_insert = sqlite.insert if self.db.get_bind().dialect.name == "sqlite" else postgresql.insert
+        statement = (
+            dialect_insert(Question)
+            .on_conflict_do_nothing(index_elements=[Question.content_hash])
+            .returning(Question.id, Question.content_hash)
+        )
+        signature_by_hash = {row["content_hash"]: signature for row, signature in zip(new_rows, new_signatures)}
+        try:
+            async with self.db.begin_nested():
+                inserted = (await self.db.execute(statement, new_rows)).all()
+                await near_duplicates.index(
+                    [row.id for row in inserted],
+                    [signature_by_hash[row.content_hash] for row in inserted]
+                )
+        except IntegrityError as e:
+            # e.g. the source quiz was deleted meanwhile; the bank is best-effort
+            logger.warning(f"Skipped banking {len(new_rows)} questions: {str(e)}")
+            return 0
+        return len(inserted)
+
+    async def sample(
+        self,
+        subject: str,
+        topic: Optional[str],
+        difficulty: str,
+        num_questions: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Assemble distinct questions from the bank, or None when it is too thin.
+
+        One UNION ALL query reads every difficulty. Each difficulty gets
+        several short index range scans from random sample_key pivots, so
+        picks are scattered across the bank rather than one run of
+        neighbours. One more window from a random pivot, wrapping around to
+        the start, backfills pivots that run off the end or overlap.
+        """
+        difficulty = normalize_text(difficulty)
+        difficulties = DIFFICULTIES if difficulty == MIXED_DIFFICULTY else (difficulty,)
+
+        pivots = min(num_questions, SAMPLE_PIVOTS)
+        width = -(-num_questions // pivots)  # rows read per pivot, rounded up
+        branches = []
+        for level in difficulties:
+            matching = (
+                select(
+                    Question.id,
+                    Question.question,
+                    Question.options,
+                    Question.correct_answer,
+                    Question.explanation,
+                    Question.difficulty
+                )
+                .where(
+                    Question.subject_key == normalize_text(subject),
+                    Question.topic_key == normalize_text(topic or subject),
+                    Question.difficulty == level
+                )
+                .order_by(Question.sample_key)
+            )
+            windows = [(matching.where(Question.sample_key >= random.random()).limit(width), "0")
+                       for _ in range(pivots)]
+            backfill_pivot = random.random()
+            windows.append((matching.where(Question.sample_key >= backfill_pivot).limit(num_questions), "1"))
+            windows.append((matching.where(Question.sample_key < backfill_pivot).limit(num_questions), "1"))
+            for window, backfill in windows:
+                window = window.subquery()
+                branches.append(select(window, literal_column(backfill).label("backfill")))
+        result = await self.db.execute(union_all(*branches))
+
+        scattered: Dict[str, Dict[int, Any]] = {level: {} for level in difficulties}
+        backfill: Dict[str, Dict[int, Any]] = {level: {} for level in difficulties}
+        for row in result:
+            (backfill if row.backfill else scattered)[row.difficulty].setdefault(row.id, row)
+
+        buckets: Dict[str, List[Dict[str, Any]]] = {}
+        for level in difficulties:
+            rows = list(scattered[level].values())
+            random.shuffle(rows)
+            rows += [row for row_id, row in backfill[level].items() if row_id not in scattered[level]]
+            buckets[level] = [
+                {
+                    "question": row.question,
+                    "options": row.options,
+                    "correct_answer": row.correct_answer,
+                    "explanation": row.explanation,
+                }
+                for row in rows[:num_questions]
+            ]
+
+        picked = spread_evenly(buckets, num_questions)
+        if len(picked) < num_questions:
+            return None
+        return picked
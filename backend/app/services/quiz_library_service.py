@@ -0,0 +1,131 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from app.models.quiz import Quiz, QuizContent, build_answer_key
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Case- and whitespace-insensitive form used for hashing and lookups"""
+    return " ".join(str(value or "").lower().split())
+
+
+def content_hash(questions: List[Dict[str, Any]]) -> str:
+    """Stable hash of a question set, ignoring case, spacing and explanations"""
+    normalized = [
+        {
+            "question": normalize_text(q.get("question")),
+            "options": [normalize_text(option) for option in q.get("options") or []],
+            "correct_answer": int(q.get("correct_answer") or 0),
+        }
+        for q in questions
+    ]
+    encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class QuizLibraryService:
+    """Shared library of generated quizzes that users hold references to"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def find(
+        self,
+        subject: str,
+        topic: str,
+        difficulty: str,
+        num_questions: int,
+        user_id: int
+    ) -> Optional[QuizContent]:
+        """Most-used matching library quiz the user doesn't already have"""
+        held = select(Quiz.content_id).where(
+            Quiz.user_id == user_id,
+            Quiz.content_id.is_not(None)
+        )
+        result = await self.db.execute(
+            select(QuizContent)
+            .where(
+                QuizContent.subject_key == normalize_text(subject),
+                QuizContent.topic_key == normalize_text(topic),
+                QuizContent.difficulty == normalize_text(difficulty),
+                QuizContent.question_count == num_questions,
+                QuizContent.id.not_in(held)
+            )
+            .order_by(QuizContent.reference_count.desc(), QuizContent.id)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def store(
+        self,
+        generated: Dict[str, Any],
+        subject: str,
+        topic: str,
+        difficulty: str
+    ) -> QuizContent:
+        """Add generated questions to the library, or return the existing copy"""
+        questions = generated["questions"]
+        digest = content_hash(questions)
+
+        existing = await self._get_by_hash(digest)
+        if existing is not None:
+            return existing
+
+        content = QuizContent(
+            content_hash=digest,
+            title=generated["title"],
+            description=generated.get("description"),
+            subject_key=normalize_text(subject),
+            topic_key=normalize_text(topic),
+            difficulty=normalize_text(difficulty),
+            questions=questions,
+            answer_key=build_answer_key(questions),
+            question_count=len(questions),
+        )
+        try:
+            async with self.db.begin_nested():
+                self.db.add(content)
+        except IntegrityError:
+            # Stored concurrently by another request
+            return await self._get_by_hash(digest)
+        return content
+
+    async def add_reference(
+        self,
+        content: QuizContent,
+        user_id: int,
+        subject: str,
+        topic: Optional[str],
+        difficulty: str
+    ) -> Quiz:
+        """Create the user's quiz pointing at shared content (not committed)"""
+        await self.db.execute(
+            update(QuizContent)
+            .where(QuizContent.id == content.id)
+            .values(reference_count=QuizContent.reference_count + 1)
+        )
+        # Content is immutable, so the small answer key and count are copied
+        # onto the reference and grading never needs to load the questions
+        quiz = Quiz(
+            title=content.title,
+            description=content.description,
+            subject=subject,
+            topic=topic,
+            difficulty=difficulty,
+            content=content,
+            answer_key=content.answer_key,
+            question_count=content.question_count,
+            user_id=user_id,
+            is_ai_generated=True
+        )
+        self.db.add(quiz)
+        return quiz
+
+    async def _get_by_hash(self, digest: str) -> Optional[QuizContent]:
+        result = await self.db.execute(
+            select(QuizContent).where(QuizContent.content_hash == digest)
+        )
+        return result.scalar_one_or_none()
@@ -1,29 +1,236 @@
-from typing import List
+import base64
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Optional, Tuple
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.quiz import Quiz
+from sqlalchemy import select, func, and_, tuple_
+from sqlalchemy.orm import defer, joinedload
+from app.models.quiz import Quiz, QuizAttempt, build_answer_key
+
+ANALYTICS_CACHE_SIZE = 256
+DISCRIMINATION_GROUP = 0.27  # upper/lower group share for the discrimination index
+
+# quiz_id -> ((quiz updated_at, attempt count, last attempt id, score total), analytics);
+# a new attempt, an edit to the quiz or a regrade rewriting scores changes
+# the version and so invalidates the entry
+_analytics_cache: "OrderedDict[int, tuple]" = OrderedDict()
+
+
+def invalidate_analytics(quiz_id: int) -> None:
+    """Drop a quiz's cached analytics in this process"""
+    _analytics_cache.pop(quiz_id, None)
+
+
+def build_answer_matrix(answers: List[List[int]], num_questions: int, num_options: int) -> np.ndarray:
+    """Pack ragged answer lists into an (attempts x questions) matrix.
+
+    -1 marks unanswered questions and answers outside [0, num_options), so
+    an out-of-range answer can never wrap onto a real option.
+    """
+    matrix = np.full((len(answers), num_questions), -1, dtype=np.int64)
+    lengths = np.fromiter((len(a) for a in answers), dtype=np.int64, count=len(answers))
+    if not lengths.sum():
+        return matrix
+    
+    flat = np.fromiter(
+        (
+            value if isinstance(value, int) and 0 <= value < num_options else -1
+            for attempt in answers for value in attempt
+        ),
+        dtype=np.int64,
+        count=int(lengths.sum())
+    )
+    rows = np.repeat(np.arange(len(answers)), lengths)
+    cols = np.arange(flat.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    keep = cols < num_questions
+    matrix[rows[keep], cols[keep]] = flat[keep]
+    return matrix
+
+
+def compute_question_stats(matrix: np.ndarray, key: np.ndarray, num_options: int) -> dict:
+    """Per-question correct rate, option distribution and discrimination index"""
+    num_attempts, num_questions = matrix.shape
+    correct = matrix == key
+    
+    # Option counts per question; column 0 counts unanswered/out-of-range
+    slots = np.where((matrix >= 0) & (matrix < num_options), matrix + 1, 0)
+    flat = (np.arange(num_questions) * (num_options + 1) + slots).ravel()
+    option_counts = np.bincount(flat, minlength=num_questions * (num_options + 1))
+    option_counts = option_counts.reshape(num_questions, num_options + 1)
+    
+    # Upper-lower group discrimination on total correct answers
+    group = max(1, int(round(num_attempts * DISCRIMINATION_GROUP)))
+    order = np.argsort(correct.sum(axis=1), kind="stable")
+    discrimination = correct[order[-group:]].mean(axis=0) - correct[order[:group]].mean(axis=0)
+    
+    return {
+        "correct_rate": correct.mean(axis=0),
+        "option_counts": option_counts[:, 1:],
+        "unanswered": option_counts[:, 0],
+        "discrimination": discrimination,
+    }
+
+
+def encode_cursor(created_at: datetime, quiz_id: int) -> str:
+    """Opaque page cursor for the (created_at, id) keyset"""
+    raw = f"{created_at.isoformat()}|{quiz_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, quiz_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(quiz_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
 
 
 class QuizService:
     def __init__(self, db: AsyncSession):
         self.db = db
     
+    async def list_quizzes(
+        self,
+        user_id: int,
+        subject: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Quiz], Optional[str]]:
+        """Newest-first page of a user's quizzes without the question payloads.
+
+        Seeks past the cursor on (created_at, id) instead of using an offset,
+        so deep pages cost the same as the first one.
+        """
+        query = (
+            select(Quiz)
+            .options(defer(Quiz.own_questions, raiseload=True), defer(Quiz.answer_key, raiseload=True))
+            .where(Quiz.user_id == user_id)
+        )
+        if subject:
+            query = query.where(Quiz.subject == subject)
+        if cursor:
+            created_at, quiz_id = decode_cursor(cursor)
+            query = query.where(tuple_(Quiz.created_at, Quiz.id) < tuple_(created_at, quiz_id))
+        
+        query = query.order_by(Quiz.created_at.desc(), Quiz.id.desc()).limit(limit + 1)
+        result = await self.db.execute(query)
+        quizzes = list(result.scalars().all())
+        
+        next_cursor = None
+        if len(quizzes) > limit:
+            quizzes = quizzes[:limit]
+            next_cursor = encode_cursor(quizzes[-1].created_at, quizzes[-1].id)
+        return quizzes, next_cursor
+    
+    def get_answer_key(self, quiz: Quiz) -> List[int]:
+        """Precomputed answer key, derived on the fly for quizzes saved before it existed"""
+        if quiz.answer_key is not None:
+            return quiz.answer_key
+        return build_answer_key(quiz.questions)
+    
     async def calculate_score(self, quiz: Quiz, user_answers: List[int]) -> float:
         """Calculate quiz score based on correct answers"""
-        if not quiz.questions or not user_answers:
+        answer_key = self.get_answer_key(quiz)
+        if not answer_key or not user_answers:
             return 0.0
         
-        correct_answers = 0
-        total_questions = len(quiz.questions)
-        
-        for i, question in enumerate(quiz.questions):
-            if i < len(user_answers):
-                correct_answer_index = question.get("correct_answer", 0)
-                if user_answers[i] == correct_answer_index:
-                    correct_answers += 1
+        correct_answers = sum(1 for answer, correct in zip(user_answers, answer_key) if answer == correct)
+        return (correct_answers / len(answer_key)) * 100.0
+    
+    async def calculate_scores(self, quiz: Quiz, answers: List[List[int]]) -> np.ndarray:
+        """Grade many attempts at once with a single array comparison"""
+        answer_key = np.asarray(self.get_answer_key(quiz), dtype=np.int64)
+        if not answer_key.size or not answers:
+            return np.zeros(len(answers))
         
-        return (correct_answers / total_questions) * 100.0 if total_questions > 0 else 0.0
+        # No answer above the highest key can be correct, whatever the options
+        matrix = build_answer_matrix(answers, answer_key.size, int(answer_key.max()) + 1)
+        return (matrix == answer_key).sum(axis=1) / answer_key.size * 100.0
     
-    async def get_quiz_analytics(self, quiz_id: int, user_id: int) -> dict:
+    async def get_quiz_analytics(self, quiz_id: int, user_id: int) -> Optional[dict]:
         """Get detailed analytics for a quiz"""
-        # Implementation for quiz analytics
-        pass
\ No newline at end of file
+        result = await self.db.execute(
+            select(Quiz)
+            .options(joinedload(Quiz.content))
+            .where(and_(Quiz.id == quiz_id, Quiz.user_id == user_id))
+        )
+        quiz = result.scalar_one_or_none()
+        if not quiz:
+            return None
+        
+        version_result = await self.db.execute(
+            select(func.count(QuizAttempt.id), func.max(QuizAttempt.id), func.sum(QuizAttempt.score))
+            .where(QuizAttempt.quiz_id == quiz_id)
+        )
+        version = (quiz.updated_at,) + tuple(version_result.one())
+        
+        cached = _analytics_cache.get(quiz_id)
+        if cached and cached[0] == version:
+            _analytics_cache.move_to_end(quiz_id)
+            return cached[1]
+        
+        analytics = await self._compute_quiz_analytics(quiz)
+        _analytics_cache[quiz_id] = (version, analytics)
+        _analytics_cache.move_to_end(quiz_id)
+        if len(_analytics_cache) > ANALYTICS_CACHE_SIZE:
+            _analytics_cache.popitem(last=False)
+        
+        return analytics
+    
+    async def _compute_quiz_analytics(self, quiz: Quiz) -> dict:
+        questions = quiz.questions or []
+        num_questions = len(questions)
+        num_options = max([len(q.get("options", [])) for q in questions] or [0])
+        
+        answers, scores, times = [], [], []
+        result = await self.db.stream(
+            select(QuizAttempt.answers, QuizAttempt.score, QuizAttempt.time_taken)
+            .where(QuizAttempt.quiz_id == quiz.id)
+            .execution_options(yield_per=10000)
+        )
+        async for partition in result.partitions():
+            for attempt_answers, score, time_taken in partition:
+                answers.append(attempt_answers or [])
+                scores.append(score)
+                times.append(time_taken)
+        
+        analytics = {
+            "quiz_id": quiz.id,
+            "attempt_count": len(answers),
+            "average_score": 0.0,
+            "time_taken": {},
+            "questions": [],
+        }
+        if not answers or not num_questions:
+            return analytics
+        
+        # Graded exactly as submissions are
+        key = np.asarray(self.get_answer_key(quiz), dtype=np.int64)
+        matrix = build_answer_matrix(answers, num_questions, max(num_options, int(key.max()) + 1))
+        stats = compute_question_stats(matrix, key, num_options)
+        
+        times = np.asarray(times, dtype=np.float64)
+        analytics["average_score"] = round(float(np.mean(scores)), 2)
+        analytics["time_taken"] = {
+            "mean": round(float(times.mean()), 2),
+            "median": float(np.median(times)),
+            "p90": float(np.percentile(times, 90)),
+            "min": float(times.min()),
+            "max": float(times.max()),
+        }
+        analytics["questions"] = [
+            {
+                "index": i,
+                "question": question.get("question", ""),
+                "correct_answer": int(key[i]),
+                "correct_rate": round(float(stats["correct_rate"][i]), 4),
+                "option_counts": stats["option_counts"][i, :len(question.get("options", []))].tolist(),
+                "unanswered": int(stats["unanswered"][i]),
+                "discrimination": round(float(stats["discrimination"][i]), 4),
+            }
+            for i, question in enumerate(questions)
+        ]
+        return analytics
\ No newline at end of file
@@ -0,0 +1,147 @@
+import logging
+from typing import Callable, Dict, Optional
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, update
+from sqlalchemy.orm import joinedload
+from app.models.quiz import Quiz, QuizAttempt, build_answer_key
+from app.models.job import JobCheckpoint
+from app.services.quiz_service import QuizService, invalidate_analytics
+from app.services.progress_service import ProgressService
+from app.services.mastery_service import MasteryService
+from app.services.leaderboard_service import LeaderboardService
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE_BATCH_SIZE = 500
+
+
+def checkpoint_name(quiz_id: int) -> str:
+    return f"regrade:{quiz_id}"
+
+
+class RegradeService:
+    """Rescore a quiz's attempts against its current answer key.
+
+    Work is checkpointed after every chunk, so an interrupted run picks up
+    where it stopped. Phases: "rescore" (stream and update attempts), then
+    "aggregates" (refresh progress, mastery, leaderboards and cached
+    analytics), then "done".
+    """
+
+    def __init__(self, db: AsyncSession, chunk_size: int = 5000):
+        self.db = db
+        self.chunk_size = chunk_size
+
+    async def regrade_quiz(
+        self,
+        quiz_id: int,
+        restart: bool = False,
+        on_progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        result = await self.db.execute(
+            select(Quiz).options(joinedload(Quiz.content)).where(Quiz.id == quiz_id)
+        )
+        quiz = result.scalar_one_or_none()
+        if quiz is None:
+            raise ValueError(f"Quiz {quiz_id} not found")
+
+        # The cached key is only refreshed by the model hook, so a correction
+        # made by a bulk UPDATE or a SQL fix leaves it stale: rebuild it first
+        answer_key = build_answer_key(quiz.questions)
+        if quiz.answer_key != answer_key:
+            logger.info(f"Rebuilt stale answer key of quiz {quiz_id}")
+            quiz.answer_key = answer_key
+            await self.db.commit()
+
+        checkpoint = await self._get_checkpoint(quiz_id)
+        if restart or checkpoint.state.get("phase") in (None, "done"):
+            total = (await self.db.execute(
+                select(func.count(QuizAttempt.id)).where(QuizAttempt.quiz_id == quiz_id)
+            )).scalar() or 0
+            checkpoint.cursor = 0
+            checkpoint.state = {"phase": "rescore", "total": total, "processed": 0, "changed": 0, "users": []}
+            await self.db.commit()
+        else:
+            logger.info(f"Resuming regrade of quiz {quiz_id} after attempt {checkpoint.cursor}")
+
+        if checkpoint.state["phase"] == "rescore":
+            await self._rescore(quiz, checkpoint, on_progress)
+
+        if checkpoint.state["phase"] == "aggregates":
+            await self._refresh_aggregates(quiz, checkpoint.state["users"])
+            checkpoint.state = {**checkpoint.state, "phase": "done"}
+            await self.db.commit()
+            invalidate_analytics(quiz_id)
+
+        return checkpoint.state
+
+    async def _rescore(self, quiz: Quiz, checkpoint: JobCheckpoint, on_progress) -> None:
+        quiz_service = QuizService(self.db)
+        while True:
+            result = await self.db.execute(
+                select(QuizAttempt.id, QuizAttempt.user_id, QuizAttempt.answers, QuizAttempt.score)
+                .where(QuizAttempt.quiz_id == quiz.id, QuizAttempt.id > checkpoint.cursor)
+                .order_by(QuizAttempt.id)
+                .limit(self.chunk_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            ids, user_ids, answers, old_scores = zip(*rows)
+            new_scores = await quiz_service.calculate_scores(quiz, list(answers))
+            changed = np.flatnonzero(~np.isclose(new_scores, np.asarray(old_scores, dtype=np.float64)))
+
+            if changed.size:
+                await self.db.execute(
+                    update(QuizAttempt),
+                    [{"id": ids[i], "score": float(new_scores[i])} for i in changed]
+                )
+
+            state = checkpoint.state
+            users = set(state["users"]) | {user_ids[i] for i in changed}
+            checkpoint.cursor = ids[-1]
+            checkpoint.state = {
+                **state,
+                "processed": state["processed"] + len(rows),
+                "changed": state["changed"] + int(changed.size),
+                "users": sorted(users),
+            }
+            # Score updates and the checkpoint commit together
+            await self.db.commit()
+
+            logger.info(
+                f"Regrade quiz {quiz.id}: {checkpoint.state['processed']}/{checkpoint.state['total']} "
+                f"attempts, {checkpoint.state['changed']} changed"
+            )
+            if on_progress:
+                on_progress(checkpoint.state)
+
+        checkpoint.state = {**checkpoint.state, "phase": "aggregates"}
+        await self.db.commit()
+
+    async def _refresh_aggregates(self, quiz: Quiz, user_ids) -> None:
+        """Refresh everything derived from the rescored attempts"""
+        if not user_ids:
+            return
+
+        progress_service = ProgressService(self.db)
+        mastery_service = MasteryService(self.db)
+        for start in range(0, len(user_ids), AGGREGATE_BATCH_SIZE):
+            batch = user_ids[start:start + AGGREGATE_BATCH_SIZE]
+            await progress_service.rebuild_score_aggregates(quiz, batch)
+            await mastery_service.recompute_users(batch)  # commits
+
+        await LeaderboardService(self.db).rebuild(only_subject=quiz.subject)
+
+    async def _get_checkpoint(self, quiz_id: int) -> JobCheckpoint:
+        result = await self.db.execute(
+            select(JobCheckpoint).where(JobCheckpoint.name == checkpoint_name(quiz_id))
+        )
+        checkpoint = result.scalar_one_or_none()
+        if checkpoint is None:
+            checkpoint = JobCheckpoint(name=checkpoint_name(quiz_id), cursor=0, state={})
+            self.db.add(checkpoint)
+            await self.db.flush()
+        return checkpoint
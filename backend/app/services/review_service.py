@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+from app.models.quiz import Quiz
+from app.models.progress import Progress
+
+MIN_EASE_FACTOR = 1.3
+
+
+def score_to_quality(score: float) -> int:
+    """Map a 0-100 quiz score onto the SM-2 0-5 recall quality scale"""
+    return max(0, min(5, int(round(score / 20.0))))
+
+
+def sm2_schedule(
+    quality: int,
+    repetitions: int,
+    interval_days: int,
+    ease_factor: float
+) -> Tuple[int, int, float]:
+    """Apply one SM-2 review and return (repetitions, interval_days, ease_factor)"""
+    if quality < 3:
+        repetitions = 0
+        interval_days = 1
+    else:
+        if repetitions == 0:
+            interval_days = 1
+        elif repetitions == 1:
+            interval_days = 6
+        else:
+            interval_days = int(round(interval_days * ease_factor))
+        repetitions += 1
+
+    ease_factor += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    return repetitions, interval_days, max(MIN_EASE_FACTOR, ease_factor)
+
+
+class ReviewService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_or_create_progress(self, user_id: int, quiz: Quiz) -> Progress:
+        """Get the progress record a quiz attempt counts towards"""
+        records = await self.get_or_create_progress_many([user_id], quiz)
+        return records[user_id]
+
+    async def get_or_create_progress_many(self, user_ids: List[int], quiz: Quiz) -> Dict[int, Progress]:
+        """Progress records for several users on one quiz's topic, in one query.
+
+        Existing rows are locked until the caller commits: the score history
+        and review schedule are read-modify-write, so concurrent submissions
+        for the same user would otherwise overwrite each other.
+        """
+        topic = quiz.topic or quiz.subject
+        result = await self.db.execute(
+            select(Progress)
+            .where(
+                and_(
+                    Progress.user_id.in_(user_ids),
+                    Progress.subject == quiz.subject,
+                    Progress.topic == topic
+                )
+            )
+            .order_by(Progress.id)  # a consistent lock order, so batches can't deadlock
+            .with_for_update()
+            .execution_options(populate_existing=True)  # read the locked values, not stale ones
+        )
+        records = {}
+        for progress in result.scalars():
+            records.setdefault(progress.user_id, progress)
+
+        for user_id in user_ids:
+            if user_id not in records:
+                records[user_id] = Progress(
+                    user_id=user_id,
+                    subject=quiz.subject,
+                    topic=topic,
+                    mastery_level=0.0,
+                    study_time=0,
+                    quiz_scores=[],
+                    strengths=[],
+                    weaknesses=[],
+                    ease_factor=2.5,
+                    interval_days=0,
+                    repetitions=0
+                )
+                self.db.add(records[user_id])
+
+        return records
+
+    def apply_review(self, progress: Progress, score: float, now: datetime) -> Progress:
+        repetitions, interval_days, ease_factor = sm2_schedule(
+            score_to_quality(score),
+            progress.repetitions or 0,
+            progress.interval_days or 0,
+            progress.ease_factor or 2.5
+        )
+        progress.repetitions = repetitions
+        progress.interval_days = interval_days
+        progress.ease_factor = ease_factor
+        progress.next_review_at = now + timedelta(days=interval_days)
+        progress.last_studied = now.date()
+        return progress
+
+    async def record_review(
+        self,
+        user_id: int,
+        quiz: Quiz,
+        score: float,
+        now: datetime = None
+    ) -> Progress:
+        """Reschedule the quiz's topic after an attempt (caller commits)"""
+        now = now or datetime.now()
+        progress = await self.get_or_create_progress(user_id, quiz)
+        return self.apply_review(progress, score, now)
+
+    async def record_reviews(
+        self,
+        quiz: Quiz,
+        user_scores: Dict[int, List[float]],
+        now: datetime = None
+    ) -> Dict[int, Progress]:
+        """Batch form of record_review: scores are applied in order per user"""
+        now = now or datetime.now()
+        records = await self.get_or_create_progress_many(list(user_scores), quiz)
+        for user_id, scores in user_scores.items():
+            for score in scores:
+                self.apply_review(records[user_id], score, now)
+        return records
+
+    async def get_due(self, user_id: int, limit: int = 10, now: datetime = None) -> List[Progress]:
+        """Topics due for review, most overdue first.
+
+        Served by the (user_id, next_review_at) index as a single range scan.
+        """
+        now = now or datetime.now()
+        result = await self.db.execute(
+            select(Progress)
+            .where(
+                and_(
+                    Progress.user_id == user_id,
+                    Progress.next_review_at <= now
+                )
+            )
+            .order_by(Progress.next_review_at)
+            .limit(limit)
+        )
+        return result.scalars().all()
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import timedelta
+from typing import Dict, List, Optional
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.security import create_access_token, user_claims
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = "revoked_tokens"  # sorted set: revoked id -> when it can be forgotten
+MIN_BLOOM_CAPACITY = 100000
+
+
+class MemoryRevocationStore:
+    """In-process revocation list, used when Redis is disabled"""
+
+    def __init__(self):
+        self.revoked: Dict[str, float] = {}
+
+    async def add(self, token_id: str, expires_at: float) -> bool:
+        if token_id in self.revoked:
+            return False
+        self.revoked[token_id] = expires_at
+        return True
+
+    async def contains(self, token_id: str) -> bool:
+        return token_id in self.revoked
+
+    async def live_ids(self) -> List[str]:
+        now = time.time()
+        self.revoked = {token_id: expires for token_id, expires in self.revoked.items() if expires > now}
+        return list(self.revoked)
+
+
+class RedisRevocationStore:
+    """Revoked ids in a sorted set scored by expiry, so stale ones can be pruned"""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def add(self, token_id: str, expires_at: float) -> bool:
+        # NX makes revoking atomic: only one caller sees the id as newly added
+        return bool(await self.client.zadd(REVOKED_KEY, {token_id: expires_at}, nx=True))
+
+    async def contains(self, token_id: str) -> bool:
+        return await self.client.zscore(REVOKED_KEY, token_id) is not None
+
+    async def live_ids(self) -> List[str]:
+        await self.client.zremrangebyscore(REVOKED_KEY, "-inf", time.time())
+        return await self.client.zrange(REVOKED_KEY, 0, -1)
+
+
+_memory_store = MemoryRevocationStore()
+
+
+def get_revocation_store():
+    client = get_redis()
+    if client is None:
+        return _memory_store
+    return RedisRevocationStore(client)
+
+
+class RevocationList:
+    """Revoked sessions and refresh tokens.
+
+    Each worker keeps a Bloom filter of every revoked id. Almost every check
+    is for a token that was never revoked, which the filter answers without
+    a round trip; only "maybe" answers go to the store. Revocations made by
+    other workers reach the filter on the next sync.
+    """
+
+    def __init__(self):
+        self.bloom = BloomFilter.for_capacity(MIN_BLOOM_CAPACITY)
+        self._revoked_during_sync: Optional[List[str]] = None
+
+    async def is_revoked(self, token_id: str) -> bool:
+        if token_id not in self.bloom:
+            return False
+        return await get_revocation_store().contains(token_id)
+
+    async def revoke(self, token_id: str, expires_at: float) -> bool:
+        """Revoke an id until `expires_at`; False if it was already revoked"""
+        self.bloom.add(token_id)
+        if self._revoked_during_sync is not None:
+            self._revoked_during_sync.append(token_id)
+        return await get_revocation_store().add(token_id, expires_at)
+
+    async def sync(self) -> None:
+        """Rebuild the filter from the store, dropping expired ids.
+
+        Ids revoked here while the store is read may be missing from its
+        snapshot, so they are carried over into the new filter.
+        """
+        self._revoked_during_sync = []
+        try:
+            token_ids = await get_revocation_store().live_ids()
+            bloom = BloomFilter.for_capacity(max(MIN_BLOOM_CAPACITY, 2 * len(token_ids)))
+            for token_id in token_ids + self._revoked_during_sync:
+                bloom.add(token_id)
+            self.bloom = bloom
+        finally:
+            self._revoked_during_sync = None
+
+
+revocation_list = RevocationList()
+
+
+async def sync_revocations_periodically(interval: float) -> None:
+    """Background task started with the app: pick up other workers' revocations"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await revocation_list.sync()
+        except Exception as e:
+            logger.warning(f"Failed to sync revoked tokens: {str(e)}")
+
+
+def issue_tokens(user: User, session_id: Optional[str] = None) -> Dict[str, str]:
+    """Access and refresh token pair for a session (a new one unless given).
+
+    Both tokens carry the session id, so revoking the session (logout, or
+    reuse of a rotated refresh token) revokes every token issued for it.
+    """
+    session_id = session_id or uuid.uuid4().hex
+    claims = {**user_claims(user), "sid": session_id}
+    access_token = create_access_token(
+        subject=user.username,
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        claims=claims
+    )
+    refresh_token = create_access_token(
+        subject=user.username,
+        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        claims={**claims, "typ": "refresh", "jti": uuid.uuid4().hex}
+    )
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+
+def session_expiry() -> float:
+    """When a session revoked now can be forgotten: after its last refresh token expires"""
+    return time.time() + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
@@ -4,6 +4,7 @@ import hashlib
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 import json
+from app.core.breached_passwords import is_breached_password, BREACHED_PASSWORD_ERROR
 
 
 def generate_unique_id() -> str:
@@ -41,6 +42,9 @@ def validate_password(password: str) -> Dict[str, Any]:
     if not re.search(r'[!@#$%^&*()_+\-=\[\]{};\':"\\|,.<>\/?]', password):
         errors.append("Password must contain at least one special character")
     
+    if is_breached_password(password):
+        errors.append(BREACHED_PASSWORD_ERROR)
+    
     return {
         "is_valid": len(errors) == 0,
         "errors": errors,
@@ -248,7 +252,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserUpdate
@@ -367,7 +371,7 @@ async def delete_avatar(
 
 @router.get("/me/stats")
 async def get_user_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user statistics"""
@@ -422,11 +426,13 @@ async def change_password(
     current_user: User = Depends(get_current_user)
 ):
     """Change user password"""
-    from app.core.security import verify_password, get_password_hash
+    from app.core.security import password_hasher
+    from app.core.principal_cache import principal_cache
     from app.utils.helpers import validate_password
     
     # Verify current password
-    if not verify_password(current_password, current_user.hashed_password):
+    await db.refresh(current_user, ["hashed_password"])
+    if not await password_hasher.verify(current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -441,8 +447,10 @@ async def change_password(
         )
     
     # Update password
-    current_user.hashed_password = get_password_hash(new_password)
+    current_user.hashed_password = await password_hasher.hash(new_password)
+    current_user.token_generation += 1
     await db.commit()
+    await principal_cache.invalidate(current_user.username)
     
     return {"message": "Password changed successfully"}
 
@@ -454,10 +462,12 @@ async def delete_account(
     current_user: User = Depends(get_current_user)
 ):
     """Delete user account"""
-    from app.core.security import verify_password
+    from app.core.security import password_hasher
+    from app.core.principal_cache import principal_cache
     
     # Verify password
-    if not verify_password(password, current_user.hashed_password):
+    await db.refresh(current_user, ["hashed_password"])
+    if not await password_hasher.verify(password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password is incorrect"
@@ -465,7 +475,9 @@ async def delete_account(
     
     # Soft delete - deactivate account
     current_user.is_active = False
+    current_user.token_generation += 1
     await db.commit()
+    await principal_cache.invalidate(current_user.username)
     
     return {"message": "Account deactivated successfully"}
 
@@ -473,7 +485,7 @@ async def delete_account(
 @router.get("/me/export")
 async def export_user_data(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Export user data"""
     from app.models.quiz import Quiz, QuizAttempt
@@ -517,7 +529,7 @@ async def export_user_data(
                 "subject": quiz.subject,
                 "difficulty": quiz.difficulty,
                 "created_at": quiz.created_at.isoformat(),
-                "questions_count": len(quiz.questions)
+                "questions_count": quiz.question_count
             }
             for quiz in user_quizzes
         ],
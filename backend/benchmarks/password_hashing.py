@@ -0,0 +1,95 @@
+"""Login storm benchmark.
+
+Hammers POST /auth/login from many concurrent clients while a probe keeps
+requesting an unrelated endpoint, then reports login throughput and the
+probe's latency. With bcrypt on the event loop the probe waits behind
+every login; with hashing off the loop it should stay near its idle latency.
+
+Start the API, then run from backend/:
+
+    python -m benchmarks.password_hashing --url http://localhost:8000
+    python -m benchmarks.password_hashing --concurrency 64 --duration 30
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import List
+import httpx
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+
+async def register(client: httpx.AsyncClient) -> tuple:
+    username = f"bench_{uuid.uuid4().hex[:12]}"
+    password = "benchmark-password"
+    response = await client.post("/api/v1/auth/register", json={
+        "email": f"{username}@example.com",
+        "username": username,
+        "first_name": "Bench",
+        "last_name": "Mark",
+        "password": password,
+    })
+    response.raise_for_status()
+    return username, password
+
+
+async def login_worker(client, username, password, deadline, latencies, statuses) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.post("/api/v1/auth/login", data={"username": username, "password": password})
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def probe(client, path, interval, deadline, latencies) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+
+
+async def run(url: str, concurrency: int, duration: float, probe_path: str, probe_interval: float) -> None:
+    limits = httpx.Limits(max_connections=concurrency + 2)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        username, password = await register(client)
+
+        idle = []
+        await probe(client, probe_path, probe_interval, time.perf_counter() + 2, idle)
+
+        login_latencies, probe_latencies, statuses = [], [], {}
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            probe(client, probe_path, probe_interval, deadline, probe_latencies),
+            *(
+                login_worker(client, username, password, deadline, login_latencies, statuses)
+                for _ in range(concurrency)
+            )
+        )
+
+    succeeded = statuses.get(200, 0)
+    print(f"logins:  {succeeded / duration:.1f}/s succeeded, responses by status {dict(sorted(statuses.items()))}")
+    print(f"         p50 {percentile(login_latencies, 0.5):.0f} ms, p99 {percentile(login_latencies, 0.99):.0f} ms")
+    print(f"{probe_path} idle:  p50 {percentile(idle, 0.5):.1f} ms, p99 {percentile(idle, 0.99):.1f} ms")
+    print(f"{probe_path} storm: p50 {percentile(probe_latencies, 0.5):.1f} ms, p99 {percentile(probe_latencies, 0.99):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure login throughput and unrelated latency under a login storm")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of storm")
+    parser.add_argument("--probe-path", default="/health", help="unrelated endpoint to time")
+    parser.add_argument("--probe-interval", type=float, default=0.02)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.duration, args.probe_path, args.probe_interval))
+
+
+if __name__ == "__main__":
+    main()
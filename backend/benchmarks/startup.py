@@ -0,0 +1,87 @@
+"""Startup benchmark.
+
+Boots the API repeatedly, with and without FAST_START, and reports how long
+each boot took to answer /health and how long its first database-backed
+request (a login for an unknown user) took. The server only answers once
+startup has finished, so time to /health is the time a new worker takes
+before it can join the load balancer.
+
+Point DATABASE_URL at a migrated database, then run from backend/:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --port 8100
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+from typing import Dict, List
+import httpx
+
+
+def median(samples: List[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[len(ordered) // 2] * 1000 if ordered else float("nan")
+
+
+async def boot(port: int, env: Dict[str, str], ready_timeout: float) -> tuple:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://localhost:{port}", timeout=30) as client:
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"server exited with status {server.returncode}")
+                if time.perf_counter() - started > ready_timeout:
+                    raise RuntimeError("server did not become ready in time")
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.01)
+            ready = time.perf_counter() - started
+
+            first_started = time.perf_counter()
+            await client.post(
+                "/api/v1/auth/login",
+                data={"username": f"nobody_{uuid.uuid4().hex[:12]}", "password": "benchmark-password"}
+            )
+            first_request = time.perf_counter() - first_started
+    finally:
+        server.terminate()
+        server.wait()
+    return ready, first_request
+
+
+async def run(runs: int, port: int, ready_timeout: float) -> None:
+    for fast_start in (False, True):
+        env = {**os.environ, "FAST_START": str(fast_start).lower()}
+        env.setdefault("ALLOWED_HOSTS", '["localhost"]')  # TrustedHostMiddleware must accept the probes
+        ready, first_request = [], []
+        for _ in range(runs):
+            boot_ready, boot_first_request = await boot(port, env, ready_timeout)
+            ready.append(boot_ready)
+            first_request.append(boot_first_request)
+
+        label = "fast start" if fast_start else "default"
+        print(f"{label:>10}: ready in {median(ready):.0f} ms, first request {median(first_request):.1f} ms (median of {runs})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time until a freshly started worker can serve")
+    parser.add_argument("--runs", type=int, default=5, help="boots per profile")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--ready-timeout", type=float, default=60.0, help="seconds to wait for /health")
+    args = parser.parse_args()
+    asyncio.run(run(args.runs, args.port, args.ready_timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -74,6 +74,31 @@ class TestAuth:
         
         data = response.json()
         assert "access_token" in data
+    
+    def test_bulk_create_requires_admin(self, client: TestClient, authenticated_headers: dict):
+        """Test that roster provisioning is admin only."""
+        roster = {"users": [{
+            "email": "student@example.com",
+            "username": "student",
+            "first_name": "Stu",
+            "last_name": "Dent",
+            "password": "studentpassword123"
+        }]}
+        
+        response = client.post("/api/v1/users/bulk", json=roster, headers=authenticated_headers)
+        assert response.status_code == 403
+    
+    def test_change_password_starts_new_session(self, client: TestClient, authenticated_headers: dict):
+        """Test that a password change returns a token pair that can be refreshed."""
+        response = client.post(
+            "/api/v1/users/change-password",
+            params={"current_password": "testpassword123", "new_password": "violet-harbor-4721"},
+            headers=authenticated_headers
+        )
+        assert response.status_code == 200
+        
+        response = client.post("/api/v1/auth/refresh", json={"refresh_token": response.json()["refresh_token"]})
+        assert response.status_code == 200
 
 
 # backend/tests/api/test_quiz.py
@@ -94,8 +119,10 @@ class TestQuiz:
         assert response.status_code == 200
         
         data = response.json()
-        assert len(data) >= 1
-        assert data[0]["title"] == "Test Quiz"
+        assert len(data["items"]) >= 1
+        assert data["items"][0]["title"] == "Test Quiz"
+        assert "questions" not in data["items"][0]
+        assert data["items"][0]["question_count"] >= 1
     
     def test_create_quiz(self, client: TestClient, authenticated_headers: dict):
         """Test creating a new quiz."""
@@ -172,6 +199,19 @@ class TestQuiz:
         
         data = response.json()
         assert data["score"] == 50.0  # 50% correct
+    
+    def test_batch_submit_requires_admin(
+        self, client: TestClient, authenticated_headers: dict, test_user: User, test_quiz: Quiz
+    ):
+        """Test that a quiz owner can't submit attempts for other users."""
+        batch = {"attempts": [{"user_id": test_user.id + 1, "answers": [1, 1], "time_taken": 60}]}
+        
+        response = client.post(
+            f"/api/v1/quiz/{test_quiz.id}/submit/batch",
+            json=batch,
+            headers=authenticated_headers
+        )
+        assert response.status_code == 403
 
 
 # backend/tests/api/test_progress.py
@@ -215,7 +255,6 @@ class TestProgress:
         progress_data = {
             "subject": "Physics",
             "topic": "Mechanics",
-            "mastery_level": 0.6,
             "study_time": 90
         }
         
@@ -225,10 +264,10 @@ class TestProgress:
         data = response.json()
         assert data["subject"] == progress_data["subject"]
         assert data["topic"] == progress_data["topic"]
-        assert data["mastery_level"] == progress_data["mastery_level"]
+        assert data["mastery_level"] == 0.0
     
     def test_update_progress_record(self, client: TestClient, authenticated_headers: dict, test_progress: Progress):
-        """Test updating a progress record."""
+        """Test updating a progress record; mastery is left to the engine."""
         update_data = {
             "mastery_level": 0.85,
             "study_time": 150
@@ -242,7 +281,7 @@ class TestProgress:
         assert response.status_code == 200
         
         data = response.json()
-        assert data["mastery_level"] == update_data["mastery_level"]
+        assert data["mastery_level"] == test_progress.mastery_level
         assert data["study_time"] == update_data["study_time"]
     
     def test_filter_progress_by_subject(self, client: TestClient, authenticated_headers: dict, test_progress: Progress):
@@ -255,6 +294,23 @@ class TestProgress:
         
         data = response.json()
         assert all(record["subject"] == "Mathematics" for record in data)
+    
+    def test_submit_schedules_review(self, client: TestClient, authenticated_headers: dict, test_quiz):
+        """Test that submitting a quiz schedules the topic for review."""
+        client.post(
+            f"/api/v1/quiz/{test_quiz.id}/submit",
+            json={"quiz_id": test_quiz.id, "answers": [1, 1], "time_taken": 60},
+            headers=authenticated_headers
+        )
+        
+        response = client.get("/api/v1/progress/", headers=authenticated_headers)
+        record = next(r for r in response.json() if r["topic"] == "Mathematics")
+        assert record["next_review_at"] is not None
+        
+        # Not due until tomorrow
+        response = client.get("/api/v1/progress/due?limit=5", headers=authenticated_headers)
+        assert response.status_code == 200
+        assert all(r["id"] != record["id"] for r in response.json())
 
 
 # backend/tests/api/test_tutor.py
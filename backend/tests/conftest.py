@@ -1,4 +1,5 @@
 # backend/tests/conftest.py
+import os
 import pytest
 import asyncio
 from typing import AsyncGenerator, Generator
@@ -7,8 +8,11 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from sqlalchemy.pool import StaticPool
 from httpx import AsyncClient
 
+# Use the in-process fallbacks instead of a Redis server
+os.environ["REDIS_URL"] = ""
+
 from app.main import app
-from app.core.database import get_db, Base
+from app.core.database import get_db, get_read_db, Base
 from app.core.security import get_password_hash
 from app.models.user import User
 from app.models.quiz import Quiz
@@ -67,6 +71,7 @@ def override_get_db(db_session: AsyncSession):
 def client(override_get_db):
     """Create a test client."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -76,6 +81,7 @@ def client(override_get_db):
 async def async_client(override_get_db):
     """Create an async test client."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
@@ -0,0 +1,42 @@
+# backend/tests/core/test_bloom.py
+import pytest
+
+from app.core.bloom import BloomFilter
+
+
+class TestBloomFilter:
+    """Test Bloom filter membership."""
+
+    def test_no_false_negatives(self):
+        """Every added item is reported as present."""
+        bloom = BloomFilter.for_capacity(1000)
+        items = [f"token-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate(self):
+        """At capacity, unseen items are rarely reported present."""
+        bloom = BloomFilter.for_capacity(1000, false_positive_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"token-{i}")
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+    def test_saved_filter_maps_back(self, tmp_path):
+        """A saved filter answers the same when memory-mapped."""
+        bloom = BloomFilter.for_capacity(100)
+        bloom.add("hunter2")
+        path = tmp_path / "filter.bloom"
+        bloom.save(str(path))
+
+        mapped = BloomFilter.open(str(path))
+        assert "hunter2" in mapped
+        assert "correct horse" not in mapped
+
+    def test_rejects_other_files(self, tmp_path):
+        """Files without the header are refused."""
+        path = tmp_path / "wordlist.txt"
+        path.write_text("password\n" * 10)
+        with pytest.raises(ValueError):
+            BloomFilter.open(str(path))
@@ -0,0 +1,57 @@
+# backend/tests/core/test_principal_cache.py
+from datetime import datetime
+import pytest
+from sqlalchemy import inspect
+
+import app.models.progress  # noqa: F401  (registers User's related mappers)
+import app.models.quiz  # noqa: F401
+from app.core.principal_cache import PrincipalCache, principal_to_user, user_to_principal
+from app.models.user import User
+
+
+class TestPrincipalSnapshot:
+    """Test converting users to and from cache entries."""
+
+    def test_round_trip_without_password_hash(self):
+        """Snapshots keep columns except the password hash and rebuild as detached users."""
+        user = User(
+            id=3, email="a@example.com", username="alice", first_name="A", last_name="B",
+            hashed_password="secret", is_active=True, is_premium=False, is_admin=False,
+            created_at=datetime(2026, 1, 2, 3, 4, 5), updated_at=datetime(2026, 1, 2, 3, 4, 5)
+        )
+        data = user_to_principal(user)
+        assert "hashed_password" not in data
+        assert data["created_at"] == "2026-01-02T03:04:05"
+
+        restored = principal_to_user(data)
+        assert restored.created_at == datetime(2026, 1, 2, 3, 4, 5)
+        assert inspect(restored).detached
+        assert "hashed_password" in inspect(restored).expired_attributes
+
+
+class TestPrincipalCache:
+    """Test the in-process tier (the test suite runs without Redis)."""
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        """The LRU holds at most max_size users, dropping the stalest first."""
+        cache = PrincipalCache(max_size=2, ttl=60, local_ttl=60)
+        await cache.set("a", {"id": 1})
+        await cache.set("b", {"id": 2})
+        await cache.get("a")
+        await cache.set("c", {"id": 3})
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == {"id": 1}
+
+    @pytest.mark.asyncio
+    async def test_expiry_and_invalidation(self):
+        """Entries disappear when their TTL passes or they are invalidated."""
+        cache = PrincipalCache(max_size=10, ttl=0, local_ttl=0)
+        await cache.set("a", {"id": 1})
+        assert await cache.get("a") is None
+
+        cache.ttl = 60
+        await cache.set("a", {"id": 1})
+        await cache.invalidate("a")
+        assert await cache.get("a") is None
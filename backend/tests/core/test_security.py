@@ -0,0 +1,71 @@
+# backend/tests/core/test_security.py
+import asyncio
+import threading
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.security import PasswordHasher, create_access_token, decode_token, user_claims
+
+
+class TestAccessTokens:
+    """Test versioned claims and the verified-token cache."""
+
+    def test_claims_round_trip(self):
+        """Tokens carry the user's id, premium flag and token generation."""
+        user = SimpleNamespace(id=7, is_premium=True, token_generation=3)
+        payload = decode_token(create_access_token("alice", claims=user_claims(user)))
+        assert payload["sub"] == "alice"
+        assert (payload["ver"], payload["uid"], payload["prem"], payload["gen"]) == (1, 7, True, 3)
+
+    def test_verified_tokens_are_cached(self):
+        """A token already verified is not decoded again."""
+        token = create_access_token("bob")
+        payload = decode_token(token)
+        assert security._verified_tokens[token] is payload
+        assert decode_token(token) is payload
+
+    def test_rejects_bad_signature(self):
+        """Tampered tokens are rejected with a 401."""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_token(create_access_token("carol")[:-2] + "xx")
+        assert exc_info.value.status_code == 401
+
+
+class TestPasswordHasher:
+    """Test the bounded off-loop hashing pool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop(self):
+        """Work runs on a pool thread and its result is returned."""
+        hasher = PasswordHasher(workers=2, queue_limit=2)
+        try:
+            thread = await hasher.run(lambda: threading.current_thread().name)
+            assert thread.startswith("password-hash")
+            assert hasher.stats()["completed"] == 1
+        finally:
+            hasher.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_beyond_queue_limit(self):
+        """Once workers and queue are full, further work gets a 503."""
+        hasher = PasswordHasher(workers=1, queue_limit=1)
+        release = threading.Event()
+        try:
+            pending = [asyncio.ensure_future(hasher.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0)
+            assert hasher.stats()["running"] == 1
+            assert hasher.stats()["queued"] == 1
+
+            with pytest.raises(HTTPException) as exc_info:
+                await hasher.run(release.wait)
+            assert exc_info.value.status_code == 503
+
+            release.set()
+            await asyncio.gather(*pending)
+            stats = hasher.stats()
+            assert (stats["completed"], stats["rejected"], stats["queued"]) == (2, 1, 0)
+        finally:
+            release.set()
+            hasher.shutdown()
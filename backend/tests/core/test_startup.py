@@ -0,0 +1,17 @@
+# backend/tests/core/test_startup.py
+import os
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.core.startup import VERSIONS_DIR, alembic_head
+
+
+class TestAlembicHead:
+    """Test reading the migration head without importing Alembic at startup."""
+
+    def test_matches_alembic(self):
+        """The head read from the migration files is the one Alembic reports."""
+        config = Config()
+        config.set_main_option("script_location", os.path.dirname(VERSIONS_DIR))
+        assert alembic_head() == ScriptDirectory.from_config(config).get_current_head()
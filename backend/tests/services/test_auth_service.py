@@ -0,0 +1,51 @@
+# backend/tests/services/test_auth_service.py
+import pytest
+
+from app.services.auth_service import (
+    get_hash_pool,
+    hash_in_processes,
+    login_clause,
+    shutdown_hash_pool,
+    username_error,
+)
+
+
+class TestLoginClause:
+    """Test routing login names to one case-insensitive index."""
+
+    def test_email_shaped_names_match_email(self):
+        """Names with "@" are compared against lower(email) only."""
+        clause = login_clause(" Foo@Example.com ")
+        assert str(clause) == "lower(users.email) = :lower_1"
+        assert clause.right.value == "foo@example.com"
+
+    def test_other_names_match_username(self):
+        """Other names are compared against lower(username) only."""
+        clause = login_clause("Alice")
+        assert str(clause) == "lower(users.username) = :lower_1"
+        assert clause.right.value == "alice"
+
+    def test_usernames_cannot_look_like_emails(self):
+        """Registration rejects usernames that would route to the email index."""
+        assert username_error("a@b") is not None
+        assert username_error("alice") is None
+
+
+class TestHashPool:
+    """Test the shared bulk hashing process pool."""
+
+    def test_pool_is_reused_until_shutdown(self):
+        """Every bulk request gets the same pool; shutdown releases it."""
+        try:
+            pool = get_hash_pool()
+            assert get_hash_pool() is pool
+
+            shutdown_hash_pool()
+            assert get_hash_pool() is not pool
+        finally:
+            shutdown_hash_pool()
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_hash(self):
+        """An empty batch returns without hashing."""
+        assert await hash_in_processes([]) == []
@@ -0,0 +1,110 @@
+# backend/tests/services/test_autosave_service.py
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models.progress  # noqa: F401  (registers every table for create_all)
+from app.core.database import Base
+from app.models.quiz import AttemptDraft, Quiz
+from app.services.autosave_service import UNANSWERED, AutosaveService, MemoryDraftStore, merge_answers
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        session.add(Quiz(title="Q", subject="math", difficulty="easy", user_id=1, questions=[{}, {}]))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+class SubmittedDuringFlush(MemoryDraftStore):
+    """Store whose draft is submitted right after the flusher reads it"""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    async def get_many(self, keys):
+        states = await super().get_many(keys)
+        self.reads += 1
+        if self.reads == 1:
+            for user_id, quiz_id in keys:
+                await self.delete(user_id, quiz_id)
+        return states
+
+
+class TestMergeAnswers:
+    """Test applying answer deltas to a saved draft."""
+
+    def test_pads_skipped_questions(self):
+        """Questions jumped over are marked unanswered."""
+        assert merge_answers([], {2: 1}) == [UNANSWERED, UNANSWERED, 1]
+
+    def test_overwrites_by_index(self):
+        """Later deltas replace earlier answers."""
+        assert merge_answers([0, 1, 2], {1: 3}) == [0, 3, 2]
+
+
+class TestMemoryDraftStore:
+    """Test delta coalescing in the in-memory draft store."""
+
+    @pytest.mark.asyncio
+    async def test_deltas_coalesce(self):
+        """Repeated saves collapse into one dirty draft holding the latest state."""
+        store = MemoryDraftStore()
+        await store.save(1, 7, {0: 2}, 10)
+        await store.save(1, 7, {0: 3, 1: 1}, None)
+
+        assert await store.get_many([(1, 7)]) == [({0: 3, 1: 1}, 10)]
+        assert await store.pop_dirty(10) == [(1, 7)]
+        assert await store.pop_dirty(10) == []
+
+    @pytest.mark.asyncio
+    async def test_delete_clears_dirty_flag(self):
+        """A submitted draft is not flushed afterwards."""
+        store = MemoryDraftStore()
+        await store.save(1, 7, {0: 2}, 10)
+        await store.delete(1, 7)
+
+        assert await store.get_many([(1, 7)]) == [None]
+        assert await store.pop_dirty(10) == []
+
+
+class TestAutosaveService:
+    """Test flushing and submitting drafts."""
+
+    @pytest.mark.asyncio
+    async def test_failed_submit_keeps_draft(self, db):
+        """Discarding only touches the store once the submit commits."""
+        service = AutosaveService(db, MemoryDraftStore())
+        await service.save_delta(1, 1, {0: 1}, 30)
+
+        await service.discard(1, 1)
+        await db.rollback()
+
+        assert (await service.get_draft(1, 1))["answers"] == [1]
+
+    @pytest.mark.asyncio
+    async def test_draft_submitted_during_flush_is_not_kept(self, db):
+        """A row flushed for a draft submitted meanwhile is deleted again."""
+        service = AutosaveService(db, SubmittedDuringFlush())
+        await service.save_delta(1, 1, {0: 1}, 30)
+
+        assert await service.flush() == 0
+        assert (await db.execute(select(AttemptDraft))).scalars().all() == []
+        assert await service.get_draft(1, 1) is None
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_draft(self, db):
+        """Unflushed changes are written to the database."""
+        service = AutosaveService(db, MemoryDraftStore())
+        await service.save_delta(1, 1, {1: 0}, 30)
+
+        assert await service.flush() == 1
+        [draft] = (await db.execute(select(AttemptDraft))).scalars().all()
+        assert draft.answers == [UNANSWERED, 0]
@@ -0,0 +1,30 @@
+# backend/tests/services/test_import_service.py
+import pytest
+
+from app.services.import_service import iter_lines
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(chunks, **kwargs):
+    return [item async for item in iter_lines(chunks, **kwargs)]
+
+
+class TestIterLines:
+    """Test incremental line splitting of uploads."""
+
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self):
+        """Lines are reassembled across chunk boundaries and CRLF is stripped."""
+        lines = await collect(chunked(b"first\r\nsecond\n\nlast", 3))
+        assert lines == [(1, b"first"), (2, b"second"), (3, b""), (4, b"last")]
+
+    @pytest.mark.asyncio
+    async def test_overlong_line_is_skipped(self):
+        """An overlong line is reported once and the stream carries on."""
+        data = b"ok\n" + b"x" * 50 + b"\nnext\n"
+        lines = await collect(chunked(data, 4), max_line_bytes=10)
+        assert lines == [(1, b"ok"), (2, None), (3, b"next")]
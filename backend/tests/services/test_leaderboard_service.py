@@ -0,0 +1,41 @@
+# backend/tests/services/test_leaderboard_service.py
+from datetime import datetime
+
+import pytest
+
+from app.services.leaderboard_service import (
+    LeaderboardService,
+    MemoryLeaderboardStore,
+    board_key
+)
+
+
+class TestLeaderboard:
+    """Test leaderboard ranking with the in-process store."""
+
+    def test_weekly_keys_rotate(self):
+        """Weekly boards use a new key every ISO week."""
+        monday = datetime(2026, 10, 19)
+        sunday = datetime(2026, 10, 25)
+        next_monday = datetime(2026, 10, 26)
+
+        assert board_key("Math", "weekly", monday) == board_key("math ", "weekly", sunday)
+        assert board_key("Math", "weekly", monday) != board_key("Math", "weekly", next_monday)
+        assert board_key("Math", "all_time") == "leaderboard:math:all_time"
+
+    @pytest.mark.asyncio
+    async def test_ranks_by_average_score(self):
+        """Users are ranked by their average score."""
+        service = LeaderboardService(db=None, store=MemoryLeaderboardStore())
+        await service.record_attempt(1, "Math", 90.0)
+        await service.record_attempt(2, "Math", 100.0)
+        await service.record_attempt(2, "Math", 60.0)
+        await service.record_attempt(3, "Math", 70.0)
+
+        top = await service.get_top("Math", "all_time", limit=2)
+        assert [entry["user_id"] for entry in top] == [1, 2]
+        assert top[1]["score"] == 80.0
+
+        me = await service.get_rank("Math", "weekly", 3)
+        assert me["rank"] == 3
+        assert await service.get_rank("Math", "weekly", 4) is None
@@ -0,0 +1,62 @@
+# backend/tests/services/test_login_limiter_service.py
+import pytest
+
+from app.core.config import settings
+from app.services.login_limiter_service import LoginLimiterService, MemoryWindowStore, client_ip
+
+
+class TestMemoryWindowStore:
+    """Test the sliding-window counter."""
+
+    @pytest.mark.asyncio
+    async def test_previous_window_is_weighted(self):
+        """Attempts in the previous window count in proportion to their overlap."""
+        store = MemoryWindowStore()
+        for _ in range(4):
+            assert await store.hit([("account:a", 4)], 10, 1.0, 60)
+
+        # Half of the previous window still overlaps: 4 * 0.5 = 2 of 4 used
+        assert await store.hit([("account:a", 4)], 11, 0.5, 60)
+        assert await store.hit([("account:a", 4)], 11, 0.5, 60)
+        assert not await store.hit([("account:a", 4)], 11, 0.5, 60)
+
+    @pytest.mark.asyncio
+    async def test_rejected_attempts_are_not_counted(self):
+        """A limit hit on one key does not count against the others."""
+        store = MemoryWindowStore()
+        assert await store.hit([("ip:x", 1)], 1, 0.0, 60)
+        assert not await store.hit([("account:b", 5), ("ip:x", 1)], 1, 0.0, 60)
+        assert store.counts.get(("account:b", 1)) is None
+
+
+class TestLoginLimiterService:
+    """Test per-account login throttling."""
+
+    @pytest.mark.asyncio
+    async def test_throttles_account_until_success(self):
+        """Attempts past the account limit get a retry delay; success clears it."""
+        limiter = LoginLimiterService(MemoryWindowStore())
+        for _ in range(settings.LOGIN_MAX_ATTEMPTS_PER_ACCOUNT):
+            assert await limiter.attempt("Alice", "10.0.0.1") is None
+
+        retry_after = await limiter.attempt("alice", "10.0.0.2")
+        assert 0 < retry_after <= settings.LOGIN_WINDOW_SECONDS
+
+        await limiter.succeeded("alice")
+        assert await limiter.attempt("alice", "10.0.0.1") is None
+
+
+class TestClientIp:
+    """Test which address per-IP limits are keyed on."""
+
+    def test_header_ignored_from_untrusted_peer(self, monkeypatch):
+        """A client connecting directly cannot pick its own X-Real-IP."""
+        monkeypatch.setattr(settings, "TRUSTED_PROXIES", [])
+        assert client_ip("203.0.113.9", "198.51.100.1") == "203.0.113.9"
+
+    def test_header_used_from_trusted_proxy(self, monkeypatch):
+        """Behind a configured proxy the forwarded client address is used."""
+        monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["10.0.0.0/8"])
+        assert client_ip("10.1.2.3", "198.51.100.1") == "198.51.100.1"
+        assert client_ip("10.1.2.3", None) == "10.1.2.3"
+        assert client_ip("203.0.113.9", "198.51.100.1") == "203.0.113.9"
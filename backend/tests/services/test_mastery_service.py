@@ -0,0 +1,73 @@
+# backend/tests/services/test_mastery_service.py
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.models.job  # noqa: F401  (registers every table for create_all)
+from app.core.database import Base
+from app.models.progress import Progress
+from app.models.quiz import Quiz, QuizAttempt
+from app.models.user import User
+from app.services.mastery_service import MasteryService, compute_mastery, group_attempts
+
+
+class TestMastery:
+    """Test vectorized mastery computation."""
+
+    def test_group_attempts(self):
+        """Attempts with the same user, subject and topic share a group."""
+        users = np.array([1, 2, 1, 1])
+        subjects = np.array(["Math", "Math", "Math", "Science"], dtype=object)
+        topics = np.array(["Algebra", "Algebra", "Algebra", "Algebra"], dtype=object)
+
+        group_index, first_index = group_attempts(users, subjects, topics)
+
+        assert first_index.size == 3
+        assert group_index[0] == group_index[2]
+        assert len({group_index[0], group_index[1], group_index[3]}) == 3
+
+    def test_recent_attempts_give_weighted_mean(self):
+        """Fresh attempts average their scores."""
+        mastery = compute_mastery(
+            np.array([0, 0]), np.array([80.0, 100.0]), np.array([0.0, 0.0]), 14.0
+        )
+        assert mastery[0] == 0.9
+
+    def test_old_attempts_decay(self):
+        """A single attempt one half-life ago counts half."""
+        mastery = compute_mastery(
+            np.array([0, 1]), np.array([100.0, 100.0]), np.array([0.0, 14.0]), 14.0
+        )
+        assert mastery[0] == 1.0
+        assert abs(mastery[1] - 0.5) < 1e-9
+
+
+class TestMasteryRecompute:
+    """Test the checkpointed recompute job."""
+
+    @pytest.mark.asyncio
+    async def test_idle_user_decays(self):
+        """Mastery drops for a user who stopped practising, without new attempts."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        practised = datetime(2026, 1, 1, 12, 0)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                session.add(User(id=1, email="a@example.com", username="a", first_name="A", last_name="B", hashed_password="x"))
+                session.add(Quiz(id=1, title="Q", subject="math", topic="algebra", difficulty="easy", user_id=1, questions=[]))
+                session.add(QuizAttempt(user_id=1, quiz_id=1, answers=[], score=100.0, time_taken=60, created_at=practised))
+                await session.commit()
+
+                service = MasteryService(session, half_life_days=14.0)
+                await service.recompute(now=practised)
+                stats = await service.recompute(now=practised + timedelta(days=28))
+                mastery = (await session.execute(select(Progress.mastery_level))).scalar()
+        finally:
+            await engine.dispose()
+
+        assert stats["users"] == 0  # no new attempts
+        assert stats["decayed"] == 1
+        assert mastery == pytest.approx(0.25)
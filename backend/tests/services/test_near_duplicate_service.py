@@ -0,0 +1,61 @@
+# backend/tests/services/test_near_duplicate_service.py
+import numpy as np
+
+from app.services.near_duplicate_service import (
+    NUM_BANDS,
+    MinHashLSH,
+    band_buckets,
+    signature_for,
+    signature_from_bytes,
+    signature_to_bytes,
+    similarity,
+)
+
+
+OPTIONS = ["Paris", "London", "Rome", "Berlin"]
+
+
+def make_question(text, options=OPTIONS):
+    return {"question": text, "options": options, "correct_answer": 0}
+
+
+class TestMinHash:
+    """Test MinHash signatures over shingled question text."""
+
+    def test_formatting_differences_are_identical(self):
+        """Case, spacing and punctuation don't change the signature."""
+        a = signature_for(make_question("What is the capital of France?"))
+        b = signature_for(make_question("what is the  capital of France ?!"))
+        assert similarity(a, b) == 1.0
+
+    def test_unrelated_questions_differ(self):
+        """Unrelated questions have a low estimated similarity."""
+        a = signature_for(make_question("What is the capital of France?"))
+        b = signature_for(make_question("At what temperature does water boil?", ["100C", "90C", "80C", "70C"]))
+        assert similarity(a, b) < 0.3
+
+    def test_signature_round_trip(self):
+        """Stored signatures decode to the same values."""
+        signature = signature_for(make_question("What is the capital of France?"))
+        assert np.array_equal(signature_from_bytes(signature_to_bytes(signature)), signature)
+
+    def test_one_bucket_per_band(self):
+        """Each band yields its own bucket."""
+        signature = signature_for(make_question("What is the capital of France?"))
+        assert len(band_buckets(signature)) == NUM_BANDS
+
+
+class TestMinHashLSH:
+    """Test the in-memory LSH index."""
+
+    def test_finds_near_duplicate(self):
+        """A lightly edited question is found through its buckets."""
+        index = MinHashLSH(threshold=0.8)
+        index.add("original", signature_for(make_question("What is the capital city of France?")))
+        assert index.query(signature_for(make_question("What is the capital city of Frances?"))) == "original"
+
+    def test_ignores_distinct_questions(self):
+        """Distinct questions are not reported as duplicates."""
+        index = MinHashLSH(threshold=0.8)
+        index.add("original", signature_for(make_question("What is the capital city of France?")))
+        assert index.query(signature_for(make_question("What is the largest planet?", ["Mars", "Jupiter"]))) is None
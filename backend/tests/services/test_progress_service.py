@@ -0,0 +1,34 @@
+# backend/tests/services/test_progress_service.py
+import pytest
+
+from app.core.config import settings
+from app.models.progress import Progress
+from app.services.progress_service import ProgressService
+
+
+class TestScoreAggregates:
+    """Test bounded score history and running aggregates."""
+
+    def test_mean_and_variance(self):
+        """Mean and variance are read from the aggregate columns."""
+        progress = Progress(score_count=2, score_sum=150.0, score_sumsq=11300.0)
+        assert progress.score_mean == 75.0
+        assert progress.score_variance == 25.0
+
+    def test_empty_aggregates(self):
+        """A record without scores reports zeros."""
+        progress = Progress(score_count=0, score_sum=0.0, score_sumsq=0.0)
+        assert progress.score_mean == 0.0
+        assert progress.score_variance == 0.0
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded(self):
+        """The score history keeps only the most recent scores."""
+        size = settings.PROGRESS_SCORE_HISTORY_SIZE
+        progress = Progress(quiz_scores=[50.0] * size)
+
+        await ProgressService(db=None).record_score(progress, 90.0)
+
+        assert len(progress.quiz_scores) == size
+        assert progress.quiz_scores[-1] == 90.0
+        assert progress.score_count == 1
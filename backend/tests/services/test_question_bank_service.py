@@ -0,0 +1,135 @@
+# backend/tests/services/test_question_bank_service.py
+import hashlib
+from typing import Any, Dict
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models.progress  # noqa: F401  (registers every table for create_all)
+from app.core.database import Base
+from app.models.quiz import Question
+from app.services import question_bank_service
+from app.services.question_bank_service import DIFFICULTIES, MIXED_DIFFICULTY, QuestionBankService, spread_evenly
+from app.services.quiz_library_service import content_hash
+
+
+class TestSpreadEvenly:
+    """Test difficulty balancing when assembling quizzes."""
+
+    def test_round_robin_across_difficulties(self):
+        """Each difficulty contributes in turn."""
+        buckets = {"easy": ["e1", "e2", "e3"], "medium": ["m1", "m2"], "hard": ["h1", "h2"]}
+        assert spread_evenly(buckets, 5) == ["e1", "m1", "h1", "e2", "m2"]
+
+    def test_thin_bucket_is_backfilled(self):
+        """A difficulty that runs out leaves room for the others."""
+        buckets = {"easy": ["e1", "e2", "e3"], "medium": [], "hard": ["h1"]}
+        assert spread_evenly(buckets, 4) == ["e1", "h1", "e2", "e3"]
+
+    def test_short_bank(self):
+        """Fewer items than requested returns everything available."""
+        assert spread_evenly({"easy": ["e1"]}, 3) == ["e1"]
+
+
+def make_question(seed: str) -> Dict[str, Any]:
+    words = hashlib.sha256(seed.encode()).hexdigest()
+    return {
+        "question": " ".join(words[i:i + 8] for i in range(0, 64, 8)),
+        "options": [f"{seed} option {i}" for i in range(4)],
+        "correct_answer": 0,
+    }
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def banked_hashes(db: AsyncSession):
+    return set((await db.execute(select(Question.content_hash))).scalars().all())
+
+
+class TestAddQuestionSets:
+    """Test banking questions."""
+
+    @pytest.mark.asyncio
+    async def test_concurrently_banked_rows_are_skipped(self, db, monkeypatch):
+        """A question banked by another request mid-way skips only that row."""
+        questions = [make_question(f"q{i}") for i in range(3)]
+        find_matches = question_bank_service.NearDuplicateService.find_matches
+
+        async def bank_first_question_meanwhile(self, signatures):
+            await self.db.execute(insert(Question), [{
+                "content_hash": content_hash([questions[0]]), "subject_key": "math", "topic_key": "math",
+                "difficulty": "easy", "question": questions[0]["question"], "options": [], "correct_answer": 0,
+            }])
+            return await find_matches(self, signatures)
+
+        monkeypatch.setattr(question_bank_service.NearDuplicateService, "find_matches", bank_first_question_meanwhile)
+
+        added = await QuestionBankService(db).add_questions(questions, "math", None, "easy")
+
+        assert added == 2
+        assert await banked_hashes(db) == {content_hash([q]) for q in questions}
+
+
+class TestSample:
+    """Test assembling quizzes from the bank."""
+
+    @pytest.mark.asyncio
+    async def test_mixed_quiz_spans_difficulties(self, db):
+        """Each difficulty contributes distinct questions."""
+        bank = QuestionBankService(db)
+        banked = {}
+        for level in DIFFICULTIES:
+            questions = [make_question(f"{level}{i}") for i in range(4)]
+            await bank.add_questions(questions, "math", None, level)
+            banked[level] = {q["question"] for q in questions}
+
+        picked = {q["question"] for q in await bank.sample("Math", None, MIXED_DIFFICULTY, 6)}
+
+        assert [len(picked & banked[level]) for level in DIFFICULTIES] == [2, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_picks_are_scattered_in_one_query(self, db, monkeypatch):
+        """Every difficulty is read in one statement, from pivots spread over the keys."""
+        bank = QuestionBankService(db)
+        questions = [make_question(f"q{i}") for i in range(40)]
+        await bank.add_questions(questions, "math", None, "easy")
+        await db.execute(update(Question).values(sample_key=Question.id / 41.0))
+        pivots = iter([0.05, 0.15, 0.25, 0.35, 0.45, 0.55, 0.65, 0.75, 0.85, 0.95, 0.5])
+        monkeypatch.setattr(question_bank_service.random, "random", lambda: next(pivots))
+        statements = []
+        event.listen(db.bind.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        picked = await bank.sample("math", None, "easy", 10)
+
+        assert len(statements) == 1
+        positions = sorted(int(41 * p) for p in (0.05, 0.15, 0.25, 0.35, 0.45, 0.55, 0.65, 0.75, 0.85, 0.95))
+        texts = [q["question"] for q in questions]
+        assert sorted(texts.index(q["question"]) for q in picked) == positions
+
+    @pytest.mark.asyncio
+    async def test_wraps_around_the_sample_keys(self, db, monkeypatch):
+        """A pivot past most keys still fills the quiz from the start of the range."""
+        bank = QuestionBankService(db)
+        await bank.add_questions([make_question(f"q{i}") for i in range(5)], "math", None, "easy")
+        monkeypatch.setattr(question_bank_service.random, "random", lambda: 0.999999)
+
+        picked = await bank.sample("math", None, "easy", 5)
+
+        assert len({q["question"] for q in picked}) == 5
+
+    @pytest.mark.asyncio
+    async def test_thin_bank(self, db):
+        """Too few matching questions returns None."""
+        bank = QuestionBankService(db)
+        await bank.add_questions([make_question(f"q{i}") for i in range(2)], "math", None, "easy")
+
+        assert await bank.sample("math", None, "easy", 3) is None
@@ -0,0 +1,49 @@
+# backend/tests/services/test_quiz_library_service.py
+from app.models.quiz import Quiz, QuizContent
+from app.services.quiz_library_service import content_hash, normalize_text
+
+
+QUESTIONS = [
+    {
+        "question": "What is 2 + 2?",
+        "options": ["3", "4", "5", "6"],
+        "correct_answer": 1,
+        "explanation": "Basic addition"
+    }
+]
+
+
+class TestContentHash:
+    """Test content addressing of library quizzes."""
+
+    def test_hash_ignores_case_and_spacing(self):
+        """Cosmetic differences map to the same library entry."""
+        variant = [dict(QUESTIONS[0], question="  what is 2 +  2? ", explanation="Other wording")]
+        assert content_hash(variant) == content_hash(QUESTIONS)
+
+    def test_hash_depends_on_answer(self):
+        """A different correct answer is different content."""
+        variant = [dict(QUESTIONS[0], correct_answer=2)]
+        assert content_hash(variant) != content_hash(QUESTIONS)
+
+    def test_normalize_text(self):
+        """Lookup keys are lowercased with collapsed whitespace."""
+        assert normalize_text("  Linear   Algebra ") == "linear algebra"
+        assert normalize_text(None) == ""
+
+
+class TestLibraryReferences:
+    """Test quizzes that reference shared content."""
+
+    def test_reference_reads_shared_questions(self):
+        """A quiz without its own questions serves the library copy."""
+        content = QuizContent(questions=QUESTIONS)
+        quiz = Quiz(content=content)
+        assert quiz.own_questions is None
+        assert quiz.questions == QUESTIONS
+
+    def test_own_questions_take_precedence(self):
+        """Manually created quizzes keep their own questions."""
+        quiz = Quiz(questions=QUESTIONS)
+        assert quiz.own_questions == QUESTIONS
+        assert quiz.answer_key == [1]
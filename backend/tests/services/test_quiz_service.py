@@ -0,0 +1,147 @@
+# backend/tests/services/test_quiz_service.py
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models.progress  # noqa: F401  (registers every table for create_all)
+from app.core.database import Base
+from app.models.quiz import Quiz, QuizAttempt
+from app.services import quiz_service
+from app.services.quiz_service import (
+    QuizService,
+    build_answer_matrix,
+    compute_question_stats,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch):
+    monkeypatch.setattr(quiz_service, "_analytics_cache", OrderedDict())
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def create_attempted_quiz(db: AsyncSession, questions, attempts) -> Quiz:
+    quiz = Quiz(title="Q", subject="math", difficulty="easy", user_id=1, questions=questions)
+    db.add(quiz)
+    await db.flush()
+    db.add_all(
+        QuizAttempt(user_id=1, quiz_id=quiz.id, answers=answers, score=score, time_taken=60)
+        for answers, score in attempts
+    )
+    await db.commit()
+    return quiz
+
+
+class TestQuizAnalytics:
+    """Test vectorized per-question statistics."""
+
+    def test_answer_matrix_pads_ragged_answers(self):
+        """Missing answers are -1 and extra answers are dropped."""
+        matrix = build_answer_matrix([[1, 2], [0], [3, 1, 2]], 2, 4)
+        assert matrix.tolist() == [[1, 2], [0, -1], [3, 1]]
+
+    def test_question_stats(self):
+        """Correct rates, option counts and discrimination per question."""
+        key = np.array([1, 0])
+        matrix = build_answer_matrix([[1, 0], [1, 2], [0, 1], [1, 0]], 2, 3)
+
+        stats = compute_question_stats(matrix, key, num_options=3)
+
+        assert stats["correct_rate"].tolist() == [0.75, 0.5]
+        assert stats["option_counts"].tolist() == [[1, 3, 0], [2, 1, 1]]
+        assert stats["unanswered"].tolist() == [0, 0]
+        # The strongest attempt got question 2 right, the weakest did not
+        assert stats["discrimination"][1] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_missing_correct_answer_grades_like_scoring(self, db):
+        """A question without a correct answer uses the same key as grading."""
+        questions = [{"question": "Q1", "options": ["a", "b"], "correct_answer": None}]
+        quiz = await create_attempted_quiz(db, questions, [([0], 100.0), ([1], 0.0)])
+
+        analytics = await QuizService(db).get_quiz_analytics(quiz.id, 1)
+
+        assert analytics["questions"][0]["correct_answer"] == 0
+        assert analytics["questions"][0]["correct_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_rewritten_scores_invalidate_cache(self, db):
+        """Scores rewritten in place (a regrade) are not served from the cache."""
+        questions = [{"question": "Q1", "options": ["a", "b"], "correct_answer": 1}]
+        quiz = await create_attempted_quiz(db, questions, [([1], 100.0), ([0], 100.0)])
+        service = QuizService(db)
+        assert (await service.get_quiz_analytics(quiz.id, 1))["average_score"] == 100.0
+
+        await db.execute(update(QuizAttempt).where(QuizAttempt.quiz_id == quiz.id).values(score=QuizAttempt.score / 2))
+        await db.commit()
+
+        assert (await service.get_quiz_analytics(quiz.id, 1))["average_score"] == 50.0
+
+
+class TestQuizScoring:
+    """Test answer keys and batch scoring."""
+
+    def test_answer_key_follows_questions(self):
+        """The compact key is rebuilt whenever questions are assigned."""
+        quiz = Quiz(questions=[{"correct_answer": 2}, {"correct_answer": 0}])
+        assert quiz.answer_key == [2, 0]
+
+        quiz.questions = [{"correct_answer": 1}]
+        assert quiz.answer_key == [1]
+
+    @pytest.mark.asyncio
+    async def test_batch_scores_match_single_scores(self):
+        """Batch grading agrees with one-at-a-time grading."""
+        quiz = Quiz(questions=[{"correct_answer": 1}, {"correct_answer": 1}, {"correct_answer": 3}])
+        service = QuizService(db=None)
+        answers = [[1, 1, 3], [1, 0], [], [0, 0, 0, 9]]
+
+        batch = await service.calculate_scores(quiz, answers)
+        single = [await service.calculate_score(quiz, a) for a in answers]
+
+        assert batch.tolist() == pytest.approx(single)
+        assert batch[0] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_out_of_range_answers_are_wrong(self):
+        """Answers that are not option indexes never wrap onto a correct option."""
+        quiz = Quiz(questions=[{"correct_answer": 1}, {"correct_answer": 1}])
+        service = QuizService(db=None)
+        answers = [[65537, 1], [-1, 1], [2 ** 70, 1], [1, None]]
+
+        assert build_answer_matrix(answers, 2, 4).tolist() == [[-1, 1], [-1, 1], [-1, 1], [1, -1]]
+
+        batch = await service.calculate_scores(quiz, answers)
+        single = [await service.calculate_score(quiz, a) for a in answers]
+        assert batch.tolist() == pytest.approx(single) == [50.0, 50.0, 50.0, 50.0]
+
+
+class TestQuizListCursor:
+    """Test keyset pagination cursors."""
+
+    def test_cursor_round_trip(self):
+        """A cursor decodes back to the (created_at, id) it was made from."""
+        created_at = datetime(2026, 3, 1, 12, 30, 15, 123456)
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    def test_malformed_cursor(self):
+        """Garbage cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_question_count_follows_questions(self):
+        """The stored question count tracks the questions list."""
+        quiz = Quiz(questions=[{"correct_answer": 0}] * 3)
+        assert quiz.question_count == 3
@@ -0,0 +1,173 @@
+# backend/tests/services/test_regrade_service.py
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models.progress  # noqa: F401  (registers every table for create_all)
+from app.core.database import Base
+from app.models.job import JobCheckpoint
+from app.models.quiz import Quiz, QuizAttempt
+from app.models.user import User
+from app.services import quiz_service, regrade_service
+from app.services.regrade_service import RegradeService, checkpoint_name
+
+# Stored scores graded against the old key [0, 1]; the corrected key is [1, 1]
+ATTEMPTS = [([0, 1], 100.0), ([1, 1], 50.0), ([1, 0], 0.0), ([0, 0], 50.0), ([1, 1], 50.0)]
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def refreshed(monkeypatch):
+    """Users whose mastery was recomputed, and subjects whose leaderboards were rebuilt"""
+    calls = {"mastery": [], "leaderboard": []}
+
+    async def recompute_users(self, user_ids):
+        calls["mastery"].extend(user_ids)
+
+    async def rebuild(self, now=None, only_subject=None):
+        calls["leaderboard"].append(only_subject)
+        return {}
+
+    monkeypatch.setattr(regrade_service.MasteryService, "recompute_users", recompute_users)
+    monkeypatch.setattr(regrade_service.LeaderboardService, "rebuild", rebuild)
+    return calls
+
+
+async def create_quiz(db: AsyncSession) -> Quiz:
+    users = [
+        User(email=f"u{i}@example.com", username=f"u{i}", first_name="U", last_name="U", hashed_password="x")
+        for i in range(len(ATTEMPTS))
+    ]
+    db.add_all(users)
+    quiz = Quiz(
+        title="Q", subject="math", difficulty="easy", user_id=1,
+        questions=[{"correct_answer": 1}, {"correct_answer": 1}]
+    )
+    db.add(quiz)
+    await db.flush()
+    db.add_all(
+        QuizAttempt(user_id=user.id, quiz_id=quiz.id, answers=answers, score=score, time_taken=60)
+        for user, (answers, score) in zip(users, ATTEMPTS)
+    )
+    await db.commit()
+    return quiz
+
+
+async def stored_scores(db: AsyncSession, quiz_id: int):
+    result = await db.execute(
+        select(QuizAttempt.score).where(QuizAttempt.quiz_id == quiz_id).order_by(QuizAttempt.id)
+    )
+    return list(result.scalars().all())
+
+
+class TestRegradeQuiz:
+    """Test checkpointed rescoring against the corrected key."""
+
+    @pytest.mark.asyncio
+    async def test_rescores_across_chunks(self, db, refreshed):
+        """Every chunk is rescored and only users with changed scores are refreshed."""
+        quiz = await create_quiz(db)
+        progress = []
+
+        state = await RegradeService(db, chunk_size=2).regrade_quiz(quiz.id, on_progress=progress.append)
+
+        assert await stored_scores(db, quiz.id) == [50.0, 100.0, 50.0, 0.0, 100.0]
+        assert [p["processed"] for p in progress] == [2, 4, 5]
+        assert state["phase"] == "done"
+        assert state["changed"] == 5
+        assert refreshed["mastery"] == state["users"] == [1, 2, 3, 4, 5]
+        assert refreshed["leaderboard"] == ["math"]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_scores_are_not_refreshed(self, db, refreshed):
+        """Users whose score did not change are left out of the aggregate refresh."""
+        quiz = await create_quiz(db)
+        quiz.questions = [{"correct_answer": 0}, {"correct_answer": 1}]  # the key the scores were graded with
+        await db.commit()
+
+        state = await RegradeService(db, chunk_size=2).regrade_quiz(quiz.id)
+
+        assert state["changed"] == 0
+        assert refreshed["mastery"] == []
+
+    @pytest.mark.asyncio
+    async def test_resumes_mid_rescore(self, db, refreshed):
+        """A run interrupted during rescoring continues after the last committed attempt."""
+        quiz = await create_quiz(db)
+        ids = (await db.execute(select(QuizAttempt.id).order_by(QuizAttempt.id))).scalars().all()
+        db.add(JobCheckpoint(
+            name=checkpoint_name(quiz.id), cursor=ids[1],
+            state={"phase": "rescore", "total": 5, "processed": 2, "changed": 2, "users": [1, 2]}
+        ))
+        await db.commit()
+
+        state = await RegradeService(db, chunk_size=2).regrade_quiz(quiz.id)
+
+        # The first two attempts were "already done", so keep their stored scores
+        assert await stored_scores(db, quiz.id) == [100.0, 50.0, 50.0, 0.0, 100.0]
+        assert state["processed"] == 5
+        assert refreshed["mastery"] == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_resumes_at_aggregates(self, db, refreshed):
+        """A run interrupted after rescoring only refreshes the recorded users."""
+        quiz = await create_quiz(db)
+        db.add(JobCheckpoint(
+            name=checkpoint_name(quiz.id), cursor=0,
+            state={"phase": "aggregates", "total": 5, "processed": 5, "changed": 1, "users": [3]}
+        ))
+        await db.commit()
+
+        state = await RegradeService(db).regrade_quiz(quiz.id)
+
+        assert await stored_scores(db, quiz.id) == [score for _, score in ATTEMPTS]
+        assert refreshed["mastery"] == [3]
+        assert state["phase"] == "done"
+
+    @pytest.mark.asyncio
+    async def test_done_checkpoint_starts_over(self, db, refreshed):
+        """A finished checkpoint does not stop the next regrade."""
+        quiz = await create_quiz(db)
+        db.add(JobCheckpoint(
+            name=checkpoint_name(quiz.id), cursor=999,
+            state={"phase": "done", "total": 5, "processed": 5, "changed": 0, "users": []}
+        ))
+        await db.commit()
+
+        state = await RegradeService(db).regrade_quiz(quiz.id)
+
+        assert state["processed"] == 5
+        assert state["changed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_stale_answer_key(self, db, refreshed):
+        """A key left stale by a bulk UPDATE is rebuilt from the questions and saved."""
+        quiz = await create_quiz(db)
+        await db.execute(update(Quiz).where(Quiz.id == quiz.id).values(answer_key=[0, 1]))
+        await db.commit()
+        db.expunge_all()
+
+        await RegradeService(db).regrade_quiz(quiz.id)
+
+        assert (await db.execute(select(Quiz.answer_key).where(Quiz.id == quiz.id))).scalar() == [1, 1]
+        assert await stored_scores(db, quiz.id) == [50.0, 100.0, 50.0, 0.0, 100.0]
+
+    @pytest.mark.asyncio
+    async def test_evicts_cached_analytics(self, db, refreshed, monkeypatch):
+        """Analytics cached before the regrade are dropped once it is done."""
+        quiz = await create_quiz(db)
+        monkeypatch.setitem(quiz_service._analytics_cache, quiz.id, ((), {"average_score": 50.0}))
+
+        await RegradeService(db).regrade_quiz(quiz.id)
+
+        assert quiz.id not in quiz_service._analytics_cache
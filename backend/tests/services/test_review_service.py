@@ -0,0 +1,65 @@
+# backend/tests/services/test_review_service.py
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.models.job  # noqa: F401  (registers every table for create_all)
+import app.models.progress  # noqa: F401
+from app.core.database import Base
+from app.models.quiz import Quiz
+from app.services.review_service import ReviewService, sm2_schedule, score_to_quality
+
+
+class TestReviewSchedule:
+    """Test SM-2 review scheduling."""
+
+    def test_score_to_quality(self):
+        """Scores map onto the 0-5 quality scale."""
+        assert score_to_quality(0.0) == 0
+        assert score_to_quality(50.0) == 2
+        assert score_to_quality(100.0) == 5
+
+    def test_intervals_grow_on_success(self):
+        """Successful reviews follow the 1, 6, interval * ease progression."""
+        repetitions, interval, ease = sm2_schedule(5, 0, 0, 2.5)
+        assert (repetitions, interval) == (1, 1)
+
+        repetitions, interval, ease = sm2_schedule(5, repetitions, interval, ease)
+        assert (repetitions, interval) == (2, 6)
+
+        repetitions, interval, ease = sm2_schedule(5, repetitions, interval, ease)
+        assert repetitions == 3
+        assert interval == round(6 * 2.7)
+
+    def test_failure_resets(self):
+        """A failed review restarts the schedule and lowers the ease factor."""
+        repetitions, interval, ease = sm2_schedule(1, 4, 30, 2.5)
+        assert (repetitions, interval) == (0, 1)
+        assert ease < 2.5
+        assert ease >= 1.3
+
+
+class TestProgressRecords:
+    """Test loading the progress records a submission updates."""
+
+    @pytest.mark.asyncio
+    async def test_existing_records_are_locked(self):
+        """Records are selected FOR UPDATE, so concurrent submissions queue instead of losing scores."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        statements = []
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with AsyncSession(engine) as session:
+                event.listen(
+                    session.sync_session, "do_orm_execute",
+                    lambda state: statements.append(str(state.statement.compile(dialect=postgresql.dialect())))
+                )
+                quiz = Quiz(subject="math", topic="algebra")
+                records = await ReviewService(session).get_or_create_progress_many([1, 2], quiz)
+        finally:
+            await engine.dispose()
+
+        assert sorted(records) == [1, 2]
+        assert statements[0].endswith("FOR UPDATE")
@@ -0,0 +1,66 @@
+# backend/tests/services/test_token_service.py
+import time
+from types import SimpleNamespace
+import pytest
+
+from app.core.security import decode_token
+from app.services import token_service
+from app.services.token_service import RevocationList, issue_tokens
+
+
+class TestIssueTokens:
+    """Test access and refresh token pairs."""
+
+    def test_pair_shares_session(self):
+        """Both tokens carry the session id; only the refresh token has a jti."""
+        user = SimpleNamespace(id=1, username="alice", is_premium=False, token_generation=0)
+        tokens = issue_tokens(user, "session-1")
+        access = decode_token(tokens["access_token"])
+        refresh = decode_token(tokens["refresh_token"])
+
+        assert access["sid"] == refresh["sid"] == "session-1"
+        assert "typ" not in access
+        assert refresh["typ"] == "refresh" and refresh["jti"]
+        assert refresh["exp"] > access["exp"]
+
+
+class TestRevocationList:
+    """Test revocation through the in-memory store."""
+
+    @pytest.mark.asyncio
+    async def test_revoke_once(self):
+        """Only the first revocation of an id succeeds, which is how reuse is detected."""
+        revocations = RevocationList()
+        assert not await revocations.is_revoked("jti-1")
+        assert await revocations.revoke("jti-1", time.time() + 60)
+        assert not await revocations.revoke("jti-1", time.time() + 60)
+        assert await revocations.is_revoked("jti-1")
+
+    @pytest.mark.asyncio
+    async def test_sync_drops_expired(self):
+        """Syncing rebuilds the filter without ids past their expiry."""
+        revocations = RevocationList()
+        await revocations.revoke("expired", time.time() - 1)
+        await revocations.revoke("live", time.time() + 60)
+        await revocations.sync()
+
+        assert "expired" not in revocations.bloom
+        assert await revocations.is_revoked("live")
+
+    @pytest.mark.asyncio
+    async def test_sync_keeps_concurrent_revocations(self, monkeypatch):
+        """An id revoked while the store is being read survives the filter swap."""
+        revocations = RevocationList()
+        store = token_service.get_revocation_store()
+        snapshot = store.live_ids
+
+        async def live_ids_then_revoke():
+            token_ids = await snapshot()  # taken before the revocation lands
+            await revocations.revoke("during-sync", time.time() + 60)
+            return token_ids
+
+        monkeypatch.setattr(store, "live_ids", live_ids_then_revoke)
+        await revocations.sync()
+
+        assert "during-sync" in revocations.bloom
+        assert await revocations.is_revoked("during-sync")
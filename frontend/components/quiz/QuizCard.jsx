@@ -32,7 +32,7 @@ export default function QuizCard({ quiz, onStart }) {
             <Clock className="h-4 w-4 mr-1" />
             {quiz.time_limit ? `${quiz.time_limit} min` : 'No limit'}
           </span>
-          <span>{quiz.questions?.length || 0} questions</span>
+          <span>{quiz.question_count ?? quiz.questions?.length ?? 0} questions</span>
         </div>
         {quiz.is_ai_generated && (
           <span className="flex items-center text-purple-600">
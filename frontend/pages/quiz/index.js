@@ -11,7 +11,9 @@ export default function QuizList() {
   const { data: session, status } = useSession();
   const router = useRouter();
   const [quizzes, setQuizzes] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [filter, setFilter] = useState({ subject: '', difficulty: '' });
   const [showGenerateModal, setShowGenerateModal] = useState(false);
 
@@ -28,7 +30,8 @@ export default function QuizList() {
   const fetchQuizzes = async () => {
     try {
       const response = await quizAPI.getQuizzes(filter);
-      setQuizzes(response.data);
+      setQuizzes(response.data.items);
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       toast.error('Failed to fetch quizzes');
     } finally {
@@ -36,6 +39,19 @@ export default function QuizList() {
     }
   };
 
+  const fetchMoreQuizzes = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await quizAPI.getQuizzes({ ...filter, cursor: nextCursor });
+      setQuizzes((current) => [...current, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      toast.error('Failed to fetch quizzes');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getDifficultyColor = (difficulty) => {
     const colors = {
       easy: 'bg-green-100 text-green-800',
@@ -159,7 +175,7 @@ export default function QuizList() {
                   <div className="flex items-center justify-between text-sm text-gray-500">
                     <div className="flex items-center gap-1">
                       <BookOpen className="w-4 h-4" />
-                      <span>{quiz.questions?.length || 0} questions</span>
+                      <span>{quiz.question_count} questions</span>
                     </div>
                     {quiz.time_limit && (
                       <div className="flex items-center gap-1">
@@ -174,6 +190,18 @@ export default function QuizList() {
           </div>
         )}
 
+        {nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={fetchMoreQuizzes}
+              disabled={loadingMore}
+              className="border border-gray-300 text-gray-700 px-6 py-2 rounded-lg hover:bg-gray-50 transition-colors disabled:opacity-50 disabled:cursor-not-allowed"
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
+
         {/* Generate Quiz Modal */}
         {showGenerateModal && (
           <GenerateQuizModal